@@ -0,0 +1,162 @@
+"""
+Benchmark the sentence encoder backends on CPU.
+
+Every backend runs in a fresh worker process, so import time and memory are measured
+in isolation: time to import the backend's libraries, time to load the model, batch
+encode throughput on synthetic job descriptions, single-query latency percentiles
+and peak RSS. The embeddings of every backend are compared with the first one
+(cosine similarity per text).
+
+Usage (from the Job Search directory; export the ONNX model first with
+`python src/encoders.py export`):
+    python benchmarks/bench_encoders.py --texts 2000 --queries 200
+    python benchmarks/bench_encoders.py --backends sentence_transformers onnx-int8 --threads 4
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+# Add src to path to allow direct import when running from the Job Search directory
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, '..', 'src')))
+
+BACKENDS = ("sentence_transformers", "onnx", "onnx-int8")
+BACKEND_MODULES = {"sentence_transformers": ("sentence_transformers",), "onnx": ("onnxruntime", "tokenizers")}
+QUERIES = (
+    "python developer", "senior data engineer spark airflow", "remote machine learning pytorch",
+    "kubernetes terraform aws", "frontend react typescript", "sql analytics dbt snowflake",
+)
+
+def encoder_config(backend, args):
+    return {"embeddings": {
+        "backend": "sentence_transformers" if backend == "sentence_transformers" else "onnx",
+        "model": args.model,
+        "batch_size": args.batch_size,
+        "onnx": {"model_dir": args.onnx_dir, "quantized": backend == "onnx-int8", "threads": args.threads},
+    }}
+
+def run_worker(backend, args):
+    """Measures one backend in this (fresh) process and saves its embeddings to args.embeddings_out."""
+    import importlib
+    from metrics import peak_rss_bytes
+
+    start = time.perf_counter()
+    for module in BACKEND_MODULES["sentence_transformers" if backend == "sentence_transformers" else "onnx"]:
+        importlib.import_module(module)
+    import_seconds = time.perf_counter() - start
+
+    from encoders import create_encoder
+    start = time.perf_counter()
+    encoder = create_encoder(encoder_config(backend, args))
+    load_seconds = time.perf_counter() - start
+    rss_after_load = peak_rss_bytes()
+
+    with open(args.texts_file) as file:
+        texts = json.load(file)
+    encoder.encode(texts[:args.batch_size])  # Warm-up
+    start = time.perf_counter()
+    embeddings = np.asarray(encoder.encode(texts), dtype=np.float32)
+    encode_seconds = time.perf_counter() - start
+    np.save(args.embeddings_out, embeddings)
+
+    latencies = []
+    for i in range(args.queries):
+        start = time.perf_counter()
+        encoder.encode(QUERIES[i % len(QUERIES)])
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "import_seconds": round(import_seconds, 3),
+        "load_seconds": round(load_seconds, 3),
+        "texts_per_second": round(len(texts) / encode_seconds, 1),
+        "encode_seconds": round(encode_seconds, 3),
+        "query_latency": {f"p{p}_ms": round(float(np.percentile(latencies, p)) * 1000, 3) for p in (50, 95, 99)},
+        "rss_after_load_bytes": rss_after_load,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "dimension": int(embeddings.shape[1]),
+    }
+
+def cosine_report(reference, embeddings):
+    norms = np.linalg.norm(reference, axis=1) * np.linalg.norm(embeddings, axis=1)
+    cosines = (reference * embeddings).sum(axis=1) / np.clip(norms, 1e-12, None)
+    return {"min": round(float(cosines.min()), 6), "mean": round(float(cosines.mean()), 6)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS),
+                        help="The first backend is the reference for the cosine comparison.")
+    parser.add_argument("--texts", type=int, default=1000, help="Job descriptions to encode.")
+    parser.add_argument("--description-words", type=int, default=120)
+    parser.add_argument("--queries", type=int, default=100, help="Single-query encodes for the latency percentiles.")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="ONNX Runtime intra-op threads.")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--onnx-dir", default=os.path.join(BENCH_DIR, "..", "models", "all-MiniLM-L6-v2-onnx"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Result file (defaults to benchmarks/results/encoders-<commit>.json).")
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--texts-file", help=argparse.SUPPRESS)
+    parser.add_argument("--embeddings-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args)))
+        return
+
+    from bench_pipeline import git_commit
+    from corpus import generate_jobs
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "worker", "texts_file", "embeddings_out")},
+        "backends": {},
+    }
+    jobs = generate_jobs(args.texts, duplicate_rate=0.0, description_words=args.description_words, seed=args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        texts_file = os.path.join(tmp_dir, "texts.json")
+        with open(texts_file, "w") as file:
+            json.dump([" ".join(job["description"].lower().split()) for job in jobs], file)  # As processor.normalize_text
+
+        reference = None
+        for backend in args.backends:
+            embeddings_out = os.path.join(tmp_dir, f"{backend}.npy")
+            command = [sys.executable, os.path.abspath(__file__), "--worker", backend, "--texts-file", texts_file,
+                       "--embeddings-out", embeddings_out, "--queries", str(args.queries), "--batch-size", str(args.batch_size),
+                       "--model", args.model, "--onnx-dir", os.path.abspath(args.onnx_dir)]
+            if args.threads:
+                command += ["--threads", str(args.threads)]
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                results["backends"][backend] = {"error": (completed.stderr.strip().splitlines() or ["unknown error"])[-1]}
+                print(f"{backend}: failed", file=sys.stderr)
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            embeddings = np.load(embeddings_out)
+            if reference is None:
+                reference = (backend, embeddings)
+            result["cosine_vs_" + reference[0]] = cosine_report(reference[1], embeddings)
+            results["backends"][backend] = result
+            print(f"{backend}: {result['texts_per_second']} texts/s, p50 {result['query_latency']['p50_ms']} ms", file=sys.stderr)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"encoders-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results["backends"], indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
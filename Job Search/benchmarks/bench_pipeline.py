@@ -0,0 +1,171 @@
+"""
+End-to-end pipeline benchmark on a synthetic corpus.
+
+For every scale, serves a synthetic corpus from the local fixture job board and
+times each stage: scrape_jobs, clean_data, generate_embeddings, building the
+FAISS index and hybrid_search queries. Results (wall/CPU time, peak RSS, items
+per second, query latency percentiles) are written to
+benchmarks/results/<commit>.json so runs can be compared across commits.
+
+Usage (from the Job Search directory):
+    python benchmarks/bench_pipeline.py --scales 1000 10000
+    python benchmarks/bench_pipeline.py --scales 100000 1000000 --stages scrape clean
+    python benchmarks/bench_pipeline.py --scales 1000 --latency 0.05 --error-rate 0.02
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/<old commit>.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+# Add src to path to allow direct import when running from the Job Search directory
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, '..', 'src')))
+
+import scraper
+from metrics import MetricsRegistry, peak_rss_bytes
+from corpus import generate_jobs
+from fixture_server import FixtureServer
+
+STAGES = ("scrape", "clean", "embed", "index", "search")
+QUERIES = (
+    "python developer", "senior data engineer spark airflow", "remote machine learning pytorch",
+    "kubernetes terraform aws", "frontend react typescript", "sql analytics dbt snowflake",
+)
+
+def git_commit():
+    """Current commit, suffixed with -dirty when the tree has uncommitted changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", ".."], cwd=BENCH_DIR, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+def load_stage_functions(stages):
+    """Imports the processing modules up front so that loading the embedding model is not timed as a stage."""
+    functions = {}
+    if set(stages) - {"scrape"}:
+        from processor import clean_data, generate_embeddings, build_faiss_index
+        functions.update(clean=clean_data, embed=generate_embeddings, index=build_faiss_index)
+    if "search" in stages:
+        from analyzer import hybrid_search
+        functions["search"] = hybrid_search
+    return functions
+
+def run_scale(count, args, functions, tmp_dir):
+    registry = MetricsRegistry()
+    scraper.metrics = registry  # Collect per-board fetch metrics for this scale only
+    corpus = generate_jobs(count, duplicate_rate=args.duplicate_rate, description_words=args.description_words, seed=args.seed)
+    results = {"jobs": count, "stages": {}}
+    outputs = {}
+
+    with FixtureServer(corpus, per_page=args.per_page, latency=args.latency, jitter=args.jitter,
+                       error_rate=args.error_rate, seed=args.seed) as server:
+        config = {"scraping": {"job_boards": server.board_config()}}
+        scraper.load_config = lambda: config
+        scraper.PROJECT_ROOT = tmp_dir  # scrape_jobs saves its output under PROJECT_ROOT/output
+        os.makedirs(os.path.join(tmp_dir, "output"), exist_ok=True)
+
+        for name in args.stages:
+            try:
+                with registry.stage(name) as stage:
+                    if name == "scrape":
+                        outputs["scrape"] = scraper.scrape_jobs()
+                        stage.items = len(outputs["scrape"])
+                        results["scrape"] = {"pages": server.pages, "requests": server.requests, "errors": server.errors}
+                    elif name == "clean":
+                        outputs["clean"] = functions["clean"](outputs.get("scrape") or corpus)
+                        stage.items = len(outputs["clean"])
+                    elif name == "embed":
+                        outputs["embed"] = functions["embed"](outputs.get("clean") or corpus)
+                        stage.items = len(outputs["embed"])
+                    elif name == "index":
+                        outputs["index"] = functions["index"](outputs["embed"])
+                        stage.items = outputs["index"].ntotal
+                    elif name == "search":
+                        jobs = outputs.get("clean") or corpus
+                        latencies = []
+                        for i in range(args.queries):
+                            start = time.perf_counter()
+                            functions["search"](QUERIES[i % len(QUERIES)], jobs, outputs["index"], top_k=10)
+                            latencies.append(time.perf_counter() - start)
+                        stage.items = len(latencies)
+                        results["search"] = {
+                            f"p{p}_ms": round(float(np.percentile(latencies, p)) * 1000, 3) for p in (50, 95, 99)
+                        }
+            except Exception as e:  # Later stages need this one's output, so stop this scale here
+                results["stages"][name] = {"error": f"{type(e).__name__}: {e}"}
+                print(f"[{count}] {name} failed: {e}", file=sys.stderr)
+                break
+            results["stages"][name] = registry.report()["stages"][name]
+            print(f"[{count}] {name}: {results['stages'][name]['wall_seconds']:.3f}s", file=sys.stderr)
+
+    results["peak_rss_bytes"] = peak_rss_bytes()
+    return results
+
+def compare(current, baseline):
+    """Prints the per-stage wall time ratio between two result files."""
+    print(f"{'scale':>9} {'stage':<8} {'baseline s':>11} {'current s':>10} {'ratio':>7}")
+    for scale, result in current["scales"].items():
+        for name, stage in result["stages"].items():
+            old = baseline["scales"].get(scale, {}).get("stages", {}).get(name, {})
+            if "wall_seconds" not in stage or "wall_seconds" not in old:
+                continue
+            ratio = stage["wall_seconds"] / old["wall_seconds"] if old["wall_seconds"] else float("nan")
+            print(f"{scale:>9} {name:<8} {old['wall_seconds']:>11.3f} {stage['wall_seconds']:>10.3f} {ratio:>6.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000],
+                        help="Corpus sizes, e.g. 1000 10000 100000 1000000.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--description-words", type=int, default=250)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every fixture response.")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fixture responses failing with 503.")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Result file (defaults to benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", help="Earlier result file to compare this run with.")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scales": {},
+    }
+    start = time.perf_counter()
+    functions = load_stage_functions(args.stages)
+    results["import_seconds"] = round(time.perf_counter() - start, 3)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for count in args.scales:
+            results["scales"][str(count)] = run_scale(count, args, functions, tmp_dir)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results["scales"], indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, json.load(file))
+
+if __name__ == "__main__":
+    main()
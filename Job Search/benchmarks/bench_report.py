@@ -0,0 +1,89 @@
+"""
+Benchmark PDF report generation.
+
+Renders a 1,000-job report (with non Latin-1 descriptions) and reports pages/second
+and peak memory, then renders several per-subscriber reports in parallel worker
+processes.
+
+Usage (from the Job Search directory):
+    python benchmarks/bench_report.py --jobs 1000 --reports 8 --processes 4
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add src to path to allow direct import when running from the Job Search directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from report import ReportGenerator, generate_reports
+
+WORDS = ("python", "développeur", "données", "cloud", "kubernetes", "机器学习", "équipe", "remote", "API", "Zürich")
+
+def make_jobs(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"{rng.choice(WORDS).title()} Engineer {i}",
+            "company": f"Société {i % 97}",
+            "location": rng.choice(("Remote", "New York", "São Paulo", "München")),
+            "description": " ".join(rng.choice(WORDS) for _ in range(300)),
+            "link": f"https://example.com/job/{i}",
+        }
+        for i in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--reports", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--font-path", default=None)
+    args = parser.parse_args()
+
+    jobs = make_jobs(args.jobs)
+    results = {"jobs": args.jobs}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        generator = ReportGenerator(args.font_path)
+        results["unicode_font"] = generator.font_path
+
+        start = time.perf_counter()
+        pages = generator.render(jobs, os.path.join(tmp_dir, "single.pdf"), summary="Benchmark summary")
+        elapsed = time.perf_counter() - start
+
+        # Separate pass for memory, since tracing allocations slows rendering down considerably
+        tracemalloc.start()
+        generator.render(jobs, os.path.join(tmp_dir, "single.pdf"), summary="Benchmark summary")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results["single_report"] = {
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 1),
+            "peak_python_memory_mb": round(peak / 2 ** 20, 1),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+
+        reports = [
+            {"path": os.path.join(tmp_dir, f"subscriber_{i}.pdf"), "jobs": jobs[: args.jobs // 4], "summary": f"Report {i}"}
+            for i in range(args.reports)
+        ]
+        for processes in (1, args.processes):
+            start = time.perf_counter()
+            rendered = generate_reports(reports, processes=processes, font_path=args.font_path)
+            elapsed = time.perf_counter() - start
+            results[f"{args.reports}_reports_{processes}_processes"] = {
+                "pages": sum(rendered.values()),
+                "seconds": round(elapsed, 3),
+                "pages_per_second": round(sum(rendered.values()) / elapsed, 1),
+            }
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
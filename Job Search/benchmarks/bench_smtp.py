@@ -0,0 +1,78 @@
+"""
+Benchmark SMTP delivery throughput against a local aiosmtpd server.
+
+Compares one connection per message (notifier.send_email) with the pooled
+SMTPDeliveryEngine and reports messages/second.
+
+Usage (from the Job Search directory):
+    pip install aiosmtpd
+    python benchmarks/bench_smtp.py --messages 500 --pool-size 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from aiosmtpd.controller import Controller
+
+# Add src to path to allow direct import when running from the Job Search directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import notifier
+from notifier import SMTPDeliveryEngine
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=8025)
+    controller.start()
+    config = {
+        "email": {
+            "sender": "bench@example.com",
+            "recipients": ["subscriber@example.com"],
+            "smtp_server": "127.0.0.1",
+            "smtp_port": 8025,
+            "use_tls": False,
+        }
+    }
+    digests = {f"user{i}@example.com": f"Digest {i}\n" + "Job line\n" * 50 for i in range(args.messages)}
+    results = {}
+    try:
+        # Baseline: a new connection for every message
+        start = time.perf_counter()
+        notifier.print = lambda *a, **k: None  # Silence per-message output
+        for recipient, body in digests.items():
+            notifier.send_email(body, {**config, "email": {**config["email"], "recipients": [recipient]}})
+        elapsed = time.perf_counter() - start
+        results["connection_per_message"] = round(args.messages / elapsed, 1)
+
+        # Single persistent connection
+        with SMTPDeliveryEngine(config) as engine:
+            for recipient, body in digests.items():
+                engine.send([recipient], body)
+        results["persistent_connection"] = engine.stats()["messages_per_second"]
+
+        # Threaded pool of persistent connections
+        with SMTPDeliveryEngine(config, pool_size=args.pool_size) as engine:
+            engine.send_digests(digests)
+        results[f"pool_of_{args.pool_size}"] = engine.stats()["messages_per_second"]
+    finally:
+        controller.stop()
+
+    print(json.dumps({"messages": args.messages, "messages_per_second": results, "received": handler.received}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Synthetic job posting corpus for benchmarks.
+
+Generates realistic-looking postings (titles, companies, locations, skills and
+long descriptions) deterministically from a seed, with a controlled share of
+re-posted duplicates (same title and company under a new link), and renders
+them as the `div.job-card` HTML pages that scraper.scrape_job_board parses.
+"""
+import html
+import json
+import random
+
+SENIORITIES = ("Junior", "", "", "Senior", "Staff", "Lead", "Principal")
+ROLES = (
+    "Python Developer", "Backend Engineer", "Data Scientist", "Data Engineer", "Machine Learning Engineer",
+    "DevOps Engineer", "Site Reliability Engineer", "Frontend Developer", "Full Stack Engineer",
+    "Platform Engineer", "Analytics Engineer", "Security Engineer", "QA Automation Engineer",
+    "Mobile Developer", "Cloud Architect", "Database Administrator", "Research Scientist",
+)
+COMPANY_PARTS = (
+    ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne", "Tyrell", "Cyberdyne",
+     "Soylent", "Aperture", "Massive", "Pied Piper", "Wonka", "Oscorp", "Nakatomi", "Gringotts"),
+    ("Labs", "Systems", "Analytics", "Technologies", "Health", "Finance", "Robotics", "Cloud", "Media", "Logistics"),
+)
+LOCATIONS = (
+    "Remote", "Remote (EU)", "New York, NY", "San Francisco, CA", "Austin, TX", "Seattle, WA", "Boston, MA",
+    "London, UK", "Berlin, Germany", "Paris, France", "Amsterdam, Netherlands", "Toronto, Canada",
+    "Bangalore, India", "Singapore", "Sydney, Australia", "Hybrid - Chicago, IL",
+)
+SKILLS = (
+    "Python", "SQL", "Django", "Flask", "FastAPI", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka",
+    "Spark", "Airflow", "dbt", "Pandas", "NumPy", "PyTorch", "TensorFlow", "scikit-learn", "NLP", "LLMs",
+    "Docker", "Kubernetes", "Terraform", "AWS", "GCP", "Azure", "Linux", "Git", "CI/CD", "React",
+    "TypeScript", "Go", "Rust", "Java", "Scala", "GraphQL", "REST", "Elasticsearch", "FAISS", "Snowflake",
+)
+SENTENCES = (
+    "We are looking for a {role} to join our {team} team.",
+    "You will design, build and operate services used by millions of customers.",
+    "Our stack includes {skill_a}, {skill_b} and {skill_c}.",
+    "Experience with {skill_a} in production is required; {skill_b} is a plus.",
+    "You will collaborate closely with product managers, designers and other engineers.",
+    "We value clear written communication, ownership and a pragmatic approach to problems.",
+    "The team works {location_mode} and meets in person once a quarter.",
+    "You will mentor junior colleagues and take part in code reviews and design discussions.",
+    "We ship small changes frequently and invest heavily in testing and observability.",
+    "Responsibilities include improving performance, reliability and cost efficiency of our {team} platform.",
+    "You have {years}+ years of professional experience building software.",
+    "Bonus points for open source contributions or experience with {skill_c}.",
+    "We offer competitive salary, equity, a learning budget and flexible working hours.",
+    "{company} is an equal opportunity employer and welcomes applicants from all backgrounds.",
+)
+TEAMS = ("data", "platform", "payments", "search", "growth", "infrastructure", "machine learning", "core product")
+
+def generate_jobs(count, duplicate_rate=0.1, description_words=250, seed=0):
+    """
+    Generates `count` job postings.
+
+    Args:
+        count (int): Number of postings.
+        duplicate_rate (float): Share of postings that re-post an earlier job (same title and
+            company, new link), which clean_data is expected to remove.
+        description_words (int): Approximate description length in words.
+        seed (int): Random seed; the same arguments always produce the same corpus.
+
+    Returns:
+        list: Job dictionaries with the fields produced by the scraper (without "id").
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        if jobs and rng.random() < duplicate_rate:
+            original = jobs[rng.randrange(len(jobs))]
+            jobs.append({**original, "link": f"/jobs/{i}"})
+            continue
+
+        role = rng.choice(ROLES)
+        title = f"{rng.choice(SENIORITIES)} {role}".strip()
+        company = f"{rng.choice(COMPANY_PARTS[0])} {rng.choice(COMPANY_PARTS[1])} {i % 997}"
+        location = rng.choice(LOCATIONS)
+        skills = rng.sample(SKILLS, rng.randint(3, 8))
+        values = {
+            "role": role, "company": company, "team": rng.choice(TEAMS), "years": rng.randint(1, 10),
+            "location_mode": "fully remote" if location.startswith("Remote") else f"from our {location} office",
+            "skill_a": skills[0], "skill_b": skills[1], "skill_c": skills[2],
+        }
+        sentences, words = [], 0
+        while words < description_words:
+            sentence = rng.choice(SENTENCES).format(**values)
+            sentences.append(sentence)
+            words += len(sentence.split())
+        jobs.append({
+            "title": title,
+            "company": company,
+            "location": location,
+            "description": " ".join(sentences),
+            "skills": skills,
+            "link": f"/jobs/{i}",
+        })
+    return jobs
+
+def render_page(jobs, page, per_page):
+    """Renders one page of postings as the HTML served by a job board."""
+    start = (page - 1) * per_page
+    cards = []
+    for job in jobs[start:start + per_page]:
+        skills = "".join(f"<li>{html.escape(skill)}</li>" for skill in job["skills"])
+        cards.append(
+            "<div class='job-card'>"
+            f"<h2>{html.escape(job['title'])}</h2>"
+            f"<span class='company'>{html.escape(job['company'])}</span>"
+            f"<span class='location'>{html.escape(job['location'])}</span>"
+            f"<a href='{html.escape(job['link'])}'>View</a>"
+            f"<ul class='skills-list'>{skills}</ul>"
+            f"<div class='description'>{html.escape(job['description'])}</div>"
+            "</div>"
+        )
+    pages = max(1, -(-len(jobs) // per_page))
+    next_link = f"<a class='next' href='/jobs?page={page + 1}&per_page={per_page}'>Next</a>" if page < pages else ""
+    return f"<html><body><h1>Jobs - page {page} of {pages}</h1>{''.join(cards)}{next_link}</body></html>"
+
+def write_jsonl(jobs, path):
+    """Writes postings one JSON object per line."""
+    with open(path, "w", encoding="utf-8") as file:
+        for job in jobs:
+            file.write(json.dumps(job) + "\n")
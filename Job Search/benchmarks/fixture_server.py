@@ -0,0 +1,133 @@
+"""
+Local job board serving a synthetic corpus as paginated `div.job-card` pages.
+
+    GET /jobs?page=N&per_page=M   One page of postings (page numbers start at 1)
+
+Every response is delayed by `latency` seconds (plus up to `jitter` seconds) and a
+share of `error_rate` requests fails with 503, so scraping can be benchmarked
+reproducibly without touching real boards.
+
+Usage (from the Job Search directory):
+    python benchmarks/fixture_server.py --jobs 10000 --port 8080 --latency 0.05 --error-rate 0.01
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from corpus import generate_jobs, render_page
+
+class FixtureServer:
+    """Runs the fixture job board in a background thread; use as a context manager."""
+
+    def __init__(self, jobs, per_page=50, latency=0.0, jitter=0.0, error_rate=0.0, host="127.0.0.1", port=0, seed=0):
+        self.jobs = jobs
+        self.per_page = per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self.jobs) // self.per_page))
+
+    def board_config(self):
+        """`scraping.job_boards` entries covering every page."""
+        return [{"url": f"{self.url}/jobs", "query_params": {"page": page, "per_page": self.per_page}}
+                for page in range(1, self.pages + 1)]
+
+    def _handler_class(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query)
+                with fixture._lock:
+                    fixture.requests += 1
+                    delay = fixture.latency + fixture._rng.random() * fixture.jitter
+                    fail = fixture._rng.random() < fixture.error_rate
+                    if fail:
+                        fixture.errors += 1
+                time.sleep(delay)
+                if parsed.path != "/jobs":
+                    self.send_error(404)
+                    return
+                if fail:
+                    self.send_error(503, "Injected error")
+                    return
+                try:
+                    page = int(query.get("page", ["1"])[0])
+                    per_page = int(query.get("per_page", [str(fixture.per_page)])[0])
+                except ValueError:
+                    self.send_error(400)
+                    return
+                body = render_page(fixture.jobs, page, per_page).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serves in the calling thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    jobs = generate_jobs(args.jobs, duplicate_rate=args.duplicate_rate)
+    server = FixtureServer(jobs, per_page=args.per_page, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, port=args.port)
+    print(f"Serving {len(jobs)} jobs on {server.pages} pages at {server.url}/jobs?page=1&per_page={args.per_page}")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Load test for the query service (src/service.py).
+
+Sends search requests from concurrent client threads for a fixed duration and
+reports throughput (QPS), latency percentiles and errors.
+
+Usage (from the Job Search directory, with the service running):
+    python src/service.py &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --concurrency 8 --duration 30
+"""
+import argparse
+import json
+import threading
+import time
+
+import numpy as np
+import requests
+
+QUERIES = (
+    "python developer", "senior data engineer spark airflow", "remote machine learning pytorch",
+    "kubernetes terraform aws", "frontend react typescript", "sql analytics dbt snowflake",
+)
+
+def run_load(url, concurrency=8, duration=10.0, top_k=5, filters=None):
+    """
+    Runs the load test.
+
+    Returns:
+        dict: Requests, errors, QPS and latency percentiles in milliseconds.
+    """
+    latencies, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker):
+        session = requests.Session()  # Keep-alive connection per client
+        local_latencies, local_errors, i = [], [], worker
+        while time.perf_counter() < deadline:
+            payload = {"query": QUERIES[i % len(QUERIES)], "top_k": top_k}
+            if filters:
+                payload["filters"] = filters
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{url}/search", json=payload, timeout=30)
+                response.raise_for_status()
+                local_latencies.append(time.perf_counter() - start)
+            except requests.exceptions.RequestException as e:
+                local_errors.append(str(e))
+            i += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(worker,)) for worker in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "requests": len(latencies),
+        "errors": len(errors),
+        "qps": round(len(latencies) / elapsed, 1),
+    }
+    if latencies:
+        for p in (50, 95, 99):
+            result[f"p{p}_ms"] = round(float(np.percentile(latencies, p)) * 1000, 3)
+        result["max_ms"] = round(max(latencies) * 1000, 3)
+    if errors:
+        result["first_error"] = errors[0]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8],
+                        help="Client thread counts to test, one run each.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run.")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--remote", action="store_true", help="Add a remote=true filter to every query.")
+    args = parser.parse_args()
+
+    health = requests.get(f"{args.url}/health", timeout=10).json()
+    results = {"snapshot": health, "runs": []}
+    for concurrency in args.concurrency:
+        results["runs"].append(run_load(args.url, concurrency, args.duration, args.top_k,
+                                        {"remote": True} if args.remote else None))
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
 import logging
-from rank_bm25 import BM25Okapi
-import numpy as np
-from sentence_transformers import SentenceTransformer
+import time
+from metadata_index import MetadataIndex
+from ranking import build_bm25, keyword_candidates, vector_candidates, interleave
+from processor import embedding_model  # Shared with processor so that the model is loaded only once
+from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
-# Load embedding model for vector search
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-
 def analyze_jobs(jobs):
     """Placeholder logic: Assume jobs with fewer than 10 applicants are 'interesting'."""
     interesting_jobs = []
@@ -37,7 +36,7 @@ def analyze_jobs(jobs):
 
     return interesting_jobs
 
-def hybrid_search(query, jobs, index, top_k=5):
+def hybrid_search(query, jobs, index, top_k=5, filters=None, metadata_index=None, bm25=None, shards=None):
     """
     Perform hybrid search (keyword + vector search) to retrieve relevant jobs.
     
@@ -46,25 +45,59 @@ def hybrid_search(query, jobs, index, top_k=5):
         jobs (list): List of job dictionaries.
         index (FAISS index): Vector database index.
         top_k (int): Number of results to return.
+        filters (dict, optional): Hard constraints (location, company, remote, skills)
+            applied before scoring. See MetadataIndex.evaluate for the expression format.
+        metadata_index (MetadataIndex, optional): Prebuilt metadata index over `jobs`.
+            Built on the fly when filters are given and no index is passed.
+        bm25 (BM25Okapi, optional): Prebuilt keyword index over `jobs` (see build_bm25).
+            Built on the fly when omitted, over the jobs that pass the filters only.
+        shards (ShardedSearch, optional): Search the shard workers instead: the query is
+            sent to every shard in parallel and the per-shard top-k are merged. `jobs` and
+            `index` are not used.
     
     Returns:
-        list: Top-k most relevant jobs.
+        list: Top-k most relevant jobs, in ranking order.
     """
+    start = time.perf_counter()
+    if shards is not None:
+        relevant_jobs = shards.search(query, top_k=top_k, filters=filters)
+        metrics.observe("hybrid_search_seconds", time.perf_counter() - start)
+        logger.info(f"Hybrid search retrieved {len(relevant_jobs)} jobs from {shards.num_shards} shards.")
+        return relevant_jobs
+
+    allowed_ids = None
+    if filters:
+        if metadata_index is None:
+            metadata_index = MetadataIndex(jobs)
+        allowed_ids = metadata_index.allowed_ids(filters)
+        logger.info(f"Filters {filters} allow {len(allowed_ids)} of {len(jobs)} jobs.")
+        if len(allowed_ids) == 0:
+            metrics.observe("hybrid_search_seconds", time.perf_counter() - start)
+            return []
+
     # Step 1: Keyword Filtering (BM25)
-    tokenized_descriptions = [job["description"].split() for job in jobs]
-    bm25 = BM25Okapi(tokenized_descriptions)
-    tokenized_query = query.split()
-    scores = bm25.get_scores(tokenized_query)
-    keyword_indices = np.argsort(scores)[::-1][:top_k]
+    if bm25 is not None:
+        keyword_indices, _ = keyword_candidates(bm25, query, top_k, allowed_ids)
+    elif allowed_ids is None:
+        keyword_indices, _ = keyword_candidates(build_bm25(jobs), query, top_k)
+    else:
+        # Only index the jobs that passed the filters, then map back to positions in `jobs`
+        subset_indices, _ = keyword_candidates(build_bm25(jobs[i] for i in allowed_ids), query, top_k)
+        keyword_indices = allowed_ids[subset_indices]
+
+    keyword_done = time.perf_counter()
+    metrics.observe("hybrid_search_phase_seconds", keyword_done - start, phase="keyword")
 
     # Step 2: Vector Search (FAISS)
     query_embedding = embedding_model.encode(query)
-    distances, vector_indices = index.search(np.array([query_embedding]), top_k)
+    vector_indices, _ = vector_candidates(index, query_embedding, top_k, allowed_ids)
+    metrics.observe("hybrid_search_phase_seconds", time.perf_counter() - keyword_done, phase="vector")
 
-    # Step 3: Combine Results
-    combined_indices = set(keyword_indices).union(vector_indices[0])
-    relevant_jobs = [jobs[i] for i in combined_indices if i < len(jobs)]  # Ensure indices are valid
+    # Step 3: Combine Results, interleaving both rankings so the best hits of each come first
+    combined_indices = interleave(keyword_indices.tolist(), vector_indices.tolist())
+    relevant_jobs = [jobs[i] for i in combined_indices]
 
+    metrics.observe("hybrid_search_seconds", time.perf_counter() - start)
     logger.info(f"Hybrid search retrieved {len(relevant_jobs)} jobs.")
     return relevant_jobs
 
@@ -79,7 +112,7 @@ if __name__ == "__main__":
     from processor import generate_embeddings, index_jobs_in_faiss
     embeddings = generate_embeddings(jobs)
     dimension = embeddings.shape[1]
-    index = index_jobs_in_faiss(jobs)
+    index, job_metadata = index_jobs_in_faiss(jobs)
 
     # Perform hybrid search
     query = "Find me remote Python developer jobs."
@@ -88,3 +121,9 @@ if __name__ == "__main__":
     print("Retrieved jobs:")
     for job in relevant_jobs:
         print(job)
+
+    # Same query restricted to a single company
+    filtered_jobs = hybrid_search(query, jobs, index, top_k=2, filters={"company": "Company A"})
+    print("Retrieved jobs at Company A:")
+    for job in filtered_jobs:
+        print(job)
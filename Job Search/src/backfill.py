@@ -0,0 +1,211 @@
+import argparse
+import json
+import logging
+import os
+import time
+from array import array
+from itertools import islice
+
+import numpy as np
+import faiss
+from processor import generate_embeddings, iter_batches, EMBED_BATCH_SIZE
+from ranking import IncrementalBM25, bm25_tokens
+from metrics import metrics, peak_rss_bytes
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+BACKFILL_DIR = os.path.join(PROJECT_ROOT, "output", "backfill")
+
+SEGMENTS_DIR = "segments"
+JOBS_FILE = "jobs.jsonl"
+CHECKPOINT_FILE = "checkpoint.json"
+
+def iter_jsonl(path):
+    """Streams jobs from a JSON Lines file, one object per line."""
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+class JobStore:
+    """
+    Append-only JSON Lines file of jobs; line i is the job at position i of the FAISS and BM25 indexes.
+
+    Only the byte offset of each line is kept in memory, so looking up the jobs of a
+    search result reads just those lines.
+    """
+
+    def __init__(self, path, rows=0):
+        self.path = path
+        self.offsets = array("Q")
+        mode = "r+b" if rows and os.path.exists(path) else "w+b"
+        self._file = open(path, mode)
+        if rows:
+            for _ in range(rows):  # Rebuild the offsets of the checkpointed rows; drop anything written after
+                self.offsets.append(self._file.tell())
+                if not self._file.readline():
+                    raise ValueError(f"{path} has fewer than {rows} jobs; the checkpoint does not match it.")
+            self._file.truncate()
+        self._file.seek(0, os.SEEK_END)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, jobs):
+        for job in jobs:
+            self.offsets.append(self._file.tell())
+            self._file.write(json.dumps(job).encode("utf-8") + b"\n")
+
+    def __getitem__(self, row):
+        self._file.flush()
+        end = self._file.tell()
+        self._file.seek(self.offsets[row])
+        job = json.loads(self._file.readline())
+        self._file.seek(end)
+        return job
+
+    def get(self, rows):
+        return [self[int(row)] for row in rows]
+
+    def flush(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+def _write_atomic(path, write):
+    temporary = f"{path}.tmp"
+    write(temporary)
+    os.replace(temporary, path)
+
+class Backfill:
+    """
+    Streams a job corpus through normalize -> encode -> FAISS add -> BM25 postings, one batch at a time.
+
+    Memory stays flat in the corpus size apart from the indexes themselves: one batch
+    of jobs and embeddings is held at a time and the jobs go to a JobStore on disk.
+    For 1M postings the IndexFlatL2 takes ~1.5 GB (384 float32 dimensions) and the
+    BM25 postings roughly 1 GB, which fits an 8 GB worker.
+
+    Every checkpoint_every batches the vectors added since the previous checkpoint are
+    written to a new segment file (named after its row range) and checkpoint.json is
+    replaced with the list of segments and the number of jobs done, so a checkpoint
+    only writes the new vectors. A resumed run rebuilds the FAISS index from the listed
+    segments and the BM25 postings from the first `rows` lines of the job store
+    (tokenizing is cheap next to encoding), then skips the jobs already indexed.
+    Segments written after the last checkpoint.json are never read.
+    """
+
+    def __init__(self, output_dir=BACKFILL_DIR, batch_size=EMBED_BATCH_SIZE, checkpoint_every=20, encode=None):
+        self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.encode = encode or generate_embeddings
+        self.index = None
+        self.bm25 = IncrementalBM25()
+        self.store = None
+        self.segments = []  # Segment files of the checkpointed rows, in row order
+        self._pending = []  # Embeddings added since the last checkpoint
+        self._checkpointed_rows = 0
+
+    def _path(self, name):
+        return os.path.join(self.output_dir, name)
+
+    def _load_checkpoint(self):
+        path = self._path(CHECKPOINT_FILE)
+        if not os.path.exists(path):
+            return 0
+        with open(path, "r") as file:
+            checkpoint = json.load(file)
+        rows = checkpoint["rows"]
+        self.segments = checkpoint.get("segments", [])
+        for name in self.segments:
+            vectors = np.load(self._path(os.path.join(SEGMENTS_DIR, name)))
+            if self.index is None:
+                self.index = faiss.IndexFlatL2(vectors.shape[1])
+            self.index.add(vectors)
+        if rows:
+            self.bm25.add_documents(bm25_tokens(job) for job in islice(iter_jsonl(self._path(JOBS_FILE)), rows))
+        vectors = self.index.ntotal if self.index is not None else 0
+        if not vectors == self.bm25.corpus_size == rows:
+            raise ValueError(f"Checkpoint in {self.output_dir} is inconsistent: {rows} rows, {vectors} vectors, "
+                             f"{self.bm25.corpus_size} BM25 documents; restart the backfill.")
+        self._checkpointed_rows = rows
+        logger.info(f"Resuming backfill after {rows} jobs.")
+        return rows
+
+    def checkpoint(self):
+        """
+        Writes the vectors added since the last checkpoint as a new segment, then the progress file.
+
+        The progress file is written last and is the only one that names the segments, so
+        a crash in between neither skips jobs nor indexes them twice.
+        """
+        self.store.flush()
+        if self._pending:
+            start, end = self._checkpointed_rows, len(self.store)
+            name = f"vectors_{start:012d}_{end:012d}.npy"
+            os.makedirs(self._path(SEGMENTS_DIR), exist_ok=True)
+
+            def write_segment(path):
+                with open(path, "wb") as file:
+                    np.save(file, np.concatenate(self._pending))
+            _write_atomic(self._path(os.path.join(SEGMENTS_DIR, name)), write_segment)
+            self.segments.append(name)
+            self._pending = []
+
+        def write_progress(path):
+            with open(path, "w") as file:
+                json.dump({"rows": len(self.store), "segments": self.segments, "updated_at": time.time()}, file)
+        _write_atomic(self._path(CHECKPOINT_FILE), write_progress)
+        self._checkpointed_rows = len(self.store)
+
+    def run(self, jobs, resume=True):
+        """
+        Indexes `jobs` (any iterable, e.g. iter_jsonl(path)).
+
+        Returns:
+            tuple: (FAISS index, IncrementalBM25, JobStore), aligned by position.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        done = self._load_checkpoint() if resume else 0
+        self.store = JobStore(self._path(JOBS_FILE), rows=done)
+        start = time.perf_counter()
+        batches = 0
+        for batch in iter_batches(islice(jobs, done, None), self.batch_size):
+            embeddings = np.asarray(self.encode(batch), dtype=np.float32)
+            if self.index is None:
+                self.index = faiss.IndexFlatL2(embeddings.shape[1])
+            self.index.add(embeddings)
+            self._pending.append(embeddings)
+            self.bm25.add_documents(bm25_tokens(job) for job in batch)
+            self.store.append(batch)
+            batches += 1
+            if batches % self.checkpoint_every == 0:
+                self.checkpoint()
+                logger.info(f"Backfill: {len(self.store)} jobs indexed, peak RSS {peak_rss_bytes()} bytes.")
+        self.checkpoint()
+        elapsed = time.perf_counter() - start
+        metrics.observe("backfill_seconds", elapsed)
+        metrics.set_gauge("backfill_jobs", len(self.store))
+        logger.info(f"Backfill finished: {len(self.store)} jobs ({len(self.store) - done} in this run, {elapsed:.1f}s).")
+        return self.index, self.bm25, self.store
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed and index a large job corpus (JSON Lines) in bounded memory.")
+    parser.add_argument("input", help="Jobs file with one JSON object per line.")
+    parser.add_argument("--output-dir", default=BACKFILL_DIR)
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--checkpoint-every", type=int, default=20, help="Batches between checkpoints.")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backfill = Backfill(args.output_dir, args.batch_size, args.checkpoint_every)
+    index, bm25, store = backfill.run(iter_jsonl(args.input), resume=not args.restart)
+    store.close()
+    print(json.dumps({"jobs": len(store), "vectors": index.ntotal if index else 0, "terms": len(bm25.postings),
+                      "peak_rss_bytes": peak_rss_bytes()}, indent=2))
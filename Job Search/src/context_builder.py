@@ -0,0 +1,183 @@
+import logging
+import math
+import re
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a conservative estimate
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_TOKENS = 1500     # Token budget for the whole context block
+DEFAULT_PER_JOB_TOKENS = 250  # Token budget for a single job entry
+SNIPPET_SEPARATOR = " ... "
+LINE_SEPARATOR = "\n"
+FALLBACK_CHARS_PER_TOKEN = 4  # Without tiktoken: letters per estimated token, rounded up per word
+
+# Digit runs are split into groups of three and newlines are tokens of their own, as in BPE encodings
+TOKEN_PATTERN = re.compile(r"\d{1,3}|[^\W\d]+|[^\w\s]|\n")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "for", "find", "from", "in", "is", "jobs", "job",
+    "me", "of", "on", "or", "the", "to", "we", "with", "you",
+}
+
+_encodings = {}
+
+def count_tokens(text, encoding_name="cl100k_base"):
+    """
+    Counts tokens with a local tokenizer.
+
+    Uses tiktoken when it is installed (its BPE files are cached locally after the
+    first use). Otherwise the count is estimated on the high side, so that budgets hold:
+    every punctuation mark, newline and group of up to three digits is one token, and a
+    word costs one token per FALLBACK_CHARS_PER_TOKEN letters (at least one), which is
+    more than BPE encodings need for common words and about what they need for rare ones.
+    """
+    if not text:
+        return 0
+    if tiktoken is not None:
+        encoding = _encodings.get(encoding_name)
+        if encoding is None:
+            encoding = _encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+        return len(encoding.encode(text))
+    return sum(math.ceil(len(token) / FALLBACK_CHARS_PER_TOKEN) for token in TOKEN_PATTERN.findall(text))
+
+def query_terms(query):
+    """Lowercased query terms without stopwords."""
+    return {term for term in re.findall(r"\w+", query.lower()) if term not in STOPWORDS}
+
+def split_sentences(text):
+    """Splits a description into sentences."""
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.split(text or "") if sentence.strip()]
+
+def truncate_to_tokens(text, max_tokens):
+    """Truncates text word by word so that it fits into max_tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:  # Binary search for the longest prefix that fits
+        middle = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:middle])) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low])
+
+def _select_sentences(sentences, query, max_tokens):
+    """
+    Picks the sentences most relevant to the query within a token budget.
+
+    Returns:
+        list: (position, text) pairs in original order; text is cut short only when even
+        the best sentence does not fit on its own.
+    """
+    terms = query_terms(query)
+    scored = []
+    for position, sentence in enumerate(sentences):
+        words = set(re.findall(r"\w+", sentence.lower()))
+        scored.append((len(terms & words), -position, sentence))
+    scored.sort(reverse=True)
+
+    selected = []
+    used = 0
+    separator_cost = count_tokens(SNIPPET_SEPARATOR)  # Upper bound: adjacent sentences are joined by a space
+    for score, negative_position, sentence in scored:
+        cost = count_tokens(sentence) + (separator_cost if selected else 0)
+        if used + cost > max_tokens:
+            if not selected:
+                # Even the best sentence is too long: keep its beginning, which uses up the budget
+                selected.append((-negative_position, truncate_to_tokens(sentence, max_tokens)))
+                break
+            continue
+        selected.append((-negative_position, sentence))
+        used += cost
+    return sorted(selected)
+
+def _join_sentences(selected):
+    """Joins selected sentences, marking the places where sentences were left out with SNIPPET_SEPARATOR."""
+    parts = []
+    previous = None
+    for position, sentence in selected:
+        if previous is not None:
+            parts.append(" " if position == previous + 1 else SNIPPET_SEPARATOR)
+        parts.append(sentence)
+        previous = position
+    return "".join(parts)
+
+def select_snippets(description, query, max_tokens):
+    """
+    Picks the sentences of a description most relevant to the query within a token budget.
+
+    Sentences are scored by how many query terms they contain (ties keep the earlier
+    sentence) and are returned in their original order, with SNIPPET_SEPARATOR where
+    sentences in between were left out.
+    """
+    sentences = split_sentences(description)
+    if not sentences or max_tokens <= 0:
+        return ""
+    return _join_sentences(_select_sentences(sentences, query, max_tokens))
+
+def build_context(jobs, query, max_tokens=DEFAULT_MAX_TOKENS, per_job_tokens=DEFAULT_PER_JOB_TOKENS):
+    """
+    Builds the prompt context from ranked jobs within a token budget.
+
+    Jobs are packed in ranking order, one per line; the line separators count against
+    max_tokens. Each job gets at most per_job_tokens tokens (title, link and the most
+    query-relevant description snippets). A job whose title and link alone do not fit
+    into the remaining budget is skipped, and packing continues with the next one.
+
+    Args:
+        jobs (list): Job dictionaries in ranking order.
+        query (str): User query used to pick relevant snippets.
+        max_tokens (int): Token budget for the whole context.
+        per_job_tokens (int): Token budget per job.
+
+    Returns:
+        tuple: (context string, stats dictionary)
+    """
+    lines = []
+    used = 0
+    truncated = 0
+    separator_cost = count_tokens(LINE_SEPARATOR)
+    for job in jobs:
+        separator = separator_cost if lines else 0
+        header = f"{job.get('title', 'N/A')}: "
+        footer = f" ({job.get('link', '#')})"
+        overhead = count_tokens(header) + count_tokens(footer)
+        job_budget = min(per_job_tokens, max_tokens - used - separator) - overhead
+        if job_budget <= 0:
+            logger.debug(f"Skipped job '{job.get('title', 'N/A')}': its title and link do not fit into the remaining budget.")
+            continue
+
+        description = job.get("description", "")
+        sentences = split_sentences(description)
+        selected = _select_sentences(sentences, query, job_budget)
+        snippet = _join_sentences(selected)
+        if [sentence for position, sentence in selected] != sentences:
+            truncated += 1
+            logger.debug(
+                f"Truncated job '{job.get('title', 'N/A')}' from {count_tokens(description)} "
+                f"to {count_tokens(snippet)} description tokens."
+            )
+
+        line = f"{header}{snippet}{footer}"
+        lines.append(line)
+        used += separator + count_tokens(line)
+
+    stats = {
+        "jobs_available": len(jobs),
+        "jobs_packed": len(lines),
+        "jobs_truncated": truncated,
+        "context_tokens": used,
+        "max_tokens": max_tokens,
+    }
+    if len(lines) < len(jobs):
+        logger.info(f"Context budget exhausted; dropped {len(jobs) - len(lines)} jobs.")
+    logger.info(
+        f"Packed {stats['jobs_packed']}/{stats['jobs_available']} jobs into {used}/{max_tokens} "
+        f"context tokens ({truncated} truncated)."
+    )
+    return LINE_SEPARATOR.join(lines), stats
@@ -0,0 +1,246 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+SCHEDULE_FILE = os.path.join(PROJECT_ROOT, "output", "crawl_schedule.json")
+CACHE_DIR = os.path.join(PROJECT_ROOT, "output", "crawl_cache")
+
+DAY = 86400
+
+def board_key(board):
+    """Identifies a board entry by URL and query parameters (one board can be crawled with several queries)."""
+    params = json.dumps(board.get("query_params") or {}, sort_keys=True)
+    return f"{(board.get('url') or '').strip()}?{params}"
+
+class CrawlScheduler:
+    """
+    Adapts how often each job board (URL + query) is crawled to how often new postings appear on it.
+
+    After every crawl the scheduler updates two moving averages per board: new postings
+    per hour and seconds per fetch. The next interval is the time in which target_new
+    new postings are expected, clamped to [min_interval, max_interval]. A board that
+    keeps returning nothing new backs off towards max_interval.
+
+    Two limits keep the total within max_requests_per_day. The intervals are stretched
+    when their steady-state request rate exceeds the budget. In each run, due boards are
+    crawled in order of expected new postings per second of fetch time, until the
+    requests of the last 24 hours reach the budget. Boards that are not crawled
+    contribute the jobs of their last crawl. Boards removed from the configuration
+    are forgotten, so they no longer take a share of the budget.
+    """
+
+    def __init__(self, min_interval=900, max_interval=7 * DAY, target_new=5, smoothing=0.3,
+                 max_requests_per_day=None, state_path=SCHEDULE_FILE, cache_dir=CACHE_DIR):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_new = target_new
+        self.smoothing = smoothing
+        self.max_requests_per_day = max_requests_per_day
+        self.state_path = state_path
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        state = self._load_state()
+        self.boards = state.get("boards", {})    # board key -> schedule entry
+        self.requests = state.get("requests", [])  # Start times of the crawls of the last 24 hours
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r") as file:
+            return json.load(file)
+
+    def save(self):
+        """Persists the schedule (atomically, like the metrics files)."""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temporary = f"{self.state_path}.tmp"
+        with self._lock:
+            with open(temporary, "w") as file:
+                json.dump({"boards": self.boards, "requests": self.requests}, file)
+        os.replace(temporary, self.state_path)
+
+    def _entry(self, key):
+        return self.boards.setdefault(key, {
+            "interval": self.min_interval, "last_crawled": None, "new_per_hour": None, "seconds_per_fetch": None,
+            "crawls": 0, "last_new": None, "last_jobs": 0, "seen_ids": [],
+        })
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.json")
+
+    def cached_jobs(self, board):
+        """Jobs of the board's last successful crawl."""
+        path = self._cache_path(board_key(board))
+        if not os.path.exists(path):
+            return []
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def _prune(self, keys):
+        removed = [key for key in self.boards if key not in keys]
+        for key in removed:
+            del self.boards[key]
+            path = self._cache_path(key)
+            if os.path.exists(path):
+                os.remove(path)
+        if removed:
+            logger.info(f"Forgot {len(removed)} boards that are no longer configured.")
+
+    def _budget_left(self, now):
+        self.requests = [start for start in self.requests if now - start < DAY]
+        if self.max_requests_per_day is None:
+            return None
+        return max(0, self.max_requests_per_day - len(self.requests))
+
+    def select(self, boards, now=None):
+        """
+        Splits the configured boards into the ones to crawl now and the ones to skip.
+
+        Returns:
+            tuple: (boards to crawl, boards to skip), in configuration order.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune({board_key(board) for board in boards})
+            due = []
+            for position, board in enumerate(boards):
+                entry = self._entry(board_key(board))
+                if entry["last_crawled"] is None or now - entry["last_crawled"] >= entry["interval"]:
+                    # Never-crawled boards first, then the most expected new postings per second of fetch time
+                    if entry["last_crawled"] is None:
+                        expected_new = float("inf")
+                    else:
+                        expected_new = (entry["new_per_hour"] or 0) * (now - entry["last_crawled"]) / 3600
+                    due.append((-expected_new / max(entry["seconds_per_fetch"] or 1.0, 0.1), position))
+            due.sort()
+            budget = self._budget_left(now)
+            if budget is not None and len(due) > budget:
+                logger.info(f"Crawl budget left for the last 24h: {budget} requests; deferring {len(due) - budget} due boards.")
+                due = due[:budget]
+        selected = {position for _, position in due}
+        crawl = [board for position, board in enumerate(boards) if position in selected]
+        skip = [board for position, board in enumerate(boards) if position not in selected]
+        return crawl, skip
+
+    def record(self, board, jobs, seconds, now=None):
+        """
+        Records a crawl of `board` that returned `jobs` in `seconds`, and schedules the next one.
+
+        Returns:
+            int: Number of postings that were not in the board's previous crawl.
+        """
+        now = time.time() if now is None else now
+        key = board_key(board)
+        ids = [job.get("id") for job in jobs if job.get("id")]
+        with self._lock:
+            entry = self._entry(key)
+            self.requests.append(now)
+            if not jobs and entry["crawls"]:
+                # A failed fetch also returns no jobs: keep the cached jobs and back off
+                entry["interval"] = min(self.max_interval, entry["interval"] * 2)
+                entry["last_crawled"] = now
+                return 0
+
+            seen = set(entry["seen_ids"])
+            new = sum(1 for job_id in ids if job_id not in seen) if entry["crawls"] else 0  # The first crawl sets the baseline
+            if entry["last_crawled"] is not None:
+                hours = max((now - entry["last_crawled"]) / 3600, 1 / 3600)
+                entry["new_per_hour"] = self._average(entry["new_per_hour"], new / hours)
+            entry["seconds_per_fetch"] = self._average(entry["seconds_per_fetch"], seconds)
+            entry["last_crawled"] = now
+            entry["crawls"] += 1
+            entry["last_new"] = new
+            entry["last_jobs"] = len(jobs)
+            entry["seen_ids"] = ids
+            entry["interval"] = self._next_interval(entry)
+            self._fit_budget()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._cache_path(key), "w") as file:
+            json.dump(jobs, file)
+        logger.info(f"{board.get('url')}: {new} new of {len(jobs)} jobs; next crawl in {entry['interval'] / 3600:.1f}h.")
+        return new
+
+    def _average(self, previous, value):
+        if previous is None:
+            return value
+        return (1 - self.smoothing) * previous + self.smoothing * value
+
+    def _next_interval(self, entry):
+        rate = entry["new_per_hour"]
+        if rate is None:  # Only one crawl so far
+            return self.min_interval
+        if rate <= 0:
+            return min(self.max_interval, entry["interval"] * 2)
+        return min(self.max_interval, max(self.min_interval, self.target_new / rate * 3600))
+
+    def _fit_budget(self):
+        """Stretches all intervals evenly when their request rate would exceed the daily budget."""
+        if self.max_requests_per_day is None or not self.boards:
+            return
+        per_day = sum(DAY / entry["interval"] for entry in self.boards.values())
+        if per_day > self.max_requests_per_day:
+            factor = per_day / self.max_requests_per_day
+            for entry in self.boards.values():
+                entry["interval"] = min(self.max_interval, entry["interval"] * factor)
+
+    def report(self, now=None):
+        """Schedule state for the run report."""
+        now = time.time() if now is None else now
+        with self._lock:
+            boards = {}
+            for key, entry in self.boards.items():
+                boards[key] = {name: value for name, value in entry.items() if name != "seen_ids"}
+                if entry["last_crawled"] is not None:
+                    boards[key]["next_crawl_in"] = round(max(0, entry["last_crawled"] + entry["interval"] - now), 1)
+            return {
+                "boards": boards,
+                "requests_last_24h": sum(1 for start in self.requests if now - start < DAY),
+                "max_requests_per_day": self.max_requests_per_day,
+            }
+
+def remove_cached_jobs(job_ids, cache_dir=CACHE_DIR):
+    """Deletes expired jobs from the cached crawls, so skipped boards do not bring them back; returns the number removed."""
+    if not os.path.isdir(cache_dir):
+        return 0
+    expired = set(job_ids)
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(cache_dir, name)
+        with open(path, "r") as file:
+            jobs = json.load(file)
+        kept = [job for job in jobs if job.get("id") not in expired]
+        if len(kept) != len(jobs):
+            temporary = f"{path}.tmp"
+            with open(temporary, "w") as file:
+                json.dump(kept, file)
+            os.replace(temporary, path)
+            removed += len(jobs) - len(kept)
+    return removed
+
+def crawl_cache_dir(config):
+    """Directory of the cached crawls (relative paths start at the project root)."""
+    return os.path.join(PROJECT_ROOT, (config.get("crawl_schedule", {}) or {}).get("cache_dir", CACHE_DIR))
+
+def create_crawl_scheduler(config):
+    """Creates a CrawlScheduler from the `crawl_schedule` section of the configuration (None when disabled)."""
+    schedule_config = config.get("crawl_schedule", {}) or {}
+    if not schedule_config.get("enabled", False):
+        return None
+    return CrawlScheduler(
+        min_interval=schedule_config.get("min_interval", 900),
+        max_interval=schedule_config.get("max_interval", 7 * DAY),
+        target_new=schedule_config.get("target_new", 5),
+        smoothing=schedule_config.get("smoothing", 0.3),
+        max_requests_per_day=schedule_config.get("max_requests_per_day"),
+        state_path=os.path.join(PROJECT_ROOT, schedule_config.get("state_path", SCHEDULE_FILE)),  # Relative paths start at the project root
+        cache_dir=crawl_cache_dir(config),
+    )
@@ -0,0 +1,277 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+ONNX_MODEL_DIR = os.path.join(PROJECT_ROOT, "models", f"{DEFAULT_MODEL}-onnx")
+
+ONNX_FILE = "model.onnx"
+QUANTIZED_ONNX_FILE = "model.int8.onnx"
+METADATA_FILE = "encoder.json"
+MIN_COSINE = 0.99  # Default tolerance when validating an exported model against the PyTorch encoder
+
+VALIDATION_TEXTS = (
+    "senior python developer, remote",
+    "we are looking for a data engineer with spark, airflow and sql experience.",
+    "machine learning engineer (pytorch, nlp) in berlin",
+    "frontend developer react typescript",
+    "devops engineer: kubernetes, terraform, aws. on-call rotation shared across the team.",
+    "",
+)
+
+class SentenceTransformerEncoder:
+    """PyTorch sentence-transformers model (the original backend)."""
+
+    backend = "sentence_transformers"
+
+    def __init__(self, model_name=DEFAULT_MODEL, batch_size=32, device=None):
+        from sentence_transformers import SentenceTransformer  # Imported lazily: torch is slow to import
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.model = SentenceTransformer(model_name, device=device) if device else SentenceTransformer(model_name)
+
+    @property
+    def dimension(self):
+        get_dimension = getattr(self.model, "get_embedding_dimension", None) or self.model.get_sentence_embedding_dimension
+        return get_dimension()
+
+    def encode(self, texts, batch_size=None):
+        return self.model.encode(texts, batch_size=batch_size or self.batch_size)
+
+class ONNXEncoder:
+    """
+    Runs a sentence-transformers model exported by export_onnx with ONNX Runtime on the CPU.
+
+    Tokenization uses the model's fast (Rust) tokenizer and pooling/normalization are done
+    in numpy, so neither torch nor sentence_transformers is imported. Texts are sorted by
+    length before batching, which keeps padding (and wasted compute) small.
+    """
+
+    backend = "onnx"
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, quantized=False, batch_size=32, threads=None):
+        import onnxruntime
+        from tokenizers import Tokenizer
+        self.model_dir = model_dir
+        self.model_file = QUANTIZED_ONNX_FILE if quantized else ONNX_FILE
+        self.batch_size = batch_size
+        with open(os.path.join(model_dir, METADATA_FILE), "r") as file:
+            self.metadata = json.load(file)
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(self.metadata["max_length"])
+        self.tokenizer.enable_padding(pad_id=self.metadata["pad_token_id"], pad_token=self.metadata["pad_token"])
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, self.model_file), options, providers=["CPUExecutionProvider"])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    @property
+    def validation(self):
+        """Result of the last validate run for this model file (None if never validated)."""
+        return self.metadata.get("validation", {}).get(self.model_file)
+
+    @property
+    def dimension(self):
+        return self.metadata["dimension"]
+
+    def _encode_batch(self, texts):
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        features = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(None, {name: features[name] for name in self.input_names})[0]
+
+        if self.metadata["pooling"] == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:  # Mean over the real (non-padding) tokens
+            mask = attention_mask[:, :, None].astype(np.float32)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.metadata["normalize"]:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def encode(self, texts, batch_size=None):
+        """Encodes a text (1-D result) or a list of texts (2-D result), like SentenceTransformer.encode."""
+        if isinstance(texts, str):
+            return self._encode_batch([texts])[0]
+        texts = list(texts)
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        batch_size = batch_size or self.batch_size
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            embeddings[rows] = self._encode_batch([texts[i] for i in rows])
+        return embeddings
+
+def export_onnx(model_name=DEFAULT_MODEL, output_dir=ONNX_MODEL_DIR, quantize=True, opset=17):
+    """
+    Exports a sentence-transformers model to ONNX (and optionally a dynamically int8-quantized copy).
+
+    Writes model.onnx, model.int8.onnx, tokenizer.json and encoder.json (pooling, normalization,
+    maximum sequence length and dimension) to output_dir.
+
+    Returns:
+        SentenceTransformerEncoder: The source model, for validation.
+    """
+    import torch
+    from sentence_transformers import models as st_models
+
+    reference = SentenceTransformerEncoder(model_name, device="cpu")
+    modules = list(reference.model)
+    transformer = modules[0]
+    pooling = next((module for module in modules if isinstance(module, st_models.Pooling)), None)
+    pooling_config = pooling.get_config_dict() if pooling is not None else {}
+    pooling_mode = pooling_config.get("pooling_mode") or ("cls" if pooling_config.get("pooling_mode_cls_token") else "mean")
+    if pooling_mode not in ("mean", "cls"):
+        raise ValueError(f"Unsupported pooling mode '{pooling_mode}' for the ONNX backend. Expected 'mean' or 'cls'.")
+    tokenizer = transformer.tokenizer
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+
+    os.makedirs(output_dir, exist_ok=True)
+    sample = tokenizer(["example job posting", "python"], padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    if "token_type_ids" not in sample:
+        sample["token_type_ids"] = torch.zeros_like(sample["input_ids"])
+    axes = {0: "batch", 1: "sequence"}
+    model_path = os.path.join(output_dir, ONNX_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(transformer.auto_model.eval()), tuple(sample[name] for name in input_names), model_path,
+            input_names=input_names, output_names=["token_embeddings"], opset_version=opset, dynamo=False,
+            dynamic_axes={**{name: axes for name in input_names}, "token_embeddings": axes},
+        )
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(model_path, os.path.join(output_dir, QUANTIZED_ONNX_FILE), weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+    metadata = {
+        "source_model": model_name,
+        "dimension": reference.dimension,
+        "max_length": reference.model.max_seq_length,
+        "pooling": pooling_mode,
+        "normalize": any(isinstance(module, st_models.Normalize) for module in modules),
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "exported_at": time.time(),
+    }
+    with open(os.path.join(output_dir, METADATA_FILE), "w") as file:
+        json.dump(metadata, file, indent=2)
+    logger.info(f"Exported {model_name} to {output_dir}.")
+    return reference
+
+def validate_encoder(reference, candidate, texts=VALIDATION_TEXTS, min_cosine=MIN_COSINE):
+    """
+    Compares the embeddings of `candidate` with those of `reference` text by text.
+
+    Returns:
+        dict: Minimum and mean cosine similarity, and whether the minimum reaches min_cosine.
+    """
+    expected = np.asarray(reference.encode(list(texts)), dtype=np.float32)
+    actual = np.asarray(candidate.encode(list(texts)), dtype=np.float32)
+    norms = np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    cosines = (expected * actual).sum(axis=1) / np.clip(norms, 1e-12, None)
+    return {
+        "texts": len(texts),
+        "min_cosine": round(float(cosines.min()), 6),
+        "mean_cosine": round(float(cosines.mean()), 6),
+        "min_cosine_required": min_cosine,
+        "passed": bool(cosines.min() >= min_cosine),
+    }
+
+def record_validation(model_dir, quantized, result):
+    """Stores a validation result in encoder.json, where create_encoder checks it."""
+    path = os.path.join(model_dir, METADATA_FILE)
+    with open(path, "r") as file:
+        metadata = json.load(file)
+    metadata.setdefault("validation", {})[QUANTIZED_ONNX_FILE if quantized else ONNX_FILE] = result
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(metadata, file, indent=2)
+    os.replace(temporary, path)
+
+def create_encoder(config):
+    """
+    Creates the sentence encoder from the `embeddings` section of the configuration.
+
+    Supported backends: "sentence_transformers" (default, PyTorch) and "onnx" (ONNX Runtime,
+    optionally int8-quantized; export the model first with `python src/encoders.py export`).
+    """
+    embeddings_config = config.get("embeddings", {}) or {}
+    backend = embeddings_config.get("backend", "sentence_transformers")
+    batch_size = embeddings_config.get("batch_size", 32)
+    if backend == "sentence_transformers":
+        return SentenceTransformerEncoder(embeddings_config.get("model", DEFAULT_MODEL), batch_size=batch_size)
+    if backend == "onnx":
+        onnx_config = embeddings_config.get("onnx", {}) or {}
+        encoder = ONNXEncoder(
+            model_dir=os.path.join(PROJECT_ROOT, onnx_config.get("model_dir", ONNX_MODEL_DIR)),  # Relative paths start at the project root
+            quantized=onnx_config.get("quantized", True),
+            batch_size=batch_size,
+            threads=onnx_config.get("threads"),
+        )
+        validation = encoder.validation
+        if not validation:
+            logger.warning(f"{encoder.model_file} in {encoder.model_dir} has not been validated against the PyTorch model.")
+        elif not validation["passed"]:
+            logger.warning(f"{encoder.model_file} in {encoder.model_dir} failed validation: "
+                           f"min cosine {validation['min_cosine']} < {validation['min_cosine_required']}.")
+        return encoder
+    raise ValueError(f"Unknown embeddings backend '{backend}'. Expected 'sentence_transformers' or 'onnx'.")
+
+def _validation_texts(jobs_file):
+    if not jobs_file:
+        return VALIDATION_TEXTS
+    from processor import normalize_text  # Same preprocessing as generate_embeddings
+    with open(jobs_file, "r") as file:
+        jobs = json.load(file)
+    return [normalize_text(job.get("description", "")) for job in jobs]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export and validate the ONNX sentence encoder.")
+    parser.add_argument("command", choices=("export", "validate"))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--output-dir", default=ONNX_MODEL_DIR)
+    parser.add_argument("--no-quantize", action="store_true", help="Only export the float32 model.")
+    parser.add_argument("--jobs-file", help="Validate on the descriptions of these jobs (JSON list) instead of built-in samples.")
+    parser.add_argument("--min-cosine", type=float, default=MIN_COSINE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "export":
+        reference = export_onnx(args.model, args.output_dir, quantize=not args.no_quantize)
+    else:
+        reference = SentenceTransformerEncoder(args.model, device="cpu")
+    texts = _validation_texts(args.jobs_file)
+    results = {}
+    for quantized in (False, True):
+        if not os.path.exists(os.path.join(args.output_dir, QUANTIZED_ONNX_FILE if quantized else ONNX_FILE)):
+            continue
+        result = validate_encoder(reference, ONNXEncoder(args.output_dir, quantized=quantized), texts, args.min_cosine)
+        record_validation(args.output_dir, quantized, result)
+        results[QUANTIZED_ONNX_FILE if quantized else ONNX_FILE] = result
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if all(result["passed"] for result in results.values()) else 1)
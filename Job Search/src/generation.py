@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Async limiter that spaces requests so that at most requests_per_minute start per minute."""
+
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+async def _generate_one(client, key, prompt, executor, semaphore, limiter, timeout, retries, backoff):
+    """
+    Generates one response with a timeout and retries; returns (key, response, error).
+
+    A timeout cannot stop the worker thread, so the concurrency slot is only released
+    when the thread returns: a retry never runs alongside the request it replaces.
+    """
+    loop = asyncio.get_running_loop()
+
+    def release(future):
+        if not future.cancelled():
+            future.exception()  # Late failures of timed out requests are expected, not unhandled
+        semaphore.release()
+
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff * 2 ** (attempt - 1))
+        await semaphore.acquire()
+        try:
+            await limiter.acquire()
+            future = loop.run_in_executor(executor, client.generate, prompt)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(release)
+        try:
+            response = await asyncio.wait_for(asyncio.shield(future), timeout)
+            return key, response, None
+        except Exception as e:  # asyncio.TimeoutError included
+            error = e
+            logger.warning(f"Generation for '{key}' failed (attempt {attempt + 1}/{retries + 1}): {e!r}")
+    logger.error(f"Generation for '{key}' gave up after {retries + 1} attempts.")
+    return key, None, error
+
+async def generate_concurrently(client, prompts, concurrency=4, requests_per_minute=None,
+                                timeout=60, retries=2, backoff=1.0):
+    """
+    Generates responses for many prompts concurrently and yields them as they complete.
+
+    Args:
+        client (LLMClient): Client with a blocking generate(prompt) method.
+        prompts (dict or list): Mapping of key -> prompt, or a list of prompts keyed by position.
+        concurrency (int): Maximum number of requests in flight.
+        requests_per_minute (int, optional): Budget of request starts per minute.
+        timeout (float): Per-request timeout in seconds.
+        retries (int): Retries per request after a failure or timeout.
+        backoff (float): Base delay in seconds for exponential backoff between retries.
+
+    Yields:
+        tuple: (key, response, error) where exactly one of response/error is None.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(requests_per_minute)
+    items = prompts.items() if isinstance(prompts, dict) else enumerate(prompts)
+    # Slots are held until the worker thread returns, so `concurrency` threads are always enough
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        tasks = [
+            asyncio.ensure_future(
+                _generate_one(client, key, prompt, executor, semaphore, limiter, timeout, retries, backoff)
+            )
+            for key, prompt in items
+        ]
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+
+def generate_all(client, prompts, **kwargs):
+    """Blocking helper that runs generate_concurrently and returns {key: response} for successful requests (keys are positions for a list)."""
+    async def collect():
+        return [result async for result in generate_concurrently(client, prompts, **kwargs)]
+
+    return {key: response for key, response, error in asyncio.run(collect()) if error is None}
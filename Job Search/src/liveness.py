@@ -0,0 +1,360 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from scraper import make_job_id
+from skills_index import SkillsIndex, SKILLS_INDEX_FILE
+from crawl_scheduler import CACHE_DIR, crawl_cache_dir, remove_cached_jobs
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+LIVENESS_FILE = os.path.join(PROJECT_ROOT, "output", "liveness.json")
+SCRAPED_JOBS_FILE = os.path.join(PROJECT_ROOT, "output", "scraped_jobs.json")
+
+ALIVE = "alive"
+DEAD = "dead"
+UNKNOWN = "unknown"
+BLOCKED = "blocked"
+
+DEAD_STATUSES = (404, 410)
+BLOCKED_STATUSES = (401, 403, 429, 999)  # Anti-bot and rate-limit answers say nothing about the posting
+NO_HEAD_STATUSES = (403, 405, 501)  # Servers that refuse HEAD but may answer GET
+
+class HostLimiter:
+    """
+    Per-host politeness: at most `concurrency` requests in flight to a host and at least
+    `delay` seconds between the starts of two requests to it.
+    """
+
+    def __init__(self, concurrency=1, delay=1.0):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_start = {}
+        self._blocked_until = {}
+
+    def acquire(self, host):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.concurrency))
+        semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.delay  # Reserve the slot before sleeping
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host):
+        self._semaphores[host].release()
+
+    def block(self, host, seconds):
+        """Stops requests to a host that blocked or rate-limited us for `seconds`."""
+        with self._lock:
+            self._blocked_until[host] = max(self._blocked_until.get(host, 0), time.monotonic() + seconds)
+
+    def is_blocked(self, host):
+        with self._lock:
+            return self._blocked_until.get(host, 0) > time.monotonic()
+
+class LivenessChecker:
+    """
+    Checks whether job links still resolve and keeps per-posting state across passes.
+
+    A pass checks the postings that were never checked or were last checked more than
+    recheck_after seconds ago, oldest postings first, interleaved across hosts so that
+    the per-host limits do not stall the worker pool. Links answering 404/410 are
+    dead; links that keep failing (connection errors, timeouts, 5xx) for max_failures
+    passes are dead too. Hosts answering 401/403/429/999 are blocking us: the postings
+    keep their previous status and the host is left alone for blocked_backoff seconds
+    (or its Retry-After).
+    """
+
+    def __init__(self, concurrency=8, per_host_concurrency=1, per_host_delay=1.0, timeout=10,
+                 recheck_after=86400, max_checks=500, max_failures=3, blocked_backoff=3600,
+                 state_path=LIVENESS_FILE, user_agent="job-search-liveness/1.0"):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.recheck_after = recheck_after
+        self.max_checks = max_checks
+        self.max_failures = max_failures
+        self.blocked_backoff = blocked_backoff
+        self.state_path = state_path
+        self.user_agent = user_agent
+        self.limiter = HostLimiter(per_host_concurrency, per_host_delay)
+        self.state = self._load_state()  # job ID -> {"first_seen", "last_checked", "status", "failures", "etag", "last_modified"}
+        self._state_lock = threading.Lock()
+        self._sessions = threading.local()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r") as file:
+            return json.load(file)
+
+    def save(self):
+        """Persists the per-posting state (atomically, like the metrics files)."""
+        if not self.state_path:
+            return
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        temporary = f"{self.state_path}.tmp"
+        with self._state_lock:
+            with open(temporary, "w") as file:
+                json.dump(self.state, file)
+        os.replace(temporary, self.state_path)
+
+    def is_expired(self, job_id):
+        return self.state.get(job_id, {}).get("status") == DEAD
+
+    def drop_expired(self, jobs):
+        """Filters out jobs that an earlier pass found dead (boards can list them for a while)."""
+        return [job for job in jobs if not self.is_expired(job.get("id") or make_job_id(job))]
+
+    def due_jobs(self, jobs, now=None):
+        """
+        Returns the jobs to check in this pass: oldest postings first, round-robin across hosts.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for job in jobs:
+            link = (job.get("link") or "").strip()
+            if not link.startswith(("http://", "https://")):
+                continue
+            job_id = job.get("id") or make_job_id(job)
+            with self._state_lock:
+                entry = self.state.setdefault(job_id, {"first_seen": now, "last_checked": None, "status": UNKNOWN, "failures": 0})
+            if entry["status"] == DEAD:
+                continue
+            if entry["last_checked"] is None or now - entry["last_checked"] >= self.recheck_after:
+                due.append((entry["first_seen"], entry["last_checked"] or 0, job_id, link))
+        due.sort()
+        due = due[:self.max_checks]
+
+        by_host = {}
+        for _, _, job_id, link in due:
+            by_host.setdefault(urlparse(link).netloc, []).append((job_id, link))
+        interleaved = []
+        queues = list(by_host.values())
+        while queues:
+            interleaved.extend(queue.pop(0) for queue in queues)
+            queues = [queue for queue in queues if queue]
+        return interleaved
+
+    def _session(self):
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()  # Keep-alive per worker thread
+            session.headers["User-Agent"] = self.user_agent
+            self._sessions.session = session
+        return session
+
+    def check_link(self, link, etag=None, last_modified=None):
+        """
+        Checks one link with HEAD, falling back to a conditional GET when HEAD is refused.
+
+        Returns:
+            tuple: (ALIVE, DEAD, BLOCKED or UNKNOWN; response headers or None; HTTP status or error message)
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        session = self._session()
+        try:
+            response = session.head(link, headers=headers, timeout=self.timeout, allow_redirects=True)
+            if response.status_code in NO_HEAD_STATUSES:
+                # stream=True: only the status line and headers are read, not the page
+                response = session.get(link, headers=headers, timeout=self.timeout, allow_redirects=True, stream=True)
+                response.close()
+        except requests.exceptions.RequestException as e:
+            return UNKNOWN, None, str(e)
+
+        if response.status_code in DEAD_STATUSES:
+            return DEAD, response.headers, response.status_code
+        if response.status_code < 400:  # 2xx, or 304 Not Modified
+            return ALIVE, response.headers, response.status_code
+        if response.status_code >= 500:
+            return UNKNOWN, response.headers, response.status_code
+        return BLOCKED, response.headers, response.status_code  # Other 4xx: no verdict on the posting
+
+    def _backoff_seconds(self, headers):
+        retry_after = (headers or {}).get("Retry-After", "")
+        return int(retry_after) if retry_after.isdigit() else self.blocked_backoff
+
+    def _check(self, job_id, link):
+        host = urlparse(link).netloc
+        with self._state_lock:
+            entry = dict(self.state[job_id])
+        if self.limiter.is_blocked(host):
+            metrics.inc("liveness_checks_total", result=BLOCKED)
+            return job_id, BLOCKED
+        self.limiter.acquire(host)
+        try:
+            status, headers, detail = self.check_link(link, entry.get("etag"), entry.get("last_modified"))
+        finally:
+            self.limiter.release(host)
+
+        if status == BLOCKED:
+            # Keep the previous status and failure count; the posting is due again once the host lets us in
+            if detail in BLOCKED_STATUSES:
+                self.limiter.block(host, self._backoff_seconds(headers))
+            logger.debug(f"Liveness check of {link} was refused ({detail}); keeping status {entry['status']}.")
+            metrics.inc("liveness_checks_total", result=BLOCKED)
+            return job_id, BLOCKED
+
+        entry["last_checked"] = time.time()
+        if status == UNKNOWN:
+            entry["failures"] = entry.get("failures", 0) + 1
+            if entry["failures"] >= self.max_failures:
+                status = DEAD
+            logger.debug(f"Liveness check of {link} failed ({detail}); {entry['failures']} consecutive failures.")
+        else:
+            entry["failures"] = 0
+        if status == ALIVE and headers is not None:
+            entry["etag"] = headers.get("ETag") or entry.get("etag")
+            entry["last_modified"] = headers.get("Last-Modified") or entry.get("last_modified")
+        entry["status"] = status
+        if status == DEAD:
+            entry["expired_at"] = entry["last_checked"]
+        with self._state_lock:
+            self.state[job_id] = entry
+        metrics.inc("liveness_checks_total", result=status)
+        return job_id, status
+
+    def check(self, jobs):
+        """
+        Runs one pass over the due jobs.
+
+        Returns:
+            dict: Job IDs by result, e.g. {"alive": [...], "dead": [...], "unknown": [...], "blocked": [...]}.
+        """
+        due = self.due_jobs(jobs)
+        results = {ALIVE: [], DEAD: [], UNKNOWN: [], BLOCKED: []}
+        if not due:
+            return results
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="liveness") as executor:
+            for job_id, status in executor.map(lambda item: self._check(*item), due):
+                results[status].append(job_id)
+        metrics.observe("liveness_pass_seconds", time.perf_counter() - start)
+        self.save()
+        logger.info(f"Checked {len(due)} job links: {len(results[ALIVE])} alive, {len(results[DEAD])} dead, "
+                    f"{len(results[UNKNOWN])} unknown, {len(results[BLOCKED])} blocked.")
+        return results
+
+    def _run(self, get_jobs, on_dead, interval):
+        while not self._stop_event.is_set():
+            try:
+                dead = self.check(get_jobs())[DEAD]
+                if dead:
+                    on_dead(dead)
+            except Exception as e:
+                logger.error(f"Liveness pass failed: {e}", exc_info=True)
+            self._stop_event.wait(interval)
+
+    def start(self, get_jobs, on_dead, interval=3600):
+        """
+        Runs a pass every `interval` seconds in a background thread.
+
+        Args:
+            get_jobs (callable): Returns the jobs currently served.
+            on_dead (callable): Called with the IDs of jobs found dead in a pass.
+        """
+        self._thread = threading.Thread(target=self._run, args=(get_jobs, on_dead, interval), name="liveness-checker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 5)
+
+def remove_from_corpus(job_ids, path=SCRAPED_JOBS_FILE):
+    """Deletes expired jobs from the stored corpus; returns the number removed."""
+    if not os.path.exists(path):
+        return 0
+    expired = set(job_ids)
+    with open(path, "r") as file:
+        jobs = json.load(file)
+    kept = [job for job in jobs if (job.get("id") or make_job_id(job)) not in expired]
+    if len(kept) != len(jobs):
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(kept, file, indent=4)
+        os.replace(temporary, path)
+    return len(jobs) - len(kept)
+
+def expire_jobs(job_ids, service=None, skills_index_path=SKILLS_INDEX_FILE, corpus_path=SCRAPED_JOBS_FILE,
+                crawl_cache_dir=CACHE_DIR):
+    """
+    Deletes expired jobs from the served indexes, the skills index, the stored corpus and the cached crawls.
+
+    Args:
+        service (JobSearchService, optional): Running query service whose FAISS/BM25 snapshot is rebuilt without them.
+    """
+    if service is not None:
+        service.expire(job_ids)
+    if os.path.exists(skills_index_path):
+        skills_index = SkillsIndex.load(skills_index_path)
+        if sum(skills_index.remove_job(job_id) for job_id in job_ids):
+            skills_index.save(skills_index_path)
+    removed = remove_from_corpus(job_ids, corpus_path)
+    remove_cached_jobs(job_ids, crawl_cache_dir)
+    metrics.inc("liveness_expired_total", len(job_ids))
+    logger.info(f"Expired {len(job_ids)} dead jobs ({removed} removed from the stored corpus).")
+
+def liveness_state_path(config):
+    """Path of the per-posting liveness state (relative paths start at the project root)."""
+    return os.path.join(PROJECT_ROOT, (config.get("liveness", {}) or {}).get("state_path", LIVENESS_FILE))
+
+def load_liveness_state(config):
+    """
+    Loads the liveness state written by earlier passes (the service or `python src/liveness.py`),
+    so that the batch pipeline can drop postings found dead; works whether or not checks are enabled.
+    """
+    return LivenessChecker(state_path=liveness_state_path(config))
+
+def create_liveness_checker(config):
+    """Creates a LivenessChecker from the `liveness` section of the configuration (None when disabled)."""
+    liveness_config = config.get("liveness", {}) or {}
+    if not liveness_config.get("enabled", False):
+        return None
+    return LivenessChecker(
+        concurrency=liveness_config.get("concurrency", 8),
+        per_host_concurrency=liveness_config.get("per_host_concurrency", 1),
+        per_host_delay=liveness_config.get("per_host_delay", 1.0),
+        timeout=liveness_config.get("timeout", 10),
+        recheck_after=liveness_config.get("recheck_after", 86400),
+        max_checks=liveness_config.get("max_checks", 500),
+        max_failures=liveness_config.get("max_failures", 3),
+        blocked_backoff=liveness_config.get("blocked_backoff", 3600),
+        state_path=liveness_state_path(config),
+    )
+
+if __name__ == "__main__":
+    from scraper import load_config
+
+    parser = argparse.ArgumentParser(description="Check the links of the stored jobs once and expire dead postings.")
+    parser.add_argument("--dry-run", action="store_true", help="Report dead links without deleting anything.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = load_config() or {}
+    checker = create_liveness_checker({**config, "liveness": {**(config.get("liveness") or {}), "enabled": True}})
+    with open(SCRAPED_JOBS_FILE, "r") as file:
+        stored_jobs = json.load(file)
+    dead = checker.check(stored_jobs)[DEAD]
+    if dead and not args.dry_run:
+        expire_jobs(dead, crawl_cache_dir=crawl_cache_dir(config))
+    print(json.dumps({"checked_jobs": len(stored_jobs), "dead": dead}, indent=2))
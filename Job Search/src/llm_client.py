@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import requests
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+LLM_CACHE_FILE = os.path.join(PROJECT_ROOT, "output", "llm_cache.sqlite3")
+
+DEFAULT_MODEL = "gpt-3.5-turbo-instruct"
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+class ResponseCache:
+    """
+    Persistent LLM response cache stored in SQLite.
+
+    Entries are keyed by a hash of (backend, endpoint, model, prompt, params), so that
+    two servers or providers serving the same model name never share responses; they expire after ttl_seconds
+    and the least recently used entries are evicted once max_entries is exceeded.
+    Each entry remembers how long the original generation took so that the time
+    saved by cache hits can be reported.
+    """
+
+    def __init__(self, path=LLM_CACHE_FILE, ttl_seconds=86400, max_entries=1000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, generation_seconds REAL NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt, params, backend=None, endpoint=None):
+        payload = json.dumps({"backend": backend, "endpoint": endpoint, "model": model, "prompt": prompt,
+                              "params": params or {}}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Returns (response, generation_seconds) for a live entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, generation_seconds, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds is not None and now - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0], row[1]
+
+    def put(self, key, response, generation_seconds):
+        """Stores a response and evicts expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, response, generation_seconds, now, now)
+            )
+            if self.ttl_seconds is not None:
+                self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+class OpenAIBackend:
+    """Generates responses with OpenAI through LangChain."""
+
+    name = "openai"
+
+    def __init__(self, api_key, model=DEFAULT_MODEL, params=None):
+        from langchain.llms import OpenAI  # Imported lazily so offline backends don't need langchain
+        self.endpoint = (params or {}).get("openai_api_base") or os.environ.get("OPENAI_API_BASE") or OPENAI_API_BASE
+        self._llm = OpenAI(api_key=api_key, model_name=model, **(params or {}))
+
+    def generate(self, prompt):
+        return self._llm(prompt)
+
+class StubBackend:
+    """
+    Deterministic offline stand-in for benchmarking the pipeline without network access.
+
+    The response only depends on the prompt; `latency` seconds of sleep can be
+    injected to simulate a real model.
+    """
+
+    name = "stub"
+    endpoint = None
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def generate(self, prompt):
+        if self.latency:
+            time.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+        question = prompt.rsplit("Q:", 1)[-1].strip()
+        return f"[stub {digest}] Answer to: {question}"
+
+class HTTPBackend:
+    """
+    Calls a local LLM HTTP server.
+
+    Sends {"model", "prompt", **params} as JSON to `url` and accepts either a
+    {"text": ...} response or an OpenAI-style completions response. requests.Session is
+    not thread-safe, so every worker thread keeps its own (keep-alive) session.
+    """
+
+    name = "http"
+
+    def __init__(self, url, model=DEFAULT_MODEL, params=None, timeout=60):
+        self.url = url
+        self.endpoint = url
+        self.model = model
+        self.params = params or {}
+        self.timeout = timeout
+        self._sessions = threading.local()
+
+    def _session(self):
+        session = getattr(self._sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._sessions.session = session
+        return session
+
+    def generate(self, prompt):
+        response = self._session().post(
+            self.url, json={"model": self.model, "prompt": prompt, **self.params}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+        if "text" in data:
+            return data["text"]
+        return data["choices"][0]["text"]
+
+class LLMClient:
+    """LLM client that serves repeated prompts from a ResponseCache and tracks cache statistics."""
+
+    def __init__(self, backend, model=DEFAULT_MODEL, params=None, cache=None):
+        self.backend = backend
+        self.model = model
+        self.params = params or {}
+        self.cache = cache
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cache_hits = 0
+        self.generation_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def generate(self, prompt):
+        """Returns the response for a prompt, from the cache when possible."""
+        key = ResponseCache.make_key(self.model, prompt, self.params, backend=getattr(self.backend, "name", None),
+                                     endpoint=getattr(self.backend, "endpoint", None))
+        cached = self.cache.get(key) if self.cache is not None else None
+        if cached is not None:
+            response, original_seconds = cached
+            with self._lock:
+                self.requests += 1
+                self.cache_hits += 1
+                self.saved_seconds += original_seconds
+            logger.info(f"LLM cache hit (saved {original_seconds:.2f}s).")
+            return response
+
+        start = time.perf_counter()
+        response = self.backend.generate(prompt)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.requests += 1
+            self.generation_seconds += elapsed
+        if self.cache is not None:
+            self.cache.put(key, response, elapsed)
+        logger.info(f"LLM generation took {elapsed:.2f}s.")
+        return response
+
+    def stats(self):
+        """Returns cache hit rate and generation time spent/saved."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cache_hits": self.cache_hits,
+                "hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+                "generation_seconds": round(self.generation_seconds, 3),
+                "saved_seconds": round(self.saved_seconds, 3),
+            }
+
+def create_llm_client(config):
+    """
+    Creates an LLMClient from the `llm` section of the configuration.
+
+    Supported backends: "openai" (default), "http" (local LLM server) and "stub"
+    (deterministic offline responses).
+    """
+    llm_config = config.get("llm", {})
+    backend_name = llm_config.get("backend", "openai")
+    model = llm_config.get("model", DEFAULT_MODEL)
+    params = llm_config.get("params", {})
+
+    if backend_name == "openai":
+        api_key = llm_config.get("api_key") or config.get("openai_api_key") or os.environ.get("OPENAI_API_KEY")
+        backend = OpenAIBackend(api_key, model=model, params=params)
+    elif backend_name == "http":
+        backend = HTTPBackend(llm_config["url"], model=model, params=params, timeout=llm_config.get("timeout", 60))
+    elif backend_name == "stub":
+        backend = StubBackend(latency=llm_config.get("stub_latency", 0.0))
+    else:
+        raise ValueError(f"Unknown LLM backend '{backend_name}'. Expected 'openai', 'http' or 'stub'.")
+
+    cache = None
+    cache_config = llm_config.get("cache", {})
+    if cache_config.get("enabled", True):
+        cache = ResponseCache(
+            path=cache_config.get("path", LLM_CACHE_FILE),
+            ttl_seconds=cache_config.get("ttl_seconds", 86400),
+            max_entries=cache_config.get("max_entries", 1000),
+        )
+
+    return LLMClient(backend, model=model, params=params, cache=cache)
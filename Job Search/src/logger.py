@@ -1,5 +1,11 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 
 # Determine the absolute path to the project root directory.
 # __file__ is the path to the current script (logger.py).
@@ -12,38 +18,159 @@ PROJECT_ROOT = os.path.dirname(SRC_DIR)
 LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
 LOG_FILE = os.path.join(LOG_DIR, "pipeline.log")
 
-def setup_logger():
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Loggers of the pipeline's own modules (named after the files in src/, or the package they were imported from).
+# Only these get the configured level; everything else (urllib3, transformers, faiss...) stays at `library_level`.
+APP_LOGGERS = sorted({os.path.splitext(name)[0] for name in os.listdir(SRC_DIR) if name.endswith(".py")}
+                     | {"__main__"} | ({__package__} if __package__ else set()))
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and ends up in JSON output
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including fields passed with `extra=`."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
     """
-    Set up logging configuration with both file and console handlers.
-    
-    Returns:
-        logging.Logger: Configured logger instance.
+    Lets at most `burst` records per call site (file and line) through every `interval`
+    seconds and drops the rest.
+
+    The first record let through after a suppressed window reports how many similar
+    messages were dropped, so repetitive messages (e.g. one per duplicate job) are
+    aggregated instead of flooding the log. Records above `max_level` (warnings and
+    errors by default) are never dropped.
     """
-    # Create the logs directory if it doesn't already exist.
-    if not os.path.exists(LOG_DIR):
-        os.makedirs(LOG_DIR)
 
-    # Create a logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.DEBUG)  # Set the base logger level to DEBUG
+    def __init__(self, burst=10, interval=60.0, max_level=logging.INFO):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.max_level = max_level
+        self._lock = threading.Lock()
+        self._windows = {}  # (pathname, lineno) -> [window_start, emitted, suppressed]
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                return True
+            else:
+                window[2] += 1
+                return False
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar messages suppressed)"
+            record.args = ()
+            record.suppressed = suppressed
+        return True
+
+    def pending(self):
+        """Returns {(pathname, lineno): count} of messages suppressed in the current windows."""
+        with self._lock:
+            return {key: window[2] for key, window in self._windows.items() if window[2]}
+
+_lock = threading.Lock()
+_state = {"listener": None, "handler": None, "filter": None}
 
-    # Create a file handler
-    file_handler = logging.FileHandler(LOG_FILE)
-    file_handler.setLevel(logging.DEBUG)  # Log everything to the file
+def _file_handler(log_config, path):
+    rotation = log_config.get("rotation", "size")
+    backup_count = log_config.get("backup_count", 5)
+    if rotation == "size":
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=log_config.get("max_bytes", 10 * 2 ** 20), backupCount=backup_count, encoding="utf-8")
+    if rotation == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=log_config.get("when", "midnight"), backupCount=backup_count, encoding="utf-8")
+    if rotation == "none":
+        return logging.FileHandler(path, encoding="utf-8")
+    raise ValueError(f"Unknown log rotation '{rotation}'. Use 'size', 'time' or 'none'.")
+
+def setup_logger(config=None):
+    """
+    Set up logging with a non-blocking queue handler on the root logger.
+
+    Records are put on a queue by the calling thread and written to the log file and
+    the console by a background listener thread, so logging never blocks on I/O.
+    Calling it again replaces the previous setup instead of adding handlers.
+
+    Args:
+        config (dict, optional): Pipeline configuration; its `logging` section selects the
+            level of the pipeline's own loggers, the level of third-party libraries
+            (`library_level`), text or JSON output, file rotation and rate limiting.
+
+    Returns:
+        logging.Logger: Configured (root) logger instance.
+    """
+    log_config = (config or {}).get("logging", {}) or {}
+    path = os.path.join(PROJECT_ROOT, log_config.get("file", LOG_FILE))  # Relative paths start at the project root
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    json_format = log_config.get("format", "text") == "json"
+    file_handler = _file_handler(log_config, path)
+    file_handler.setLevel(log_config.get("level", "DEBUG"))  # Log everything to the file
+    file_handler.setFormatter(JSONFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
 
-    # Create a console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)  # Log only INFO and above to the console
+    console_handler.setLevel(log_config.get("console_level", "INFO"))  # Log only INFO and above to the console
+    console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    rate_limit = log_config.get("rate_limit", {}) or {}
+    rate_filter = None
+    if rate_limit.get("enabled", True):
+        rate_filter = RateLimitFilter(burst=rate_limit.get("burst", 10), interval=rate_limit.get("interval", 60))
+        queue_handler.addFilter(rate_filter)  # Dropped records are never queued
+    listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, console_handler, respect_handler_level=True)
 
-    # Define a formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    root = logging.getLogger()
+    with _lock:
+        shutdown_logger()
+        root.setLevel(log_config.get("library_level", "INFO"))  # Third-party DEBUG records never reach the queue
+        for name in APP_LOGGERS:
+            logging.getLogger(name).setLevel(log_config.get("level", "DEBUG"))
+        root.addHandler(queue_handler)
+        listener.start()
+        _state.update(listener=listener, handler=queue_handler, filter=rate_filter)
+    return root
 
-    # Add handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+def shutdown_logger():
+    """Flushes queued records and removes the handlers installed by setup_logger."""
+    listener, handler, rate_filter = _state["listener"], _state["handler"], _state["filter"]
+    if listener is None:
+        return
+    if rate_filter is not None:
+        for (pathname, lineno), count in rate_filter.pending().items():
+            handler.emit(logging.LogRecord(  # emit() bypasses the rate limit itself
+                "logger", logging.INFO, pathname, lineno, f"{count} similar messages suppressed", (), None))
+    logging.getLogger().removeHandler(handler)
+    listener.stop()  # Processes everything still queued, then joins the listener thread
+    for target in listener.handlers:
+        target.close()
+    _state.update(listener=None, handler=None, filter=None)
 
-    return logger
+atexit.register(shutdown_logger)
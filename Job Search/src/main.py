@@ -1,12 +1,250 @@
+import argparse
+import asyncio
+import logging
+import os
+import re
 from scraper import scrape_jobs, load_config  # MODIFIED LINE
-from processor import clean_data, index_jobs_in_faiss
+from processor import clean_data, generate_embeddings, build_faiss_index, dump_faiss_index, load_faiss_index
 from analyzer import hybrid_search
-from notifier import notify
+from metadata_index import MetadataIndex
+from skills_index import SkillsIndex
+from context_builder import build_context, count_tokens
+from outbox import Dispatcher, create_outbox
 from logger import setup_logger
-from langchain.llms import OpenAI  # For generating responses using an LLM
+from llm_client import create_llm_client  # For generating responses using an LLM
+from generation import generate_concurrently
+from pipeline import Pipeline, Stage
+from metrics import instrument_stage, metrics, write_run_report
+from profiling import create_profiler
+from crawl_scheduler import create_crawl_scheduler
+from liveness import load_liveness_state
 
-def main():
-    logger = setup_logger()
+logger = logging.getLogger(__name__)
+
+def get_subscribers(config):
+    """
+    Returns the subscribers to generate results for.
+
+    Falls back to a single subscriber made of the `search` query and the configured
+    email recipients when no `subscribers` section is present.
+    """
+    subscribers = config.get("subscribers")
+    if subscribers:
+        return subscribers
+    search_config = config.get("search", {})
+    return [{
+        "email": ", ".join(config.get("email", {}).get("recipients", [])),
+        "query": search_config.get("query", "Find me remote Python developer jobs."),  # Example user query
+        "filters": search_config.get("filters"),
+    }]
+
+def build_prompt(subscriber, jobs, index, metadata_index, config):
+    """Retrieves the jobs relevant to a subscriber's query and packs them into an LLM prompt; returns (prompt, jobs)."""
+    query = subscriber["query"]
+    search_config = config.get("search", {})
+    relevant_jobs = hybrid_search(
+        query,
+        jobs,
+        index,
+        top_k=search_config.get("top_k", 5),
+        filters=subscriber.get("filters"),
+        metadata_index=metadata_index,
+    )
+    logger.info(f"Hybrid search retrieved {len(relevant_jobs)} relevant jobs for {subscriber['email']}.")
+
+    # Pack the most relevant snippets of each job within a token budget
+    context_config = config.get("context", {})
+    context, context_stats = build_context(
+        relevant_jobs,
+        query,
+        max_tokens=context_config.get("max_tokens", 1500),
+        per_job_tokens=context_config.get("per_job_tokens", 250),
+    )
+    augmented_prompt = f"Using the information below, answer the question.\n\n{context}\n\nQ: {query}"
+    logger.info(f"Prompt size: {count_tokens(augmented_prompt)} tokens ({context_stats}).")
+    return augmented_prompt, relevant_jobs
+
+def subscriber_config(config, email, position=None):
+    """
+    Returns a copy of the configuration that notifies a single subscriber.
+
+    `position` tells apart the reports of an email address that subscribes with several queries.
+    """
+    if email == ", ".join(config.get("email", {}).get("recipients", [])):
+        return config  # Default subscriber built from the configured recipients
+    pdf_root, pdf_ext = os.path.splitext(config["cloud"]["pdf_destination"])
+    safe_name = re.sub(r"[^A-Za-z0-9]+", "_", email) + (f"_{position}" if position is not None else "")
+    return {
+        **config,
+        "email": {**config["email"], "recipients": [email]},
+        "cloud": {**config["cloud"], "pdf_destination": f"{pdf_root}_{safe_name}{pdf_ext}"},
+    }
+
+def notification_position(emails, position):
+    """Position to tell apart the reports of a repeated subscriber email (None when the email is unique)."""
+    return position if emails.count(emails[position]) > 1 else None
+
+async def generate_and_notify(llm, search, config, outbox):
+    """
+    Generates responses concurrently and queues each subscriber's notification as soon as it is ready.
+
+    Prompts are keyed by position, so an email subscribing with several queries gets every response.
+
+    Returns:
+        list: Responses in subscriber order (None where generation failed).
+    """
+    generation_config = config.get("generation", {})
+    emails = search["emails"]
+    responses = [None] * len(emails)
+    async for position, response, error in generate_concurrently(
+        llm,
+        search["prompts"],
+        concurrency=generation_config.get("concurrency", 4),
+        requests_per_minute=generation_config.get("requests_per_minute"),
+        timeout=generation_config.get("timeout", 60),
+        retries=generation_config.get("retries", 2),
+    ):
+        email = emails[position]
+        if error is not None:
+            logger.error(f"No response generated for {email}: {error!r}")
+            continue
+        logger.info(f"Generated response for {email}: {response}")
+        responses[position] = response
+        enqueue_notification(outbox, config, email, response, search["report_jobs"][position],
+                             position=notification_position(emails, position))
+    return responses
+
+def enqueue_notification(outbox, config, email, response, jobs, position=None):
+    """Queues a subscriber's email and PDF report; delivery happens in the outbox dispatcher."""
+    notification_config = subscriber_config(config, email, position)
+    outbox.enqueue(
+        notification_config["email"]["recipients"],
+        response,
+        pdf_destination=notification_config["cloud"]["pdf_destination"],
+        report_jobs=jobs,
+    )
+
+# Pipeline stages. Each one is called with the configuration followed by the outputs of its dependencies.
+
+def scrape_stage(config):
+    """Step 1: Scrape jobs (only the boards that are due, when crawl scheduling is enabled), without expired postings."""
+    scheduler = create_crawl_scheduler(config)
+    jobs = scrape_jobs(scheduler=scheduler, liveness=load_liveness_state(config))  # scrape_jobs now uses the config loaded within it if needed
+    if scheduler is not None:
+        metrics.set_info("crawl_schedule", scheduler.report())
+    logger.info(f"Scraped {len(jobs)} jobs.")
+    return jobs
+
+def clean_stage(config, jobs):
+    """Step 2: Clean data."""
+    cleaned_jobs = clean_data(jobs)
+    logger.info(f"Cleaned data contains {len(cleaned_jobs)} jobs.")
+    return cleaned_jobs
+
+def skills_stage(config, cleaned_jobs):
+    """Update the persisted skills index with the new batch (used for skill queries and reports)."""
+    skills_index = SkillsIndex.load()
+    skills_index.add_jobs(cleaned_jobs)
+    skills_index.save()
+    return len(skills_index)
+
+def embed_stage(config, cleaned_jobs):
+    """Step 3a: Embed job descriptions."""
+    return generate_embeddings(cleaned_jobs)
+
+def index_stage(config, embeddings):
+    """Step 3b: Index jobs in FAISS."""
+    index = build_faiss_index(embeddings)
+    logger.info(f"Indexed {index.ntotal} jobs in FAISS.")
+    return index
+
+def search_stage(config, cleaned_jobs, index):
+    """
+    Step 4: Retrieve relevant jobs using hybrid search and
+    Step 5: Augment prompt, for every subscriber (or the single configured query).
+    """
+    metadata_index = MetadataIndex(cleaned_jobs)
+    emails, prompts, report_jobs = [], [], []
+    for subscriber in get_subscribers(config):  # Lists in subscriber order: one email may subscribe several times
+        prompt, jobs = build_prompt(subscriber, cleaned_jobs, index, metadata_index, config)
+        emails.append(subscriber["email"])
+        prompts.append(prompt)
+        report_jobs.append(jobs)
+    metrics.set_items(len(prompts))
+    return {"emails": emails, "prompts": prompts, "report_jobs": report_jobs}
+
+def generate_stage(config, search):
+    """
+    Step 6: Generate responses using an LLM (served from the response cache when the prompt is unchanged).
+
+    The outbox dispatcher runs during generation, so subscribers whose response is ready early are notified early.
+    """
+    llm = create_llm_client(config)
+    outbox = create_outbox(config)
+    dispatcher = Dispatcher(outbox, config)
+    dispatcher.start(until_empty=False)
+    try:
+        responses = asyncio.run(generate_and_notify(llm, search, config, outbox))
+    finally:
+        dispatcher.drain()  # Delivers what is still queued in the background, then stops
+    logger.info(f"LLM stats: {llm.stats()}")
+    missing = [email for email, response in zip(search["emails"], responses) if response is None]
+    if missing:
+        # Fail the stage so that a resumed run retries; successful prompts are served from the LLM cache
+        raise RuntimeError(f"No response generated for {len(missing)} subscribers: {sorted(missing)}")
+    return responses
+
+def notify_stage(config, search, responses):
+    """Step 7: Notify users. Queuing is idempotent, so responses already queued by the generate stage are not sent twice."""
+    outbox = create_outbox(config)
+    emails = search["emails"]
+    for position, (email, response) in enumerate(zip(emails, responses)):
+        enqueue_notification(outbox, config, email, response, search["report_jobs"][position],
+                             position=notification_position(emails, position))
+    metrics.set_items(len(responses))
+    # Deliver queued notifications in the background (including retries left over from earlier runs)
+    Dispatcher(outbox, config).start()
+    counts = outbox.counts()
+    logger.info(f"Outbox status: {counts}")
+    return counts
+
+def build_pipeline(config):
+    """Builds the stage graph of the job search pipeline."""
+    stages = [
+        Stage("scrape", scrape_stage, config_keys=("scraping", "crawl_schedule", "liveness"), volatile=True),
+        Stage("clean", clean_stage, deps=("scrape",)),
+        Stage("skills", skills_stage, deps=("clean",)),
+        Stage("embed", embed_stage, deps=("clean",), config_keys=("embeddings",)),
+        Stage("index", index_stage, deps=("embed",), dump=dump_faiss_index, load=load_faiss_index),
+        Stage("search", search_stage, deps=("clean", "index"), config_keys=("search", "subscribers", "context", "email")),
+        Stage("generate", generate_stage, deps=("search",), config_keys=("llm", "generation", "cloud")),
+        Stage("notify", notify_stage, deps=("search", "generate"), cache=False),
+    ]
+    profiler = create_profiler(config)
+
+    def wrap_stage(name, func):
+        if profiler is not None:  # Stages are left untouched unless profiling is enabled
+            func = profiler.wrap(name, func)
+        return instrument_stage(name, func)
+
+    return Pipeline(stages, config, max_workers=config.get("pipeline", {}).get("max_workers", 2),
+                    stage_wrapper=wrap_stage)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the job search pipeline.")
+    parser.add_argument("--stage", action="append", dest="stages",
+                        help="Run this stage (and the stages it depends on). Can be repeated.")
+    parser.add_argument("--only", action="store_true",
+                        help="Run only the given stages, using stored artifacts for their dependencies.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue from the last successful stage, reusing stored artifacts (including scraped jobs).")
+    parser.add_argument("--force", action="append", default=[],
+                        help="Re-run this stage even if its inputs are unchanged. Can be repeated.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logger()
     try:
         logger.info("Starting job scraping pipeline...")
         
@@ -15,39 +253,18 @@ def main():
         if config is None:
             logger.error("Failed to load configuration. Exiting pipeline.")
             return
+        setup_logger(config)  # Reconfigure with the `logging` section
 
-        # Step 1: Scrape jobs
-        jobs = scrape_jobs()  # scrape_jobs now uses the config loaded within it if needed
-        logger.info(f"Scraped {len(jobs)} jobs.")
-
-        # Step 2: Clean data
-        cleaned_jobs = clean_data(jobs)
-        logger.info(f"Cleaned data contains {len(cleaned_jobs)} jobs.")
-
-        # Step 3: Index jobs in FAISS
-        index, job_metadata = index_jobs_in_faiss(cleaned_jobs)
-        logger.info(f"Indexed {len(cleaned_jobs)} jobs in FAISS.")
-
-        # Step 4: Retrieve relevant jobs using hybrid search
-        query = "Find me remote Python developer jobs."  # Example user query
-        relevant_jobs = hybrid_search(query, cleaned_jobs, index, top_k=5)
-        logger.info(f"Hybrid search retrieved {len(relevant_jobs)} relevant jobs.")
-
-        # Step 5: Augment prompt
-        context = "\n".join([f"{job['title']}: {job['description']} ({job['link']})" for job in relevant_jobs])
-        augmented_prompt = f"Using the information below, answer the question.\n\n{context}\n\nQ: {query}"
-
-        # Step 6: Generate response using an LLM
-        llm = OpenAI(api_key=config["openai_api_key"])  # Replace with your OpenAI API key
-        response = llm(augmented_prompt)
-        logger.info(f"Generated response: {response}")
-
-        # Step 7: Notify user (optional)
-        notify(response, config)  # Pass the generated response to the notifier
-        logger.info("Pipeline completed successfully.")
+        metrics.reset()
+        pipeline = build_pipeline(config)
+        try:
+            statuses = pipeline.run(targets=args.stages, resume=args.resume, force=args.force, only=args.only)
+            metrics.set_info("stage_statuses", statuses)
+        finally:
+            write_run_report(config)  # Failed runs are reported too
+        logger.info(f"Pipeline completed successfully. Stages: {statuses}")
     except Exception as e:
         logger.error(f"Pipeline failed: {str(e)}", exc_info=True)  # Added exc_info for better debugging
 
 if __name__ == "__main__":
     main()
-
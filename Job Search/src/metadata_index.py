@@ -0,0 +1,114 @@
+import logging
+import re
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fields that can be used in a filter expression passed to hybrid_search.
+FILTER_FIELDS = ("location", "company", "remote", "skills")
+
+REMOTE_PATTERN = re.compile(r'\bremote\b', re.IGNORECASE)
+
+def normalize_value(value):
+    """Normalizes a metadata value (location, company, skill) for exact matching."""
+    if not isinstance(value, str):
+        return ""
+    return re.sub(r'\s+', ' ', value.lower().strip())
+
+def is_remote(job):
+    """A job is considered remote if its location or title mentions 'remote'."""
+    return bool(REMOTE_PATTERN.search(job.get('location') or '') or
+                REMOTE_PATTERN.search(job.get('title') or ''))
+
+class MetadataIndex:
+    """
+    Inverted indexes over job metadata (location, company, remote flag, skills).
+
+    Each distinct value maps to the sorted positions of the jobs that have it, where
+    position i refers to jobs[i] (the same position used by the FAISS index), as a
+    uint32 array. Memory grows with the number of (job, value) pairs rather than with
+    distinct values x jobs, which matters for thousands of skills over a large corpus.
+    Filter expressions are evaluated into one boolean mask per query.
+    """
+
+    def __init__(self, jobs):
+        self.size = len(jobs)
+        postings = {"location": {}, "company": {}, "skills": {}}
+        remote = []
+
+        for position, job in enumerate(jobs):
+            self._add(postings["location"], job.get('location'), position)
+            self._add(postings["company"], job.get('company'), position)
+            for skill in job.get('skills') or []:
+                self._add(postings["skills"], skill, position)
+            if is_remote(job):
+                remote.append(position)
+
+        self.postings = {
+            field: {key: np.unique(np.asarray(positions, dtype=np.uint32)) for key, positions in values.items()}
+            for field, values in postings.items()
+        }
+        self.remote = np.asarray(remote, dtype=np.uint32)
+
+        logger.info(
+            f"Built metadata index over {self.size} jobs: "
+            f"{len(self.postings['location'])} locations, {len(self.postings['company'])} companies, "
+            f"{len(self.postings['skills'])} skills."
+        )
+
+    @staticmethod
+    def _add(values, value, position):
+        key = normalize_value(value)
+        if key:
+            values.setdefault(key, []).append(position)
+
+    def _lookup(self, field, value):
+        return self.postings[field].get(normalize_value(value), np.empty(0, dtype=np.uint32))
+
+    def _mask(self, positions):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def evaluate(self, filters):
+        """
+        Evaluates a filter expression and returns a boolean mask of allowed jobs.
+
+        Args:
+            filters (dict): Filter expression. Supported keys:
+                - "location" / "company": a value or list of values (any of them matches).
+                - "remote": True or False.
+                - "skills": a skill or list of skills (all of them are required).
+                All keys are combined with AND.
+
+        Returns:
+            np.ndarray: Boolean mask of length len(jobs).
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if not filters:
+            return mask
+
+        for field, value in filters.items():
+            if field not in FILTER_FIELDS:
+                raise ValueError(f"Unsupported filter field '{field}'. Expected one of {FILTER_FIELDS}.")
+
+            if field == "remote":
+                remote = self._mask(self.remote)
+                mask &= remote if value else ~remote
+            elif field == "skills":
+                for skill in ([value] if isinstance(value, str) else value):
+                    positions = self._lookup("skills", skill)
+                    skill_mask = np.zeros(self.size, dtype=bool)
+                    skill_mask[positions] = mask[positions]  # Only touches the jobs with this skill
+                    mask = skill_mask
+            else:
+                field_mask = np.zeros(self.size, dtype=bool)
+                for item in ([value] if isinstance(value, str) else value):
+                    field_mask[self._lookup(field, item)] = True
+                mask &= field_mask
+
+        return mask
+
+    def allowed_ids(self, filters):
+        """Returns the positions of jobs that satisfy the filter expression."""
+        return np.flatnonzero(self.evaluate(filters)).astype(np.int64)
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+METRICS_DIR = os.path.join(PROJECT_ROOT, "output", "metrics")
+PROMETHEUS_FILE = os.path.join(METRICS_DIR, "job_search.prom")
+
+METRIC_PREFIX = "job_search_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports kilobytes
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {str(bound): count for bound, count in zip(self.buckets, self.counts)},
+        }
+
+class StageMetrics:
+    """
+    Measurements of one pipeline stage; set `items` to the number of items it processed.
+
+    Memory is only known per process: process_peak_rss_bytes is the high-water mark of the
+    whole process when the stage finished (including earlier stages), and peak_rss_growth_bytes
+    how much the stage raised it (0 when it stayed below an earlier peak).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.items = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.process_peak_rss_bytes = None
+        self.peak_rss_growth_bytes = None
+        self.status = "running"
+
+    def to_dict(self):
+        entry = {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "process_peak_rss_bytes": self.process_peak_rss_bytes,
+            "peak_rss_growth_bytes": self.peak_rss_growth_bytes,
+            "items": self.items,
+            "status": self.status,
+        }
+        if self.items and self.wall_seconds:
+            entry["items_per_second"] = round(self.items / self.wall_seconds, 3)
+        return entry
+
+class MetricsRegistry:
+    """
+    Collects per-stage timings and counters, gauges and histograms for one pipeline run.
+
+    Exports a JSON run report and a Prometheus textfile (for the node_exporter
+    textfile collector).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = threading.local()  # Stage measured in this thread (stages run in parallel)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.run_id = uuid.uuid4().hex[:8]
+            self.started_at = time.time()
+            self.stages = {}
+            self.counters = {}
+            self.gauges = {}
+            self.histograms = {}
+            self.info = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Measures wall time, CPU time and the growth of the process peak RSS during a block of work."""
+        stage = StageMetrics(name)
+        with self._lock:
+            self.stages[name] = stage
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        rss_start = peak_rss_bytes()
+        outer = getattr(self._current, "stage", None)
+        self._current.stage = stage
+        try:
+            yield stage
+            stage.status = "ok"
+        except Exception:
+            stage.status = "failed"
+            raise
+        finally:
+            self._current.stage = outer
+            stage.wall_seconds = time.perf_counter() - wall_start
+            stage.cpu_seconds = time.process_time() - cpu_start  # Process-wide, includes overlapping stages
+            stage.process_peak_rss_bytes = peak_rss_bytes()
+            if stage.process_peak_rss_bytes is not None:
+                stage.peak_rss_growth_bytes = stage.process_peak_rss_bytes - rss_start  # Process-wide too, like cpu_seconds
+
+    def set_items(self, count):
+        """Sets the number of items processed by the stage running in this thread (no-op outside a stage)."""
+        stage = getattr(self._current, "stage", None)
+        if stage is not None:
+            stage.items = count
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name, value, buckets=DEFAULT_BUCKETS, **labels):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = _label_key(labels)
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def set_info(self, key, value):
+        """Attaches free-form information (e.g. scheduler state) to the run report."""
+        with self._lock:
+            self.info[key] = value
+
+    def report(self):
+        """Returns the run report as a JSON-serializable dictionary."""
+        def series(metrics, convert=lambda value: value):
+            return {
+                name: [{"labels": dict(key), "value": convert(value)} for key, value in values.items()]
+                for name, values in metrics.items()
+            }
+
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "finished_at": time.time(),
+                "peak_rss_bytes": peak_rss_bytes(),
+                "stages": {name: stage.to_dict() for name, stage in self.stages.items() if stage.wall_seconds is not None},
+                "counters": series(self.counters),
+                "gauges": series(self.gauges),
+                "histograms": series(self.histograms, lambda histogram: histogram.to_dict()),
+                "info": dict(self.info),
+            }
+
+    def prometheus_text(self):
+        """Renders the metrics in the Prometheus text exposition format."""
+        def labels_text(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                       for key, value in pairs)
+            return "{" + ",".join(escaped) + "}"
+
+        lines = []
+        with self._lock:
+            stage_fields = (
+                ("stage_wall_seconds", "wall_seconds"),
+                ("stage_cpu_seconds", "cpu_seconds"),
+                ("stage_process_peak_rss_bytes", "process_peak_rss_bytes"),
+                ("stage_peak_rss_growth_bytes", "peak_rss_growth_bytes"),
+                ("stage_items", "items"),
+            )
+            for metric, field in stage_fields:
+                lines.append(f"# TYPE {METRIC_PREFIX}{metric} gauge")
+                for name, stage in self.stages.items():
+                    value = getattr(stage, field)
+                    if value is not None:
+                        lines.append(f"{METRIC_PREFIX}{metric}{labels_text([('stage', name)])} {value}")
+            for name, values in self.counters.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} counter")
+                lines.extend(f"{METRIC_PREFIX}{name}{labels_text(key)} {value}" for key, value in values.items())
+            for name, values in self.gauges.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} gauge")
+                lines.extend(f"{METRIC_PREFIX}{name}{labels_text(key)} {value}" for key, value in values.items())
+            for name, values in self.histograms.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} histogram")
+                for key, histogram in values.items():
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{METRIC_PREFIX}{name}_bucket{labels_text(key, [('le', bound)])} {count}")
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{labels_text(key, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{METRIC_PREFIX}{name}_sum{labels_text(key)} {histogram.sum}")
+                    lines.append(f"{METRIC_PREFIX}{name}_count{labels_text(key)} {histogram.count}")
+        lines.append(f"{METRIC_PREFIX}last_run_timestamp_seconds {self.started_at}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, report_dir=METRICS_DIR, prometheus_file=PROMETHEUS_FILE):
+        """
+        Writes the JSON run report (one file per run) and overwrites the Prometheus textfile.
+
+        Returns:
+            str: Path of the JSON run report.
+        """
+        os.makedirs(report_dir, exist_ok=True)
+        # Milliseconds and the run ID keep runs started within the same second apart
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(self.started_at))
+        milliseconds = int(self.started_at * 1000) % 1000
+        report_path = os.path.join(report_dir, f"run_{timestamp}_{milliseconds:03d}_{self.run_id}.json")
+        with open(report_path, "w") as file:
+            json.dump(self.report(), file, indent=2)
+
+        os.makedirs(os.path.dirname(prometheus_file), exist_ok=True)
+        tmp_path = prometheus_file + ".tmp"
+        with open(tmp_path, "w") as file:
+            file.write(self.prometheus_text())
+        os.replace(tmp_path, prometheus_file)  # The textfile collector must never see a partial file
+        logger.info(f"Wrote run report to {report_path} and Prometheus metrics to {prometheus_file}")
+        return report_path
+
+# Registry shared by the pipeline modules for the current run
+metrics = MetricsRegistry()
+
+def count_items(value):
+    """
+    Number of items in a stage output (vectors for FAISS indexes), or None if it has no size.
+
+    Dicts are records of several outputs, not collections of items, so they have no size here;
+    stages returning one report their count with metrics.set_items.
+    """
+    if hasattr(value, "ntotal"):
+        return int(value.ntotal)
+    if hasattr(value, "__len__") and not isinstance(value, dict):
+        return len(value)
+    return None
+
+def instrument_stage(name, func):
+    """Wraps a pipeline stage function so that its timings and item count (reported or output size) are recorded."""
+    def wrapper(*args, **kwargs):
+        with metrics.stage(name) as stage:
+            result = func(*args, **kwargs)
+            if stage.items is None:
+                stage.items = count_items(result)
+            return result
+    return wrapper
+
+def write_run_report(config):
+    """
+    Writes the metrics of the current run as configured in the `metrics` section.
+
+    Returns:
+        str: Path of the JSON run report, or None if metrics are disabled.
+    """
+    metrics_config = config.get("metrics", {})
+    if not metrics_config.get("enabled", True):
+        return None
+    return metrics.write(
+        report_dir=os.path.join(PROJECT_ROOT, metrics_config.get("report_dir", METRICS_DIR)),  # Relative paths start at the project root
+        prometheus_file=os.path.join(PROJECT_ROOT, metrics_config.get("prometheus_textfile", PROMETHEUS_FILE)),
+    )
@@ -1,8 +1,164 @@
+import logging
 import smtplib
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from fpdf import FPDF
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBJECT = "Job Search Results"
+PDF_LINE_CHARS = 90  # Characters per line of 12pt Arial on an A4 page
+
+def build_message(sender, recipients, body, subject=DEFAULT_SUBJECT):
+    """Builds a plain-text email message."""
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = ", ".join(recipients)
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+class SMTPDeliveryEngine:
+    """
+    Delivers many messages over a small pool of persistent, authenticated SMTP connections.
+
+    Each worker thread keeps its own connection open (one STARTTLS handshake and login
+    per connection instead of per message). A pooled connection is checked with NOOP
+    before it is reused and replaced if the server has dropped it; a message is never
+    resent once its transaction has started, since the server may already have accepted
+    it. send() delivers on the calling thread; submit() hands the message to the worker
+    pool and returns a Future so a slow server does not block the caller.
+    """
+
+    def __init__(self, config, pool_size=1):
+        self.email_config = config["email"]
+        self.sender = self.email_config["sender"]
+        self.use_tls = self.email_config.get("use_tls", True)
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._executor = None
+        self.sent = 0
+        self.failed = 0
+        self._started = None
+        self._finished = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.email_config["smtp_server"], self.email_config["smtp_port"])
+        if self.use_tls:
+            server.starttls()
+        if self.email_config.get("smtp_password"):
+            server.login(self.sender, self.email_config["smtp_password"])
+        with self._lock:
+            self._connections.append(server)
+        return server
+
+    def _connection(self):
+        server = getattr(self._local, "server", None)
+        if server is not None:
+            try:
+                server.noop()  # Pooled connection: make sure the server has not closed it while idle
+            except (smtplib.SMTPException, OSError):
+                self._drop_connection()
+                server = None
+        if server is None:
+            server = self._local.server = self._connect()
+        return server
+
+    def _drop_connection(self):
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is None:
+            return
+        with self._lock:
+            if server in self._connections:
+                self._connections.remove(server)
+        try:
+            server.close()
+        except Exception:
+            pass
+
+    def send(self, recipients, body, subject=DEFAULT_SUBJECT, raise_errors=False):
+        """
+        Sends one message over this thread's connection.
+
+        A stale pooled connection is replaced before the message is sent; a failure
+        after the transaction has started is not retried (the server may already have
+        accepted the message), so retrying is left to the caller, e.g. the outbox.
+
+        Returns True on success. On failure returns False, or re-raises the error when
+        raise_errors is set.
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        msg = build_message(self.sender, recipients, body, subject)
+        try:
+            self._connection().sendmail(self.sender, recipients, msg.as_string())
+            with self._lock:
+                self.sent += 1
+                self._finished = time.perf_counter()
+            return True
+        except (smtplib.SMTPException, OSError) as e:
+            if isinstance(e, (smtplib.SMTPServerDisconnected, OSError)):
+                self._drop_connection()
+            error = e
+        with self._lock:
+            self.failed += 1
+        if raise_errors:
+            raise error
+        logger.error(f"Failed to send email to {', '.join(recipients)}: {error}")
+        return False
+
+    def submit(self, recipients, body, subject=DEFAULT_SUBJECT, raise_errors=False):
+        """
+        Queues a message for delivery by the worker pool and returns a Future.
+
+        With raise_errors the Future raises the delivery error instead of returning False.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="smtp")
+        return self._executor.submit(self.send, recipients, body, subject, raise_errors)
+
+    def send_digests(self, digests, subject=DEFAULT_SUBJECT):
+        """Sends a personalized message to each recipient ({recipient: body}) over the pool."""
+        futures = [self.submit([recipient], body, subject) for recipient, body in digests.items()]
+        return sum(future.result() for future in futures)
+
+    def close(self):
+        """Waits for queued messages and closes every open connection."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for server in connections:
+            try:
+                server.quit()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+    def stats(self):
+        """Returns delivery counts and throughput."""
+        elapsed = (self._finished - self._started) if self._started and self._finished else 0.0
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "seconds": round(elapsed, 3),
+            "messages_per_second": round(self.sent / elapsed, 1) if elapsed else None,
+        }
+
 def send_email(response, config):
     """
     Sends an email with the LLM-generated response.
@@ -11,24 +167,12 @@ def send_email(response, config):
         response (str): The LLM-generated response to send.
         config (dict): Configuration dictionary containing email settings.
     """
-    msg = MIMEMultipart()
-    msg['From'] = config["email"]["sender"]
-    msg['To'] = ", ".join(config["email"]["recipients"])
-    msg['Subject'] = "Job Search Results"
-
-    # Email body includes the LLM-generated response
-    body = response
-    msg.attach(MIMEText(body, 'plain'))
-
     try:
-        server = smtplib.SMTP(config["email"]["smtp_server"], config["email"]["smtp_port"])
-        server.starttls()
-        server.login(msg['From'], config["email"]["smtp_password"])
-        server.sendmail(msg['From'], config["email"]["recipients"], msg.as_string())
-        server.quit()
-        print("Email notification sent successfully.")
+        with SMTPDeliveryEngine(config) as engine:
+            if engine.send(config["email"]["recipients"], response):
+                logger.info("Email notification sent successfully.")
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.error(f"Failed to send email: {e}")
 
 def create_pdf(response, config):
     """
@@ -43,12 +187,16 @@ def create_pdf(response, config):
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.set_font("Arial", size=12)
 
-    # Add the LLM-generated response to the PDF
-    pdf.multi_cell(0, 10, txt=response)
+    # Add the LLM-generated response to the PDF, one wrapped line per cell.
+    # The core Arial font only covers Latin-1, so other characters are replaced instead of crashing.
+    for paragraph in response.splitlines() or [""]:
+        safe_paragraph = paragraph.encode("latin-1", "replace").decode("latin-1")
+        for line in textwrap.wrap(safe_paragraph, width=PDF_LINE_CHARS) or [""]:
+            pdf.cell(0, 10, txt=line, ln=1)
 
     # Save the PDF to the specified destination
     pdf.output(config["cloud"]["pdf_destination"])
-    print("PDF report created successfully.")
+    logger.info("PDF report created successfully.")
 
 def notify(response, config):
     """
@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from notifier import DEFAULT_SUBJECT, SMTPDeliveryEngine, create_pdf
+from report import create_report_pool, generate_reports
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+OUTBOX_FILE = os.path.join(PROJECT_ROOT, "output", "outbox.sqlite3")
+
+PENDING = "pending"
+SENDING = "sending"
+SENT = "sent"
+DEAD = "dead"
+
+def make_idempotency_key(recipients, subject, body, report_jobs=None, pdf_destination=None):
+    """
+    Same recipients, subject and content always produce the same key, so reruns never double-send.
+
+    Notifications with a job report are keyed by their job IDs and report path instead of the body:
+    the LLM response for the same jobs changes between runs once the response cache expires.
+    """
+    if report_jobs is not None:
+        content = {"jobs": sorted(job.get("id") or "" for job in report_jobs), "pdf_destination": pdf_destination}
+    else:
+        content = {"body": body}
+    payload = json.dumps({"recipients": sorted(recipients), "subject": subject, **content}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class Outbox:
+    """
+    Durable notification outbox stored in SQLite.
+
+    The pipeline enqueues notifications and returns; a Dispatcher delivers them
+    later. Failed deliveries are retried with exponential backoff and moved to
+    the dead letter state after max_attempts.
+
+    A claim that goes stale (the dispatcher crashed or hangs) is only retried when
+    sending had not started; otherwise the message may already have been delivered,
+    so it is dead-lettered rather than sent twice.
+    """
+
+    def __init__(self, path=OUTBOX_FILE, max_attempts=5, retry_base_seconds=30):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS notifications ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, idempotency_key TEXT NOT NULL UNIQUE, "
+            "recipients TEXT NOT NULL, subject TEXT NOT NULL, body TEXT NOT NULL, pdf_destination TEXT, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+            "claimed_at REAL, last_error TEXT, created_at REAL NOT NULL, sent_at REAL, report_jobs TEXT, "
+            "send_started_at REAL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(notifications)")}
+        if "report_jobs" not in columns:  # Outboxes created before job tables were added to reports
+            self._conn.execute("ALTER TABLE notifications ADD COLUMN report_jobs TEXT")
+        if "send_started_at" not in columns:
+            self._conn.execute("ALTER TABLE notifications ADD COLUMN send_started_at REAL")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_status_next ON notifications (status, next_attempt_at)")
+        self._conn.commit()
+
+    def enqueue(self, recipients, body, subject=DEFAULT_SUBJECT, pdf_destination=None, idempotency_key=None,
+                report_jobs=None):
+        """
+        Adds a notification to the outbox.
+
+        When report_jobs is given, the PDF report contains a table of those jobs
+        below the body; otherwise it only contains the body.
+
+        Returns:
+            bool: False if a notification with the same idempotency key already exists.
+        """
+        key = idempotency_key or make_idempotency_key(recipients, subject, body, report_jobs, pdf_destination)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO notifications "
+                "(idempotency_key, recipients, subject, body, pdf_destination, status, next_attempt_at, created_at, "
+                "report_jobs) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(recipients), subject, body, pdf_destination, PENDING, now, now,
+                 json.dumps(report_jobs) if report_jobs is not None else None)
+            )
+            self._conn.commit()
+        if cursor.rowcount == 0:
+            logger.info(f"Notification for {', '.join(recipients)} already in outbox; skipping duplicate.")
+            return False
+        return True
+
+    def claim(self, limit=10, stale_after=600):
+        """
+        Claims due notifications for delivery.
+
+        Notifications left in the sending state for longer than stale_after seconds
+        (e.g. the dispatcher crashed) count as a failed attempt and are claimed again,
+        unless sending had started: those are dead-lettered.
+        """
+        now = time.time()
+        with self._lock:
+            # Take the write lock up front so concurrent dispatcher processes never claim the same rows
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.execute(
+                "UPDATE notifications SET status = ?, last_error = ? "
+                "WHERE status = ? AND claimed_at < ? AND send_started_at IS NOT NULL",
+                (DEAD, "Dispatcher stopped while sending; delivery outcome unknown", SENDING, now - stale_after)
+            )
+            if cursor.rowcount:
+                logger.error(f"Dead-lettered {cursor.rowcount} notifications whose sending was interrupted.")
+            self._conn.execute(
+                "UPDATE notifications SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?, "
+                "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END "
+                "WHERE status = ? AND claimed_at < ?",
+                ("Dispatcher stopped before sending", now, self.max_attempts, DEAD, PENDING, SENDING, now - stale_after)
+            )
+            rows = self._conn.execute(
+                "SELECT id, recipients, subject, body, pdf_destination, attempts, report_jobs FROM notifications "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, now, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE notifications SET status = ?, claimed_at = ?, send_started_at = NULL WHERE id = ?",
+                [(SENDING, now, row[0]) for row in rows]
+            )
+            self._conn.commit()
+        return [
+            {"id": row[0], "recipients": json.loads(row[1]), "subject": row[2], "body": row[3],
+             "pdf_destination": row[4], "attempts": row[5],
+             "report_jobs": json.loads(row[6]) if row[6] is not None else None, "claimed_at": now}
+            for row in rows
+        ]
+
+    def begin_send(self, notification):
+        """
+        Records that sending a claimed notification starts now.
+
+        Returns:
+            bool: False if the claim went stale and the notification was taken over or dead-lettered.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE notifications SET send_started_at = ? WHERE id = ? AND status = ? AND claimed_at = ?",
+                (time.time(), notification["id"], SENDING, notification["claimed_at"])
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    def mark_sent(self, notification_id):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE notifications SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL "
+                "WHERE id = ?",
+                (SENT, time.time(), notification_id)
+            )
+            self._conn.commit()
+
+    def mark_failed(self, notification_id, error):
+        """Schedules a retry with exponential backoff, or dead-letters the notification."""
+        with self._lock:
+            attempts = self._conn.execute(
+                "SELECT attempts FROM notifications WHERE id = ?", (notification_id,)
+            ).fetchone()[0] + 1
+            if attempts >= self.max_attempts:
+                status, next_attempt_at = DEAD, time.time()
+                logger.error(f"Notification {notification_id} dead-lettered after {attempts} attempts: {error}")
+            else:
+                status = PENDING
+                next_attempt_at = time.time() + self.retry_base_seconds * 2 ** (attempts - 1)
+                logger.warning(f"Notification {notification_id} failed (attempt {attempts}), retrying later: {error}")
+            self._conn.execute(
+                "UPDATE notifications SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+                "send_started_at = NULL WHERE id = ?",
+                (status, attempts, next_attempt_at, str(error), notification_id)
+            )
+            self._conn.commit()
+
+    def counts(self):
+        """Returns the number of notifications per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM notifications GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self._conn.close()
+
+class Dispatcher:
+    """
+    Drains an Outbox in a background thread: creates the PDF report and sends the email for each notification.
+
+    Reports with job tables of a claimed batch are rendered together, in report_processes
+    worker processes when more than one is configured; the worker pool is started once
+    and kept until the dispatcher stops.
+    """
+
+    def __init__(self, outbox, config, poll_interval=1.0, batch_size=10):
+        self.outbox = outbox
+        self.config = config
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        reports_config = config.get("reports", {})
+        self.report_processes = reports_config.get("processes", 1)
+        self.font_path = reports_config.get("font_path")
+        self._report_pool = None
+        self._stop = threading.Event()
+        self._drain = threading.Event()
+        self._thread = None
+
+    def dispatch_once(self, engine):
+        """Delivers one batch of due notifications; returns the number processed."""
+        notifications = self.outbox.claim(limit=self.batch_size)
+        reports = [
+            {"path": n["pdf_destination"], "jobs": n["report_jobs"], "title": n["subject"], "summary": n["body"]}
+            for n in notifications if n["pdf_destination"] and n["report_jobs"] is not None
+        ]
+        try:
+            if reports and self.report_processes > 1 and self._report_pool is None:
+                self._report_pool = create_report_pool(self.report_processes, self.font_path)
+            rendered = generate_reports(reports, processes=self.report_processes, font_path=self.font_path, pool=self._report_pool)
+        except Exception as e:
+            # Counted as a failed attempt of each notification below, so a report that never renders is dead-lettered
+            logger.error(f"Report generation failed: {e}", exc_info=True)
+            rendered = {}
+
+        # Messages go out concurrently over the engine's pool (email.pool_size); the outbox is
+        # only updated from this thread once every delivery of the batch has finished
+        deliveries = []
+        for notification in notifications:
+            try:
+                if notification["pdf_destination"]:
+                    if notification["report_jobs"] is None:
+                        create_pdf(notification["body"], {"cloud": {"pdf_destination": notification["pdf_destination"]}})
+                    elif notification["pdf_destination"] not in rendered:
+                        raise RuntimeError(f"PDF report {notification['pdf_destination']} could not be generated")
+                if not self.outbox.begin_send(notification):
+                    logger.warning(f"Claim of notification {notification['id']} went stale; not sending it.")
+                    continue
+                future = engine.submit(notification["recipients"], notification["body"], notification["subject"], raise_errors=True)
+                deliveries.append((notification, future))
+            except Exception as e:
+                self.outbox.mark_failed(notification["id"], e)
+
+        for notification, future in deliveries:
+            try:
+                future.result()
+                self.outbox.mark_sent(notification["id"])
+            except Exception as e:
+                self.outbox.mark_failed(notification["id"], e)
+        return len(notifications)
+
+    def run(self, until_empty=False):
+        """Delivers notifications until stopped (or until nothing is due, with until_empty)."""
+        email_config = self.config.get("email", {})
+        try:
+            with SMTPDeliveryEngine(self.config, pool_size=email_config.get("pool_size", 1)) as engine:
+                while not self._stop.is_set():
+                    if self.dispatch_once(engine) == 0:
+                        if until_empty or self._drain.is_set():
+                            break
+                        self._stop.wait(self.poll_interval)
+        finally:
+            self.close()
+        logger.info(f"Dispatcher stopped. Outbox status: {self.outbox.counts()}")
+
+    def start(self, until_empty=True):
+        """
+        Starts dispatching in a background thread.
+
+        The thread is not a daemon, so the interpreter waits for in-flight
+        deliveries after the pipeline itself has returned.
+        """
+        self._thread = threading.Thread(target=self.run, kwargs={"until_empty": until_empty}, name="outbox-dispatcher")
+        self._thread.start()
+        return self._thread
+
+    def close(self):
+        """Shuts down the report worker pool."""
+        if self._report_pool is not None:
+            self._report_pool.shutdown(wait=True)
+            self._report_pool = None
+
+    def drain(self):
+        """Lets a dispatcher started with until_empty=False finish once nothing is due any more."""
+        self._drain.set()
+        return self._thread
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+def create_outbox(config):
+    """Creates an Outbox from the `outbox` section of the configuration."""
+    outbox_config = config.get("outbox", {})
+    return Outbox(
+        path=os.path.join(PROJECT_ROOT, outbox_config.get("path", OUTBOX_FILE)),  # Relative paths start at the project root
+        max_attempts=outbox_config.get("max_attempts", 5),
+        retry_base_seconds=outbox_config.get("retry_base_seconds", 30),
+    )
+
+if __name__ == "__main__":
+    from scraper import load_config
+
+    parser = argparse.ArgumentParser(description="Deliver notifications queued in the outbox.")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for new notifications.")
+    parser.add_argument("--status", action="store_true", help="Print the outbox status and exit.")
+    args = parser.parse_args()
+
+    config = load_config()
+    outbox = create_outbox(config)
+    if args.status:
+        print(outbox.counts())
+    else:
+        Dispatcher(outbox, config, poll_interval=config.get("outbox", {}).get("poll_interval", 5)).run(
+            until_empty=not args.watch
+        )
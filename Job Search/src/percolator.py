@@ -0,0 +1,227 @@
+import json
+import logging
+import os
+import re
+import numpy as np
+from metadata_index import MetadataIndex
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+SAVED_QUERIES_FILE = os.path.join(PROJECT_ROOT, "output", "saved_queries.json")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+# Words that say nothing about the job itself ("Find me remote Python developer jobs.")
+STOPWORDS = frozenset({
+    "a", "an", "and", "any", "at", "for", "find", "i", "in", "job", "jobs", "looking", "me", "my", "of",
+    "on", "or", "position", "positions", "role", "roles", "show", "the", "to", "want", "with",
+})
+
+def tokenize(text):
+    """Lowercased terms of a text, without stopwords."""
+    return [token for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+def job_terms(job):
+    """Distinct terms of a job's title, description and skills."""
+    terms = set(tokenize(job.get("title")))
+    terms.update(tokenize(job.get("description")))
+    for skill in job.get("skills") or []:
+        terms.update(tokenize(skill))
+    return terms
+
+def _normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+class Percolator:
+    """
+    Registry of saved subscriber queries matched against newly ingested jobs.
+
+    Queries are embedded and tokenized once, when they are saved. A new job batch is
+    matched against every saved query at once: a single (jobs x queries) cosine
+    similarity matrix, plus a lookup of each job's terms in the query term postings.
+    A job matches a query when the similarity reaches similarity_threshold or the job
+    contains at least term_threshold of the query's terms, and the query's filters
+    (same expressions as hybrid_search) accept it.
+    """
+
+    def __init__(self, similarity_threshold=0.5, term_threshold=1.0, max_alerts=20, encode_queries=None):
+        self.similarity_threshold = similarity_threshold
+        self.term_threshold = term_threshold
+        self.max_alerts = max_alerts
+        self._encode_queries = encode_queries
+        self.queries = {}      # query ID -> {"query", "filters", "email", "terms"}
+        self.embeddings = {}   # query ID -> normalized query embedding
+        self.postings = {}     # term -> set of query IDs
+        self._ids = None       # Row order of _matrix
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.queries)
+
+    def encode_queries(self, texts):
+        if self._encode_queries is None:
+            from processor import embedding_model, normalize_text
+            self._encode_queries = lambda texts: embedding_model.encode([normalize_text(text) for text in texts])
+        return self._encode_queries(texts)
+
+    def add(self, query_id, query, filters=None, email=None, embedding=None):
+        """Saves (or replaces) a query; it is encoded now unless an embedding is given."""
+        if embedding is None:
+            embedding = self.encode_queries([query])[0]
+        self.remove(query_id)
+        terms = sorted(set(tokenize(query)))
+        self.queries[query_id] = {"query": query, "filters": filters, "email": email or query_id, "terms": terms}
+        self.embeddings[query_id] = _normalize_rows(embedding)[0]
+        for term in terms:
+            self.postings.setdefault(term, set()).add(query_id)
+        self._matrix = None
+
+    def remove(self, query_id):
+        """Removes a saved query; returns False if it does not exist."""
+        saved = self.queries.pop(query_id, None)
+        if saved is None:
+            return False
+        del self.embeddings[query_id]
+        for term in saved["terms"]:
+            ids = self.postings.get(term)
+            ids.discard(query_id)
+            if not ids:
+                del self.postings[term]
+        self._matrix = None
+        return True
+
+    def sync(self, subscribers):
+        """
+        Makes the registry match the configured subscribers (one saved query per email).
+
+        Only queries that are new or whose text changed are encoded, in one batch.
+
+        Returns:
+            int: Number of queries encoded.
+        """
+        wanted = {subscriber["email"]: subscriber for subscriber in subscribers}
+        for query_id in set(self.queries) - set(wanted):
+            self.remove(query_id)
+        changed = [subscriber for email, subscriber in wanted.items()
+                   if email not in self.queries or self.queries[email]["query"] != subscriber["query"]]
+        embeddings = self.encode_queries([subscriber["query"] for subscriber in changed]) if changed else []
+        for subscriber, embedding in zip(changed, embeddings):
+            self.add(subscriber["email"], subscriber["query"], subscriber.get("filters"), subscriber["email"], embedding)
+        for email, subscriber in wanted.items():
+            self.queries[email]["filters"] = subscriber.get("filters")  # Filter changes need no re-encoding
+        logger.info(f"Saved queries: {len(self.queries)} ({len(changed)} encoded).")
+        return len(changed)
+
+    def _query_matrix(self):
+        if self._matrix is None:
+            self._ids = list(self.queries)
+            self._matrix = np.stack([self.embeddings[query_id] for query_id in self._ids]) if self._ids else None
+        return self._ids, self._matrix
+
+    def match(self, jobs, embeddings):
+        """
+        Matches a batch of new jobs against all saved queries.
+
+        Args:
+            jobs (list): Newly ingested jobs.
+            embeddings (np.ndarray): Their description embeddings (as from generate_embeddings).
+
+        Returns:
+            dict: {query ID: [jobs, best match first]} for the queries with at least one match.
+        """
+        ids, matrix = self._query_matrix()
+        if not jobs or matrix is None:
+            return {}
+        similarities = _normalize_rows(embeddings) @ matrix.T  # (jobs, queries)
+        columns = {query_id: column for column, query_id in enumerate(ids)}
+
+        candidates = set()  # (job row, query ID) pairs from the vector side and from the term postings
+        for row, column in zip(*np.nonzero(similarities >= self.similarity_threshold)):
+            candidates.add((int(row), ids[column]))
+        for row, job in enumerate(jobs):
+            hits = {}
+            for term in job_terms(job):
+                for query_id in self.postings.get(term, ()):
+                    hits[query_id] = hits.get(query_id, 0) + 1
+            for query_id, count in hits.items():
+                if count >= self.term_threshold * len(self.queries[query_id]["terms"]):
+                    candidates.add((row, query_id))
+
+        filter_masks = {}  # Filter expressions shared by several queries are evaluated once
+        metadata_index = None
+        matches = {}
+        for row, query_id in candidates:
+            filters = self.queries[query_id]["filters"]
+            if filters:
+                key = json.dumps(filters, sort_keys=True)
+                if key not in filter_masks:
+                    metadata_index = metadata_index or MetadataIndex(jobs)
+                    filter_masks[key] = metadata_index.evaluate(filters)
+                if not filter_masks[key][row]:
+                    continue
+            matches.setdefault(query_id, []).append((float(similarities[row, columns[query_id]]), row))
+
+        alerts = {}
+        for query_id, scored in matches.items():
+            scored.sort(key=lambda item: -item[0])
+            alerts[query_id] = [jobs[row] for _, row in scored[:self.max_alerts]]
+        logger.info(f"Matched {len(jobs)} new jobs against {len(ids)} saved queries: {len(alerts)} with alerts.")
+        return alerts
+
+    def save(self, path=SAVED_QUERIES_FILE):
+        """Persists the saved queries with their embeddings, so they are not encoded again."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {query_id: {**saved, "embedding": self.embeddings[query_id].tolist()}
+                for query_id, saved in self.queries.items()}
+        with open(path, "w") as file:
+            json.dump(data, file)
+        logger.info(f"Saved {len(data)} saved queries to {path}")
+
+    @classmethod
+    def load(cls, path=SAVED_QUERIES_FILE, **kwargs):
+        """Loads queries saved with save(); returns an empty registry if the file does not exist."""
+        percolator = cls(**kwargs)
+        if not os.path.exists(path):
+            return percolator
+        with open(path, "r") as file:
+            data = json.load(file)
+        for query_id, saved in data.items():
+            percolator.add(query_id, saved["query"], saved.get("filters"), saved.get("email"),
+                           np.asarray(saved["embedding"], dtype=np.float32))
+        return percolator
+
+def format_alert(query, jobs):
+    """Plain-text alert body listing the new jobs that match a saved query."""
+    lines = [f'New jobs matching your saved search "{query}":', ""]
+    for job in jobs:
+        lines.append(f"- {job.get('title', 'Untitled')} at {job.get('company', 'Unknown')} ({job.get('location', 'n/a')})")
+        if job.get("link"):
+            lines.append(f"  {job['link']}")
+    return "\n".join(lines)
+
+def create_percolator(config):
+    """
+    Loads the saved query registry and syncs it with the configured subscribers.
+
+    Returns:
+        Percolator or None: None when the percolator section is disabled.
+    """
+    percolator_config = config.get("percolator", {}) or {}
+    if not percolator_config.get("enabled", False):
+        return None
+    path = os.path.join(PROJECT_ROOT, percolator_config.get("path", SAVED_QUERIES_FILE))  # Relative paths start at the project root
+    percolator = Percolator.load(
+        path,
+        similarity_threshold=percolator_config.get("similarity_threshold", 0.5),
+        term_threshold=percolator_config.get("term_threshold", 1.0),
+        max_alerts=percolator_config.get("max_alerts", 20),
+    )
+    percolator.sync(config.get("subscribers") or [])
+    percolator.save(path)
+    return percolator
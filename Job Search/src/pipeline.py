@@ -0,0 +1,234 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+ARTIFACTS_DIR = os.path.join(PROJECT_ROOT, "output", "artifacts")
+MANIFEST_FILE = "manifest.json"
+
+def content_hash(data):
+    """SHA-256 of serialized data."""
+    return hashlib.sha256(data).hexdigest()
+
+class Stage:
+    """
+    A pipeline stage.
+
+    Args:
+        name (str): Unique stage name, also used for the artifact file name.
+        func (callable): Called as func(config, *dependency_outputs) and returns the stage output.
+        deps (tuple): Names of the stages whose outputs are passed to func, in order.
+        config_keys (tuple): Configuration sections the stage depends on; changing them re-runs the stage.
+        volatile (bool): The output can change without any input changing (e.g. scraping), so the
+            stage always runs unless the pipeline is resumed.
+        cache (bool): Persist the output and skip the stage when its inputs are unchanged.
+            Stages with side effects that must happen on every run (e.g. notifying) set this to False.
+        dump (callable): Serializes the output to bytes (defaults to pickle).
+        load (callable): Deserializes bytes written by dump.
+    """
+
+    def __init__(self, name, func, deps=(), config_keys=(), volatile=False, cache=True,
+                 dump=pickle.dumps, load=pickle.loads):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.config_keys = tuple(config_keys)
+        self.volatile = volatile
+        self.cache = cache
+        self.dump = dump
+        self.load = load
+
+class Pipeline:
+    """
+    Runs stages as a DAG with persisted artifacts and content-hash-based skipping.
+
+    Every stage output is written to artifacts_dir together with a manifest that
+    records, per stage, the hash of its inputs (dependency output hashes, stage
+    configuration) and of its output. A stage whose input hash matches the
+    manifest is skipped and its artifact is loaded only if a downstream stage
+    actually needs it. Stages whose dependencies are complete run concurrently.
+    """
+
+    def __init__(self, stages, config, artifacts_dir=ARTIFACTS_DIR, max_workers=2, stage_wrapper=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.config = config
+        self.artifacts_dir = artifacts_dir
+        self.max_workers = max_workers
+        # Optional hook wrapping every stage function, called as stage_wrapper(stage_name, func)
+        self.stage_wrapper = stage_wrapper
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'.")
+        self._lock = threading.Lock()
+        self._outputs = {}
+        self.manifest = self._load_manifest()
+
+    def _manifest_path(self):
+        return os.path.join(self.artifacts_dir, MANIFEST_FILE)
+
+    def _artifact_path(self, name):
+        return os.path.join(self.artifacts_dir, f"{name}.artifact")
+
+    def _load_manifest(self):
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as file:
+            return json.load(file)
+
+    def _save_manifest(self):
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        tmp_path = self._manifest_path() + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _record(self, name, **entry):
+        with self._lock:
+            self.manifest[name] = {**self.manifest.get(name, {}), **entry}
+            self._save_manifest()
+
+    def _input_hash(self, stage):
+        config_part = {key: self.config.get(key) for key in stage.config_keys}
+        payload = json.dumps({
+            "stage": stage.name,
+            "deps": [self.manifest[dep]["output_hash"] for dep in stage.deps],
+            "config": config_part,
+        }, sort_keys=True, default=str)
+        return content_hash(payload.encode("utf-8"))
+
+    def _order(self, targets):
+        """Returns the stages needed for targets (all stages by default) in topological order."""
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'.")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'.")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in targets or self.stages:
+            visit(name)
+        return order
+
+    def output(self, name):
+        """Returns a stage output, loading it from its artifact if it was skipped in this run."""
+        with self._lock:
+            if name in self._outputs:
+                return self._outputs[name]
+        path = self._artifact_path(name)
+        if not os.path.exists(path):
+            raise RuntimeError(f"No artifact for stage '{name}'. Run it first.")
+        with open(path, "rb") as file:
+            value = self.stages[name].load(file.read())
+        with self._lock:
+            self._outputs[name] = value
+        return value
+
+    def _can_skip(self, stage, input_hash, resume, force):
+        entry = self.manifest.get(stage.name, {})
+        if stage.name in force or not stage.cache or entry.get("status") != "ok":
+            return False
+        if not os.path.exists(self._artifact_path(stage.name)):
+            return False
+        if stage.volatile:
+            return resume
+        return entry.get("input_hash") == input_hash
+
+    def _execute(self, stage, input_hash):
+        logger.info(f"Running stage '{stage.name}'...")
+        self._record(stage.name, status="running", input_hash=input_hash)
+        func = self.stage_wrapper(stage.name, stage.func) if self.stage_wrapper else stage.func
+        start = time.perf_counter()
+        try:
+            value = func(self.config, *(self.output(dep) for dep in stage.deps))
+        except Exception:
+            self._record(stage.name, status="failed")
+            raise
+        elapsed = time.perf_counter() - start
+
+        if stage.cache:
+            data = stage.dump(value)
+            output_hash = content_hash(data)
+            os.makedirs(self.artifacts_dir, exist_ok=True)
+            tmp_path = self._artifact_path(stage.name) + ".tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, self._artifact_path(stage.name))
+        else:
+            output_hash = content_hash(f"{input_hash}:{time.time()}".encode("utf-8"))
+        with self._lock:
+            self._outputs[stage.name] = value
+        self._record(stage.name, status="ok", output_hash=output_hash, seconds=round(elapsed, 3), finished_at=time.time())
+        logger.info(f"Stage '{stage.name}' finished in {elapsed:.2f}s.")
+        return value
+
+    def run(self, targets=None, resume=False, force=(), only=False):
+        """
+        Runs the pipeline.
+
+        Args:
+            targets (list, optional): Stages to run, together with the stages they depend on.
+                Runs every stage by default.
+            resume (bool): Reuse the artifacts of successful stages, including volatile ones,
+                so that a failed run continues after its last successful stage.
+            force (iterable): Stage names to re-run even if their inputs are unchanged.
+            only (bool): Run only the targets, using existing artifacts for their dependencies.
+
+        Returns:
+            dict: Status of each stage in this run ("ran" or "skipped").
+        """
+        force = set(force)
+        if only and not targets:
+            raise ValueError("Running only selected stages requires at least one target stage.")
+        order = list(targets) if only else self._order(targets)
+        if only:
+            for name in order:
+                for dep in self.stages[name].deps:
+                    if dep not in order and self.manifest.get(dep, {}).get("status") != "ok":
+                        raise RuntimeError(f"Stage '{name}' needs a successful run of '{dep}' first.")
+                force.add(name)
+
+        statuses = {}
+        pending = list(order)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage") as executor:
+            while pending or running:
+                # Start every stage whose dependencies are complete
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(dep in pending or dep in running.values() for dep in stage.deps if dep in order):
+                        continue
+                    pending.remove(name)
+                    input_hash = self._input_hash(stage)
+                    if self._can_skip(stage, input_hash, resume, force):
+                        logger.info(f"Skipping stage '{name}': inputs unchanged.")
+                        statuses[name] = "skipped"
+                        continue
+                    running[executor.submit(self._execute, stage, input_hash)] = name
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    future.result()  # Re-raise stage failures; later stages are not started
+                    statuses[name] = "ran"
+        return statuses
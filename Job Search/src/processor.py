@@ -1,14 +1,20 @@
 import logging
 import re
+import time
+from itertools import islice
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss  # For local vector database
+from metrics import metrics
+from encoders import create_encoder
+from scraper import load_config
 # from pinecone import Pinecone  # Uncomment if using Pinecone
 
 logger = logging.getLogger(__name__)
 
-# Load embedding model
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+# Load embedding model (backend selected by the `embeddings` section of the configuration)
+embedding_model = create_encoder(load_config() or {})
+
+EMBED_BATCH_SIZE = 512  # Jobs encoded and added to the index at a time
 
 def normalize_text(text):
     """Basic text normalization: lowercase and remove extra whitespace."""
@@ -58,15 +64,47 @@ def clean_data(jobs):
 def generate_embeddings(jobs):
     """Generates embeddings for job descriptions."""
     descriptions = [normalize_text(job.get('description', '')) for job in jobs]
+    start = time.perf_counter()
     embeddings = embedding_model.encode(descriptions)
+    elapsed = time.perf_counter() - start
+    metrics.inc("embedding_texts_total", len(descriptions))
+    metrics.inc("embedding_encode_seconds_total", elapsed)
+    if elapsed > 0:
+        metrics.set_gauge("embedding_throughput_texts_per_second", round(len(descriptions) / elapsed, 3))
     return embeddings
 
-def index_jobs_in_faiss(jobs):
-    """Indexes jobs in a FAISS vector database."""
-    embeddings = generate_embeddings(jobs)
+def build_faiss_index(embeddings):
+    """Builds a FAISS index from an embedding matrix."""
     dimension = embeddings.shape[1]  # Dimensionality of embeddings
     index = faiss.IndexFlatL2(dimension)  # L2 distance for similarity search
     index.add(np.array(embeddings))
+    return index
+
+def dump_faiss_index(index):
+    """Serializes a FAISS index to bytes."""
+    return faiss.serialize_index(index).tobytes()
+
+def load_faiss_index(data):
+    """Deserializes a FAISS index written by dump_faiss_index."""
+    return faiss.deserialize_index(np.frombuffer(data, dtype=np.uint8))
+
+def iter_batches(items, batch_size=EMBED_BATCH_SIZE):
+    """Yields lists of up to batch_size items from any iterable (including generators)."""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def index_jobs_in_faiss(jobs, batch_size=EMBED_BATCH_SIZE):
+    """Indexes jobs in a FAISS vector database, encoding and adding one batch at a time."""
+    index = None
+    for batch in iter_batches(jobs, batch_size):
+        embeddings = np.asarray(generate_embeddings(batch), dtype=np.float32)
+        if index is None:
+            index = faiss.IndexFlatL2(embeddings.shape[1])
+        index.add(embeddings)  # Only one batch of descriptions and embeddings is held at a time
 
     # Store job metadata separately
     job_metadata = {i: job for i, job in enumerate(jobs)}
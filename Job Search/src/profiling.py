@@ -0,0 +1,204 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+PROFILE_DIR = os.path.join(PROJECT_ROOT, "logs", "profiles")
+
+# Overrides the `profiling` config section, e.g. "cprofile" (all stages) or "sampling:scrape,embed"
+PROFILE_ENV_VAR = "JOB_SEARCH_PROFILE"
+MODES = ("cprofile", "tracemalloc", "sampling")
+
+class StackSampler(threading.Thread):
+    """Periodically samples the stack of one thread and counts the collapsed stacks."""
+
+    def __init__(self, thread_id, interval=0.005):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class StageProfiler:
+    """
+    Profiles selected pipeline stages and writes the results to output_dir.
+
+    Modes:
+        cprofile: Deterministic function-level profile (<stage>_<time>.prof for pstats/snakeviz,
+            plus a text summary of the top functions by cumulative time).
+        tracemalloc: Top allocation sites still alive at the end of the stage and the peak
+            traced memory.
+        sampling: Stacks of the stage thread sampled every sample_interval seconds, written in
+            the folded format used by flame graph tools, plus the top functions by samples.
+    """
+
+    def __init__(self, mode, stages=None, output_dir=PROFILE_DIR, top=25, sample_interval=0.005):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode '{mode}'. Use one of: {', '.join(MODES)}.")
+        self.mode = mode
+        self.stages = set(stages) if stages else None  # None profiles every stage
+        self.output_dir = output_dir
+        self.top = top
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._tracing = 0  # Stages currently traced by tracemalloc, which is process-wide
+        self._started_tracing = False
+
+    def wrap(self, name, func):
+        """Stage wrapper for Pipeline; stages that are not selected are returned unchanged."""
+        if self.stages is not None and name not in self.stages:
+            return func
+
+        def wrapper(*args, **kwargs):
+            with self.profile(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _base_path(self, name):
+        """Output path without extension; every file of one profiled run shares it."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, f"{name}_{self.mode}_{time.strftime('%Y%m%d_%H%M%S')}")
+
+    @contextmanager
+    def profile(self, name):
+        """Profiles a block of work with the configured mode."""
+        start = time.perf_counter()
+        base_path = self._base_path(name)
+        if self.mode == "cprofile":
+            with self._cprofile(name, base_path):
+                yield
+        elif self.mode == "tracemalloc":
+            with self._tracemalloc(name, base_path):
+                yield
+        else:
+            with self._sampling(name, base_path):
+                yield
+        logger.info(f"Profiled stage '{name}' ({self.mode}, {time.perf_counter() - start:.2f}s).")
+
+    @contextmanager
+    def _cprofile(self, name, base_path):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:  # Only one profiler can be active at a time on Python 3.12+
+            logger.warning(f"Not profiling stage '{name}': {e}")
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(base_path + ".prof")
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(self.top)
+            with open(base_path + ".txt", "w") as file:
+                file.write(summary.getvalue())
+
+    @contextmanager
+    def _tracemalloc(self, name, base_path):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            elif self._tracing == 0:
+                tracemalloc.reset_peak()
+            self._tracing += 1
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            with self._lock:
+                self._tracing -= 1
+                if self._tracing == 0 and self._started_tracing:
+                    tracemalloc.stop()  # Leave tracing started elsewhere (e.g. python -X tracemalloc) running
+                    self._started_tracing = False
+            lines = [f"Stage '{name}': current {current / 2 ** 20:.1f} MiB, peak {peak / 2 ** 20:.1f} MiB",
+                     "(allocations of concurrently running stages are included)", ""]
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                lines.append(str(stat))
+            with open(base_path + ".txt", "w") as file:
+                file.write("\n".join(lines) + "\n")
+
+    @contextmanager
+    def _sampling(self, name, base_path):
+        sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            with open(base_path + ".folded", "w") as file:
+                for stack, count in sampler.samples.most_common():
+                    file.write(f"{stack} {count}\n")
+
+            total = sum(sampler.samples.values())
+            inclusive, own = Counter(), Counter()
+            for stack, count in sampler.samples.items():
+                frames = stack.split(";")
+                own[frames[-1]] += count
+                for frame in set(frames):
+                    inclusive[frame] += count
+            lines = [f"Stage '{name}': {total} samples every {self.sample_interval * 1000:g} ms", "",
+                     f"{'own':>6} {'total':>6}  function"]
+            for frame, count in inclusive.most_common(self.top):
+                lines.append(f"{own[frame] / total:6.1%} {count / total:6.1%}  {frame}")
+            with open(base_path + ".txt", "w") as file:
+                file.write("\n".join(lines) + "\n")
+
+def create_profiler(config, environ=os.environ):
+    """
+    Creates a StageProfiler from the `profiling` config section or the JOB_SEARCH_PROFILE
+    environment variable ("<mode>" or "<mode>:<stage>,<stage>", "off" to disable).
+
+    Returns:
+        StageProfiler: The profiler, or None when profiling is disabled.
+    """
+    profiling_config = config.get("profiling", {}) or {}
+    log_file = (config.get("logging", {}) or {}).get("file")
+    default_dir = os.path.join(os.path.dirname(os.path.join(PROJECT_ROOT, log_file)), "profiles") if log_file else PROFILE_DIR
+    mode = profiling_config.get("mode", "cprofile") if profiling_config.get("enabled") else None
+    stages = profiling_config.get("stages")
+
+    setting = environ.get(PROFILE_ENV_VAR, "").strip()
+    if setting:
+        mode, _, stage_list = setting.partition(":")
+        mode = None if mode == "off" else mode
+        stages = [stage.strip() for stage in stage_list.split(",") if stage.strip()] or None
+
+    if not mode:
+        return None
+    profiler = StageProfiler(
+        mode,
+        stages=stages,
+        output_dir=os.path.join(PROJECT_ROOT, profiling_config.get("output_dir", default_dir)),  # Relative paths start at the project root
+        top=profiling_config.get("top", 25),
+        sample_interval=profiling_config.get("sample_interval", 0.005),
+    )
+    logger.info(f"Profiling stages {sorted(profiler.stages) if profiler.stages else 'all'} with {mode}.")
+    return profiler
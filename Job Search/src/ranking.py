@@ -0,0 +1,152 @@
+import numpy as np
+import faiss
+from array import array
+from collections import Counter
+from itertools import zip_longest
+
+# Keyword and vector ranking primitives shared by hybrid_search and the search shards.
+# This module must not load the embedding model: shard worker processes import it.
+
+MAX_TERM_FREQUENCY = 65535  # Term frequencies are stored as unsigned 16-bit integers
+
+class IncrementalBM25:
+    """
+    Okapi BM25 index that documents can be added to in batches.
+
+    Scores are the same as rank_bm25.BM25Okapi (k1, b and the epsilon floor for
+    negative IDF), but documents are kept as per-term postings in compact arrays
+    (document position, term frequency) instead of one dict per document: about
+    6 bytes per distinct term of a document. IDF and document length normalization
+    are recomputed on the first query after documents were added.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, epsilon=0.25):
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.doc_len = array("I")
+        self.total_tokens = 0
+        self.postings = {}  # term -> (array of document positions, array of term frequencies)
+        self._idf = None
+        self._norm = None
+
+    @property
+    def corpus_size(self):
+        return len(self.doc_len)
+
+    def add_documents(self, documents):
+        """Adds tokenized documents; their positions continue after the documents already added."""
+        for document in documents:
+            position = len(self.doc_len)
+            self.doc_len.append(len(document))
+            self.total_tokens += len(document)
+            for term, count in Counter(document).items():
+                entry = self.postings.get(term)
+                if entry is None:
+                    entry = self.postings[term] = (array("I"), array("H"))
+                entry[0].append(position)
+                entry[1].append(min(count, MAX_TERM_FREQUENCY))
+        self._idf = None
+        return self
+
+    def _statistics(self):
+        if self._idf is None:
+            terms = list(self.postings)
+            document_frequency = np.array([len(self.postings[term][0]) for term in terms], dtype=np.float64)
+            idf = np.log(self.corpus_size - document_frequency + 0.5) - np.log(document_frequency + 0.5)
+            if len(idf):
+                idf[idf < 0] = self.epsilon * idf.mean()  # Terms in more than half of the documents
+            self._idf = dict(zip(terms, idf.tolist()))
+            average_length = self.total_tokens / self.corpus_size if self.corpus_size else 0
+            doc_len = np.asarray(self.doc_len, dtype=np.float64)
+            self._norm = self.k1 * (1 - self.b + self.b * doc_len / (average_length or 1))
+        return self._idf, self._norm
+
+    def get_scores(self, query):
+        """BM25 scores of every document for a tokenized query."""
+        idf, norm = self._statistics()
+        scores = np.zeros(self.corpus_size)
+        for term in query:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            positions = np.asarray(entry[0])
+            frequencies = np.asarray(entry[1], dtype=np.float64)
+            scores[positions] += idf[term] * (frequencies * (self.k1 + 1) / (frequencies + norm[positions]))
+        return scores
+
+    def get_batch_scores(self, query, doc_ids):
+        """
+        BM25 scores of the documents at positions doc_ids.
+
+        Only those documents are scored: each query term's postings (sorted by position)
+        are binary-searched for doc_ids instead of scoring the whole corpus.
+        """
+        idf, norm = self._statistics()
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        scores = np.zeros(len(doc_ids))
+        for term in query:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            positions = np.asarray(entry[0])
+            found = np.minimum(np.searchsorted(positions, doc_ids), len(positions) - 1)
+            matches = positions[found] == doc_ids
+            frequencies = np.asarray(entry[1], dtype=np.float64)[found[matches]]
+            scores[matches] += idf[term] * (frequencies * (self.k1 + 1) / (frequencies + norm[doc_ids[matches]]))
+        return scores.tolist()
+
+def bm25_tokens(job):
+    """Tokens of a job that are indexed for keyword search."""
+    return job["description"].split()
+
+def build_bm25(jobs):
+    """Builds the BM25 keyword index over job descriptions used by hybrid_search."""
+    return IncrementalBM25().add_documents(bm25_tokens(job) for job in jobs)
+
+def keyword_candidates(bm25, query, top_k, allowed_ids=None):
+    """
+    Ranks documents by BM25 score.
+
+    Args:
+        allowed_ids (np.ndarray, optional): Only these positions are scored (filter results).
+
+    Returns:
+        tuple: (positions, scores) of the top_k documents, best first.
+    """
+    tokenized_query = query.split()
+    if allowed_ids is None:
+        scores = np.asarray(bm25.get_scores(tokenized_query))
+        order = np.argsort(scores)[::-1][:top_k]
+        return order, scores[order]
+    # Only score the documents that passed the filters
+    scores = np.asarray(bm25.get_batch_scores(tokenized_query, allowed_ids.tolist()))
+    order = np.argsort(scores)[::-1][:top_k]
+    return allowed_ids[order], scores[order]
+
+def vector_candidates(index, query_embedding, top_k, allowed_ids=None):
+    """
+    Ranks vectors by L2 distance to the query embedding.
+
+    Returns:
+        tuple: (positions, distances) of the nearest vectors, nearest first.
+    """
+    query_vector = np.asarray([query_embedding], dtype=np.float32)
+    if allowed_ids is None:
+        distances, positions = index.search(query_vector, top_k)
+    else:
+        # Restrict the search to allowed IDs instead of over-fetching and discarding
+        params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(allowed_ids))
+        distances, positions = index.search(query_vector, min(top_k, len(allowed_ids)), params=params)
+    valid = positions[0] >= 0  # FAISS pads with -1 when there are fewer than top_k vectors
+    return positions[0][valid], distances[0][valid]
+
+def interleave(*rankings):
+    """Merges rankings round-robin, so the best hits of each come first, dropping repeats."""
+    merged, seen = [], set()
+    for group in zip_longest(*rankings):
+        for item in group:
+            if item is not None and item not in seen:
+                seen.add(item)
+                merged.append(item)
+    return merged
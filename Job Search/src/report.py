@@ -0,0 +1,248 @@
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from fpdf import FPDF
+from fpdf.ttfonts import TTFontFile
+
+logger = logging.getLogger(__name__)
+
+# Unicode TrueType fonts tried in order when no font_path is configured
+DEFAULT_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+)
+
+# Table layout (A4 portrait, millimetres)
+COLUMNS = (("Title", 70), ("Company", 50), ("Location", 40), ("Link", 30))
+ROW_HEIGHT = 6
+DESCRIPTION_HEIGHT = 4.5
+DESCRIPTION_CHARS = 280
+
+class _GlyphSubset(list):
+    """
+    Glyph subset list for FPDF Unicode fonts that skips repeated code points.
+
+    FPDF appends every rendered character to the font subset and later checks
+    membership for each code point of the font, which is quadratic for large
+    reports. Deduplicating and answering membership from a set keeps it linear.
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self._seen = set()
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        if item not in self._seen:
+            self._seen.add(item)
+            super().append(item)
+
+    def __contains__(self, item):
+        return item in self._seen
+
+# Parsed TTF metrics by font path, shared by every generator in the process
+_font_metrics = {}
+
+def load_font_metrics(font_path):
+    """
+    Parses a TrueType font's metrics once per process.
+
+    FPDF.add_font parses the whole font for every document unless its pickle cache
+    is enabled, which is a process-wide fpdf setting and writes files next to the
+    font or into a shared directory. Keeping the metrics in memory avoids both.
+    """
+    if font_path not in _font_metrics:
+        ttf = TTFontFile()
+        ttf.getMetrics(font_path)
+        _font_metrics[font_path] = {
+            "name": re.sub("[ ()]", "", ttf.fullName),
+            "desc": {
+                "Ascent": int(round(ttf.ascent, 0)),
+                "Descent": int(round(ttf.descent, 0)),
+                "CapHeight": int(round(ttf.capHeight, 0)),
+                "Flags": ttf.flags,
+                "FontBBox": "[%s %s %s %s]" % tuple(int(round(value, 0)) for value in ttf.bbox[:4]),
+                "ItalicAngle": int(ttf.italicAngle),
+                "StemV": int(round(ttf.stemV, 0)),
+                "MissingWidth": int(round(ttf.defaultWidth, 0)),
+            },
+            "up": round(ttf.underlinePosition),
+            "ut": round(ttf.underlineThickness),
+            "cw": ttf.charWidths,
+            "originalsize": os.stat(font_path).st_size,
+        }
+    return _font_metrics[font_path]
+
+def find_unicode_font(font_path=None):
+    """Returns the first available Unicode TTF font, or None to fall back to the core Arial font."""
+    for path in ((font_path,) if font_path else DEFAULT_FONT_PATHS):
+        if path and os.path.exists(path):
+            return path
+    return None
+
+class ReportGenerator:
+    """
+    Renders job reports as PDF tables.
+
+    The font and layout are resolved once per generator and reused for every
+    document it produces. With a Unicode TTF font, descriptions in any script
+    render as-is; without one, characters outside Latin-1 are replaced instead
+    of crashing the report.
+    """
+
+    def __init__(self, font_path=None):
+        self.font_path = find_unicode_font(font_path)
+        if self.font_path:
+            self.family = "ReportSans"
+            # Glyph widths by code point; characters the font lacks are replaced before rendering
+            self._char_widths = load_font_metrics(self.font_path)["cw"]
+        else:
+            logger.warning("No Unicode TTF font found; non Latin-1 characters will be replaced in reports.")
+            self.family = "Arial"
+        self._widths = [width for name, width in COLUMNS]
+
+    def text(self, value):
+        """Makes a value safe to render with the selected font."""
+        value = " ".join(str(value or "").split())
+        if self.font_path:
+            widths = self._char_widths
+            return "".join(
+                char if ord(char) < len(widths) and widths[ord(char)] else "?" for char in value
+            )
+        return value.encode("latin-1", "replace").decode("latin-1")
+
+    def _new_document(self, title):
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        if self.font_path:
+            self._add_font(pdf)
+        pdf.set_title(self.text(title))
+        pdf.alias_nb_pages()
+        pdf.add_page()
+        pdf.set_font(self.family, size=16)
+        pdf.cell(0, 10, txt=self.text(title), ln=1)
+        return pdf
+
+    def _add_font(self, pdf):
+        """Registers the Unicode font the way FPDF.add_font(..., uni=True) does, from the parsed metrics."""
+        metrics = load_font_metrics(self.font_path)
+        key = self.family.lower()
+        pdf.fonts[key] = {
+            "i": len(pdf.fonts) + 1, "type": "TTF", "name": metrics["name"], "desc": metrics["desc"],
+            "up": metrics["up"], "ut": metrics["ut"], "cw": metrics["cw"], "ttffile": self.font_path, "fontkey": key,
+            "subset": _GlyphSubset(range(57)),  # Digits are always included, as FPDF does with page aliases
+            "unifilename": None,  # No on-disk metrics cache
+        }
+        pdf.font_files[key] = {"length1": metrics["originalsize"], "type": "TTF", "ttffile": self.font_path}
+        pdf.font_files[self.font_path] = {"type": "TTF"}
+
+    def _fit(self, pdf, value, width):
+        """Truncates a cell value to the column width."""
+        value = self.text(value)
+        if pdf.get_string_width(value) <= width - 2:
+            return value
+        while value and pdf.get_string_width(value + "...") > width - 2:
+            value = value[:-1]
+        return value + "..."
+
+    def _table_header(self, pdf):
+        pdf.set_font(self.family, size=10)
+        pdf.set_fill_color(230, 230, 230)
+        for (name, width) in COLUMNS:
+            pdf.cell(width, ROW_HEIGHT + 1, txt=name, border=1, fill=True)
+        pdf.ln()
+
+    def render(self, jobs, path, title="Job Search Results", summary=None):
+        """
+        Writes a report with an optional summary (e.g. the LLM response) and a table of jobs.
+
+        Returns:
+            int: Number of pages written.
+        """
+        pdf = self._new_document(title)
+        if summary:
+            pdf.set_font(self.family, size=11)
+            for line in str(summary).splitlines():
+                pdf.multi_cell(0, 6, txt=self.text(line) or " ")
+            pdf.ln(4)
+
+        self._table_header(pdf)
+        for job in jobs:
+            if pdf.get_y() + ROW_HEIGHT + 2 * DESCRIPTION_HEIGHT > pdf.page_break_trigger:
+                pdf.add_page()
+                self._table_header(pdf)
+            pdf.set_font(self.family, size=9)
+            link = job.get("link", "")
+            for (name, width), value in zip(COLUMNS, (job.get("title"), job.get("company"), job.get("location"), "Open")):
+                pdf.cell(width, ROW_HEIGHT, txt=self._fit(pdf, value, width), border="LTR",
+                         link=link if name == "Link" and link.startswith("http") else "")
+            pdf.ln()
+            description = self.text(job.get("description"))
+            if len(description) > DESCRIPTION_CHARS:
+                description = description[:DESCRIPTION_CHARS].rsplit(" ", 1)[0] + "..."
+            pdf.set_font(self.family, size=7)
+            pdf.multi_cell(sum(self._widths), DESCRIPTION_HEIGHT, txt=description or " ", border="LRB")
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pdf.output(path)
+        return pdf.page_no()
+
+# Per-process generator so that worker processes set up fonts and layout only once
+_worker_generator = None
+
+def _init_worker(font_path):
+    global _worker_generator
+    _worker_generator = ReportGenerator(font_path)
+
+def _render_in_worker(report):
+    try:
+        pages = _worker_generator.render(
+            report["jobs"], report["path"], title=report.get("title", "Job Search Results"), summary=report.get("summary")
+        )
+        return report["path"], pages, None
+    except Exception as e:
+        return report["path"], None, repr(e)
+
+def create_report_pool(processes, font_path=None):
+    """Worker processes for generate_reports, each with its own ReportGenerator; reuse it across batches."""
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(font_path,))
+
+def generate_reports(reports, processes=None, font_path=None, pool=None):
+    """
+    Renders many reports (e.g. one per subscriber) in parallel worker processes.
+
+    Args:
+        reports (list): Dictionaries with "path", "jobs" and optional "title" and "summary".
+        processes (int, optional): Number of worker processes (defaults to the CPU count).
+        font_path (str, optional): Unicode TTF font to use.
+        pool (ProcessPoolExecutor, optional): Pool from create_report_pool to render in; a
+            temporary pool is started otherwise.
+
+    Returns:
+        dict: Mapping of report path -> number of pages. Reports that failed are logged and left out.
+    """
+    if not reports:
+        return {}
+    processes = min(processes or os.cpu_count() or 1, len(reports))
+    if pool is not None:
+        outcomes = list(pool.map(_render_in_worker, reports))
+    elif processes == 1:
+        if _worker_generator is None or _worker_generator.font_path != find_unicode_font(font_path):
+            _init_worker(font_path)
+        outcomes = [_render_in_worker(report) for report in reports]
+    else:
+        with create_report_pool(processes, font_path) as executor:
+            outcomes = list(executor.map(_render_in_worker, reports))
+
+    results = {}
+    for path, pages, error in outcomes:
+        if error is None:
+            results[path] = pages
+        else:
+            logger.error(f"Failed to generate report {path}: {error}")
+    logger.info(f"Generated {len(results)} reports with {sum(results.values())} pages.")
+    return results
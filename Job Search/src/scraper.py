@@ -1,25 +1,31 @@
+import logging
 import requests
 from bs4 import BeautifulSoup
 import yaml
 import os
 import json
+import hashlib
+import time
 from urllib.parse import urljoin
+from metrics import metrics
 
 # Determine the absolute path to the project root directory
 SRC_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SRC_DIR)
 CONFIG_FILE_PATH = os.path.join(PROJECT_ROOT, "config", "config.yaml")
 
+logger = logging.getLogger(__name__)
+
 def load_config():
     """Load configuration from the YAML file."""
     if not os.path.exists(CONFIG_FILE_PATH):
-        print(f"Error: Configuration file not found at {CONFIG_FILE_PATH}")
+        logger.error(f"Configuration file not found at {CONFIG_FILE_PATH}")
         return None
     try:
         with open(CONFIG_FILE_PATH, "r") as file:
             return yaml.safe_load(file)
     except yaml.YAMLError as e:
-        print(f"Error parsing YAML configuration: {e}")
+        logger.error(f"Error parsing YAML configuration: {e}")
         return None
 
 def save_jobs_to_file(jobs, output_file):
@@ -27,18 +33,31 @@ def save_jobs_to_file(jobs, output_file):
     try:
         with open(output_file, "w") as file:
             json.dump(jobs, file, indent=4)
-        print(f"Saved {len(jobs)} jobs to {output_file}")
+        logger.info(f"Saved {len(jobs)} jobs to {output_file}")
     except Exception as e:
-        print(f"Error saving jobs to {output_file}: {e}")
+        logger.error(f"Error saving jobs to {output_file}: {e}")
+
+def make_job_id(job):
+    """Creates a stable posting ID from the job link (or title/company/location if there is no link)."""
+    link = (job.get("link") or "").strip()
+    if link and link != "#":
+        key = link
+    else:
+        key = "|".join((job.get(field) or "").strip().lower() for field in ("title", "company", "location"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
 
 def scrape_job_board(url, params):
     """Scrape job postings from a single job board."""
+    start = time.perf_counter()
     try:
         response = requests.get(url, params=params, timeout=10)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
-        print(f"Failed to fetch data from {url}: {e}")
+        metrics.inc("scrape_errors_total", board=url)
+        logger.error(f"Failed to fetch data from {url}: {e}")
         return []
+    metrics.observe("scrape_fetch_seconds", time.perf_counter() - start, board=url)
+    metrics.inc("scrape_bytes_total", len(response.content or b""), board=url)
 
     soup = BeautifulSoup(response.text, 'html.parser')
     jobs = []
@@ -46,7 +65,7 @@ def scrape_job_board(url, params):
     # Example selectors (adjust based on the actual HTML structure of the job board)
     job_elements = soup.find_all("div", class_="job-card")
     if not job_elements:
-        print(f"No job elements found on {url} with the selector 'div.job-card'.")
+        logger.warning(f"No job elements found on {url} with the selector 'div.job-card'.")
         return []
 
     for job_element in job_elements:
@@ -78,38 +97,71 @@ def scrape_job_board(url, params):
             link = urljoin(url, link)
 
         # Append job details
-        jobs.append({
+        job = {
             "title": title,
             "company": company,
             "location": location,
             "description": description,
             "skills": skills,
             "link": link
-        })
+        }
+        job["id"] = make_job_id(job)
+        jobs.append(job)
 
+    metrics.inc("scrape_jobs_total", len(jobs), board=url)
     return jobs
 
-def scrape_jobs():
-    """Scrape jobs from all configured job boards and save them to a file."""
+def scrape_jobs(scheduler=None, liveness=None):
+    """
+    Scrape jobs from all configured job boards and save them to a file.
+
+    Args:
+        scheduler (CrawlScheduler, optional): Only crawls the boards that are due; the others
+            (and boards whose crawl returns nothing) contribute the jobs of their last crawl.
+        liveness (LivenessChecker, optional): Jobs whose links were found dead are left out
+            (boards keep listing expired postings for a while).
+    """
     config = load_config()
     all_jobs = []
     if not config or 'scraping' not in config or not isinstance(config.get('scraping', {}).get('job_boards'), list):
-        print("Error: Scraping configuration is missing, malformed, or 'job_boards' is not a list.")
+        logger.error("Scraping configuration is missing, malformed, or 'job_boards' is not a list.")
         return []
 
+    boards = []
     for board in config["scraping"]["job_boards"]:
-        url = board.get("url")
-        params = board.get("query_params")
-        if not url:
-            print(f"Warning: Missing URL for a job board in config. Skipping entry: {board}")
+        if not board.get("url"):
+            logger.warning(f"Missing URL for a job board in config. Skipping entry: {board}")
             continue
-        print(f"Scraping {url} with params: {params}")  # Added for verbosity
+        boards.append(board)
+    if scheduler is not None:
+        boards, skipped = scheduler.select(boards)
+        for board in skipped:
+            cached = scheduler.cached_jobs(board)
+            logger.info(f"Skipping {board['url']} (not due); reusing {len(cached)} jobs from its last crawl.")
+            all_jobs.extend(cached)
+
+    for board in boards:
+        url = board["url"]
+        params = board.get("query_params")
+        logger.info(f"Scraping {url} with params: {params}")
+        start = time.perf_counter()
         jobs_from_board = scrape_job_board(url, params if params else {})
+        if scheduler is not None:
+            scheduler.record(board, jobs_from_board, time.perf_counter() - start)
+            if not jobs_from_board:
+                jobs_from_board = scheduler.cached_jobs(board)
         if jobs_from_board:
-            print(f"Found {len(jobs_from_board)} jobs from {url}")
+            logger.info(f"Found {len(jobs_from_board)} jobs from {url}")
             all_jobs.extend(jobs_from_board)
         else:
-            print(f"No jobs found or error scraping {url}")
+            logger.warning(f"No jobs found or error scraping {url}")
+    if scheduler is not None:
+        scheduler.save()
+    if liveness is not None:
+        live_jobs = liveness.drop_expired(all_jobs)
+        if len(live_jobs) != len(all_jobs):
+            logger.info(f"Dropped {len(all_jobs) - len(live_jobs)} expired jobs.")
+        all_jobs = live_jobs
 
     # Save all scraped jobs to a JSON file
     output_file = os.path.join(PROJECT_ROOT, "output", "scraped_jobs.json")
@@ -0,0 +1,392 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from scraper import load_config, make_job_id, scrape_jobs
+from processor import clean_data, generate_embeddings, build_faiss_index
+from analyzer import hybrid_search
+from ranking import build_bm25
+from metadata_index import MetadataIndex
+from percolator import create_percolator, format_alert
+from outbox import Dispatcher, create_outbox
+from liveness import create_liveness_checker, expire_jobs
+from crawl_scheduler import create_crawl_scheduler, crawl_cache_dir
+from sharding import create_sharded_search
+from metrics import metrics
+from logger import setup_logger
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+SCRAPED_JOBS_FILE = os.path.join(PROJECT_ROOT, "output", "scraped_jobs.json")
+ALERT_SUBJECT = "New jobs for your saved search"
+
+class IndexSnapshot:
+    """
+    Immutable search state: jobs with their embeddings, FAISS, BM25 and metadata indexes.
+
+    Snapshots are never modified after they are built. Ingestion builds a new one and
+    swaps the service's reference, so a query always sees one consistent snapshot and
+    never waits for ingestion. With local_indexes=False (the shard workers hold the
+    indexes) only the jobs and embeddings are kept.
+    """
+
+    def __init__(self, jobs, embeddings, version, local_indexes=True):
+        self.jobs = jobs
+        self.embeddings = embeddings
+        self.version = version
+        self.built_at = time.time()
+        self.ids = [job.get("id") or make_job_id(job) for job in jobs]
+        self.rows = {job_id: row for row, job_id in enumerate(self.ids)}
+        self.index = build_faiss_index(embeddings) if jobs and local_indexes else None
+        self.bm25 = build_bm25(jobs) if jobs and local_indexes else None
+        self.metadata_index = MetadataIndex(jobs) if local_indexes else None
+
+def build_snapshot(jobs, previous=None, version=1, local_indexes=True):
+    """
+    Builds a snapshot, re-encoding only jobs that are new or changed since `previous`.
+
+    Returns:
+        IndexSnapshot: The new snapshot.
+    """
+    ids = [job.get("id") or make_job_id(job) for job in jobs]
+    reused, new = [], []
+    for row, (job, job_id) in enumerate(zip(jobs, ids)):
+        old_row = previous.rows.get(job_id) if previous else None
+        if old_row is not None and previous.jobs[old_row].get("description") == job.get("description"):
+            reused.append((row, old_row))
+        else:
+            new.append(row)
+
+    if not jobs:
+        return IndexSnapshot([], None, version, local_indexes)
+    new_embeddings = np.asarray(generate_embeddings([jobs[row] for row in new]), dtype=np.float32) if new else None
+    dimension = new_embeddings.shape[1] if new else previous.embeddings.shape[1]
+    embeddings = np.empty((len(jobs), dimension), dtype=np.float32)
+    if reused:
+        embeddings[[row for row, _ in reused]] = previous.embeddings[[old_row for _, old_row in reused]]
+    if new:
+        embeddings[new] = new_embeddings
+    logger.info(f"Built snapshot v{version}: {len(jobs)} jobs, {len(new)} encoded, {len(reused)} reused.")
+    return IndexSnapshot(jobs, embeddings, version, local_indexes)
+
+class JobSearchService:
+    """
+    Keeps the embedding model and the search indexes resident and answers queries.
+
+    Writers (ingestion, scheduled scrapes) are serialized by a lock and publish a new
+    IndexSnapshot by replacing a single reference; readers take no lock at all.
+
+    With a percolator, jobs that are new in an ingested batch are matched against the
+    saved subscriber queries and the matches are passed to on_alerts({query ID: jobs}).
+    With a liveness checker, jobs whose links were found dead are not ingested again.
+    With shards (a ShardedSearch), queries fan out to the shard workers; each ingest
+    sends only the new, changed and removed jobs to the shards that own them.
+    """
+
+    def __init__(self, config, percolator=None, on_alerts=None, liveness=None, shards=None):
+        self.config = config
+        service_config = config.get("service", {}) or {}
+        self.scrape_interval = service_config.get("scrape_interval", 3600)
+        self.max_top_k = service_config.get("max_top_k", 50)
+        self.percolator = percolator
+        self.on_alerts = on_alerts
+        self.liveness = liveness
+        self.shards = shards
+        self.crawl_scheduler = create_crawl_scheduler(config)
+        self._snapshot = IndexSnapshot([], None, version=0)
+        self._ingest_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._scheduler = None
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def ingest(self, jobs):
+        """Cleans jobs, builds a new snapshot from them and swaps it in."""
+        with self._ingest_lock:
+            cleaned = clean_data(jobs)
+            if self.liveness is not None:
+                cleaned = self.liveness.drop_expired(cleaned)
+            start = time.perf_counter()
+            previous = self._snapshot
+            snapshot = build_snapshot(cleaned, previous=previous, version=previous.version + 1,
+                                      local_indexes=self.shards is None)
+            self._sync_shards(previous, snapshot)
+            self._snapshot = snapshot  # Atomic reference swap; queries in flight keep the old snapshot
+        metrics.observe("service_snapshot_build_seconds", time.perf_counter() - start)
+        metrics.set_gauge("service_snapshot_jobs", len(snapshot.jobs))
+        metrics.set_gauge("service_snapshot_version", snapshot.version)
+        if self.percolator is not None and previous.version > 0:  # The first load is the backlog, not news
+            self._percolate(previous, snapshot)
+        return snapshot
+
+    def expire(self, job_ids):
+        """Publishes a snapshot without the given jobs (embeddings are reused, nothing is re-encoded)."""
+        expired = set(job_ids)
+        with self._ingest_lock:
+            previous = self._snapshot
+            kept = [job for job, job_id in zip(previous.jobs, previous.ids) if job_id not in expired]
+            if len(kept) == len(previous.jobs):
+                return previous
+            snapshot = build_snapshot(kept, previous=previous, version=previous.version + 1,
+                                      local_indexes=self.shards is None)
+            self._sync_shards(previous, snapshot)
+            self._snapshot = snapshot
+        metrics.set_gauge("service_snapshot_jobs", len(snapshot.jobs))
+        metrics.set_gauge("service_snapshot_version", snapshot.version)
+        logger.info(f"Expired {len(previous.jobs) - len(kept)} jobs from the served snapshot.")
+        return snapshot
+
+    def _sync_shards(self, previous, snapshot):
+        """Applies the difference between two snapshots to the shards (embeddings are reused)."""
+        if self.shards is None:
+            return
+        removed = [job_id for job_id in previous.ids if job_id not in snapshot.rows]
+        changed = [row for row, job_id in enumerate(snapshot.ids)
+                   if job_id not in previous.rows or previous.jobs[previous.rows[job_id]] != snapshot.jobs[row]]
+        if removed:
+            self.shards.remove_jobs(removed)
+        if changed:
+            self.shards.add_jobs([snapshot.jobs[row] for row in changed], snapshot.embeddings[changed])
+
+    def _percolate(self, previous, snapshot):
+        """Matches the jobs that are new in `snapshot` against the saved queries."""
+        new_rows = [row for row, job_id in enumerate(snapshot.ids) if job_id not in previous.rows]
+        if not new_rows:
+            return {}
+        start = time.perf_counter()
+        alerts = self.percolator.match([snapshot.jobs[row] for row in new_rows], snapshot.embeddings[new_rows])
+        metrics.observe("service_percolate_seconds", time.perf_counter() - start)
+        metrics.inc("service_alerts_total", len(alerts))
+        if alerts and self.on_alerts is not None:
+            self.on_alerts(alerts)
+        return alerts
+
+    def load_saved_jobs(self, path=SCRAPED_JOBS_FILE):
+        """Ingests the jobs saved by the last scrape, if any, so the service can answer right away."""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as file:
+            jobs = json.load(file)
+        logger.info(f"Loaded {len(jobs)} saved jobs from {path}.")
+        return self.ingest(jobs)
+
+    def refresh(self):
+        """Scrapes the configured job boards and ingests the result (one scrape at a time)."""
+        if not self._refresh_lock.acquire(blocking=False):
+            logger.info("A scrape is already running.")
+            return None
+        try:
+            jobs = scrape_jobs(scheduler=self.crawl_scheduler)
+            if self.crawl_scheduler is not None:
+                metrics.set_info("crawl_schedule", self.crawl_scheduler.report())
+            if not jobs:
+                logger.warning("Scrape returned no jobs; keeping the current snapshot.")
+                return None
+            return self.ingest(jobs)
+        finally:
+            self._refresh_lock.release()
+
+    def search(self, query, top_k=5, filters=None):
+        """
+        Runs hybrid_search against the current snapshot (or the shards).
+
+        Returns:
+            tuple: (snapshot used, list of matching jobs in ranking order).
+        """
+        snapshot = self._snapshot  # One consistent view for the whole query
+        if not snapshot.jobs:
+            return snapshot, []
+        top_k = max(1, min(int(top_k), self.max_top_k))
+        results = hybrid_search(query, snapshot.jobs, snapshot.index, top_k=top_k, filters=filters,
+                                metadata_index=snapshot.metadata_index, bm25=snapshot.bm25, shards=self.shards)
+        return snapshot, results
+
+    def _run_scheduler(self, scrape_first):
+        if scrape_first and not self._stop_event.is_set():
+            self._safe_refresh()
+        while not self._stop_event.wait(self.scrape_interval):
+            self._safe_refresh()
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"Background scrape failed: {e}", exc_info=True)
+
+    def start_scheduler(self, scrape_first=False):
+        """Starts scraping every scrape_interval seconds in a background thread."""
+        self._scheduler = threading.Thread(target=self._run_scheduler, args=(scrape_first,), name="scrape-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def trigger_refresh(self):
+        """Starts a scrape in the background unless one is already running."""
+        if self._refresh_lock.locked():
+            return False
+        threading.Thread(target=self._safe_refresh, name="scrape-now", daemon=True).start()
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        if self._scheduler is not None:
+            self._scheduler.join(timeout=5)
+
+def filters_from_params(params):
+    """Builds hybrid_search filters from query string parameters (repeat a parameter for several values)."""
+    filters = {}
+    for field in ("location", "company", "skills"):
+        values = [value.strip() for value in params.get(field, []) if value.strip()]
+        if values:
+            filters[field] = values
+    if "remote" in params:
+        filters["remote"] = params["remote"][0].lower() in ("1", "true", "yes")
+    return filters or None
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    JSON API:
+        GET  /search?q=...&top_k=5&location=...&remote=true&skills=a&skills=b
+        POST /search   {"query": "...", "top_k": 5, "filters": {...}, "include_description": false}
+        POST /refresh  Scrape now (in the background)
+        GET  /health   Snapshot version and size
+        GET  /metrics  Prometheus metrics
+    """
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _search(self, query, top_k, filters, include_description):
+        if not query or not isinstance(query, str):
+            self._send_json(400, {"error": "A non-empty query string is required."})
+            return
+        if filters is not None and not isinstance(filters, dict):
+            self._send_json(400, {"error": "filters must be a JSON object."})
+            return
+        start = time.perf_counter()
+        try:
+            snapshot, results = self.server.service.search(query, top_k=top_k, filters=filters)
+        except (ValueError, TypeError) as e:  # Unknown filter fields, malformed top_k
+            self._send_json(400, {"error": str(e)})
+            return
+        took = time.perf_counter() - start
+        metrics.observe("service_request_seconds", took, endpoint="search")
+        if not include_description:
+            results = [{key: value for key, value in job.items() if key != "description"} for job in results]
+        self._send_json(200, {"query": query, "version": snapshot.version, "took_ms": round(took * 1000, 3), "results": results})
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        service = self.server.service
+        if parsed.path == "/search":
+            self._search(params.get("q", [""])[0], params.get("top_k", ["5"])[0], filters_from_params(params),
+                         params.get("include_description", ["false"])[0].lower() == "true")
+        elif parsed.path == "/health":
+            snapshot = service.snapshot
+            self._send_json(200, {"status": "ok", "version": snapshot.version, "jobs": len(snapshot.jobs), "built_at": snapshot.built_at})
+        elif parsed.path == "/metrics":
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": f"Unknown path {parsed.path}"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == "/refresh":
+            started = self.server.service.trigger_refresh()
+            self._send_json(202 if started else 409, {"started": started})
+            return
+        if path != "/search":
+            self._send_json(404, {"error": f"Unknown path {path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        if not isinstance(request, dict):
+            self._send_json(400, {"error": "The request body must be a JSON object."})
+            return
+        self._search(request.get("query"), request.get("top_k", 5), request.get("filters"),
+                     bool(request.get("include_description", False)))
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+def make_server(service, host="127.0.0.1", port=8000):
+    """Creates the threaded HTTP server answering queries for `service`."""
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve job search queries from a resident model and index.")
+    parser.add_argument("--host", help="Overrides service.host from the configuration.")
+    parser.add_argument("--port", type=int, help="Overrides service.port from the configuration.")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    if config is None:
+        return
+    setup_logger(config)
+    service_config = config.get("service", {}) or {}
+    percolator = create_percolator(config)
+    on_alerts, dispatcher = None, None
+    if percolator is not None:
+        outbox = create_outbox(config)
+        dispatcher = Dispatcher(outbox, config, poll_interval=config.get("outbox", {}).get("poll_interval", 5))
+        dispatcher.start(until_empty=False)
+
+        def on_alerts(alerts):
+            for query_id, jobs in alerts.items():
+                saved = percolator.queries[query_id]
+                outbox.enqueue([saved["email"]], format_alert(saved["query"], jobs), subject=ALERT_SUBJECT)
+
+    liveness = create_liveness_checker(config)
+    shards = create_sharded_search(config)
+    service = JobSearchService(config, percolator=percolator, on_alerts=on_alerts, liveness=liveness, shards=shards)
+    loaded = service.load_saved_jobs()
+    service.start_scheduler(scrape_first=loaded is None)  # Scrape right away when there is nothing to serve yet
+    if liveness is not None:
+        liveness.start(lambda: service.snapshot.jobs,
+                       lambda dead: expire_jobs(dead, service=service, crawl_cache_dir=crawl_cache_dir(config)),
+                       interval=config["liveness"].get("interval", 3600))
+    server = make_server(service, args.host or service_config.get("host", "127.0.0.1"), args.port or service_config.get("port", 8000))
+    logger.info(f"Serving job search on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+        if liveness is not None:
+            liveness.stop()
+        if shards is not None:
+            shards.close()
+        if dispatcher is not None:
+            dispatcher.stop(timeout=30)
+
+if __name__ == "__main__":
+    main()
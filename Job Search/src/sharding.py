@@ -0,0 +1,312 @@
+import argparse
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+import faiss
+from metadata_index import MetadataIndex
+from ranking import build_bm25, keyword_candidates, vector_candidates, interleave
+
+logger = logging.getLogger(__name__)
+
+# Shard workers never load the embedding model: the coordinator encodes documents and
+# queries once and sends vectors, so this module must not import processor or analyzer.
+
+def job_key(job):
+    """Stable identifier used for shard routing (the scraper's job ID when present)."""
+    if job.get("id"):
+        return job["id"]
+    from scraper import make_job_id
+    return make_job_id(job)
+
+def shard_for(job_id, num_shards):
+    """Stable shard assignment: the same job ID always maps to the same shard."""
+    return int(hashlib.sha1(job_id.encode("utf-8")).hexdigest()[:8], 16) % num_shards
+
+class ShardIndex:
+    """
+    Jobs of one shard with their FAISS, BM25 and metadata indexes.
+
+    Position i in the FAISS index is jobs[i]; removing jobs compacts both.
+    """
+
+    def __init__(self):
+        self.jobs = []
+        self.index = None
+        self._rows = {}
+        self._bm25 = None
+        self._metadata_index = None
+
+    def _rebuild_keyword_indexes(self):
+        # BM25 statistics and metadata postings cover the whole shard; rebuild them lazily on the next query
+        self._rows = {job_key(job): row for row, job in enumerate(self.jobs)}
+        self._bm25 = None
+        self._metadata_index = None
+
+    def add(self, jobs, embeddings):
+        """Adds jobs (replacing jobs with the same ID, including earlier ones in `jobs`) and their embeddings."""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        last_rows = {job_key(job): row for row, job in enumerate(jobs)}
+        if len(last_rows) < len(jobs):  # Duplicate IDs in the batch: the last one wins
+            rows = sorted(last_rows.values())
+            jobs, embeddings = [jobs[row] for row in rows], embeddings[rows]
+        replaced = [job_id for job_id in last_rows if job_id in self._rows]
+        if replaced:
+            self.remove(replaced)
+        if self.index is None:
+            self.index = faiss.IndexFlatL2(embeddings.shape[1])
+        self.index.add(embeddings)
+        self.jobs.extend(jobs)
+        self._rebuild_keyword_indexes()
+        return len(self.jobs)
+
+    def remove(self, job_ids):
+        """Removes jobs by ID and returns how many were removed."""
+        rows = sorted(self._rows[job_id] for job_id in job_ids if job_id in self._rows)
+        if not rows:
+            return 0
+        self.index.remove_ids(faiss.IDSelectorBatch(np.asarray(rows, dtype=np.int64)))
+        removed = set(rows)
+        self.jobs = [job for row, job in enumerate(self.jobs) if row not in removed]
+        self._rebuild_keyword_indexes()
+        return len(rows)
+
+    def search(self, query, query_embedding, top_k, filters=None):
+        """
+        Returns the shard's keyword and vector candidates.
+
+        Returns:
+            dict: {"keyword": [(bm25 score, job)], "vector": [(L2 distance, job)]}, best first.
+        """
+        if not self.jobs:
+            return {"keyword": [], "vector": []}
+        allowed_ids = None
+        if filters:
+            if self._metadata_index is None:
+                self._metadata_index = MetadataIndex(self.jobs)
+            allowed_ids = self._metadata_index.allowed_ids(filters)
+            if len(allowed_ids) == 0:
+                return {"keyword": [], "vector": []}
+        if self._bm25 is None:
+            self._bm25 = build_bm25(self.jobs)
+        keyword_rows, scores = keyword_candidates(self._bm25, query, top_k, allowed_ids)
+        vector_rows, distances = vector_candidates(self.index, query_embedding, top_k, allowed_ids)
+        return {
+            "keyword": [(float(score), self.jobs[row]) for row, score in zip(keyword_rows, scores)],
+            "vector": [(float(distance), self.jobs[row]) for row, distance in zip(vector_rows, distances)],
+        }
+
+    def stats(self):
+        return {"jobs": len(self.jobs)}
+
+def serve_connection(connection, shard=None):
+    """
+    Answers requests from a coordinator until it sends "close" or disconnects.
+
+    Requests are (command, args) tuples; replies are ("ok", result) or ("error", message).
+    """
+    shard = shard or ShardIndex()
+    handlers = {"add": shard.add, "remove": shard.remove, "search": shard.search, "stats": shard.stats}
+    while True:
+        try:
+            command, args = connection.recv()
+        except (EOFError, OSError):
+            return shard
+        if command == "close":
+            connection.send(("ok", None))
+            return shard
+        try:
+            connection.send(("ok", handlers[command](*args)))
+        except Exception as e:  # Report to the coordinator instead of killing the worker
+            connection.send(("error", f"{type(e).__name__}: {e}"))
+
+def _worker_main(connection):
+    serve_connection(connection)
+    connection.close()
+
+def serve(host, port, authkey):
+    """Serves one shard over TCP for coordinators on other hosts (one connection at a time)."""
+    shard = ShardIndex()
+    with Listener((host, port), authkey=authkey) as listener:
+        logger.info(f"Shard listening on {host}:{listener.address[1]}")
+        while True:
+            with listener.accept() as connection:
+                shard = serve_connection(connection, shard)
+
+class ShardError(RuntimeError):
+    """A shard failed to execute a request."""
+
+class ShardedSearch:
+    """
+    Scatter-gather hybrid search over N shards.
+
+    Jobs are routed to a shard by a hash of their ID, so ingesting new jobs only touches
+    the shards that own them. A query is encoded once, sent to every shard in parallel,
+    and the per-shard keyword (BM25 score) and vector (L2 distance) candidates are merged
+    into global top-k rankings, which are interleaved like hybrid_search does.
+
+    BM25 scores use per-shard statistics, so keyword rankings across shards are an
+    approximation of a single-index BM25 ranking; vector distances are exact.
+    """
+
+    def __init__(self, connections, processes=(), encode_documents=None, encode_query=None):
+        self.connections = list(connections)
+        self.processes = list(processes)
+        self._encode_documents = encode_documents
+        self._encode_query = encode_query
+        self._lock = threading.Lock()  # One scatter-gather round at a time per connection set
+
+    @classmethod
+    def start_local(cls, num_shards, **kwargs):
+        """Starts num_shards worker processes on this machine."""
+        context = multiprocessing.get_context("spawn")  # Workers start clean, without the parent's model
+        connections, processes = [], []
+        for shard in range(num_shards):
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker_main, args=(child,), name=f"search-shard-{shard}", daemon=True)
+            process.start()
+            child.close()
+            connections.append(parent)
+            processes.append(process)
+        return cls(connections, processes, **kwargs)
+
+    @classmethod
+    def connect(cls, addresses, authkey, **kwargs):
+        """Connects to shards served with `python src/sharding.py --serve` on other hosts."""
+        return cls([Client(address, authkey=authkey) for address in addresses], **kwargs)
+
+    @property
+    def num_shards(self):
+        return len(self.connections)
+
+    def _request(self, requests):
+        """Sends {shard: (command, args)} to all shards first, then collects the replies."""
+        with self._lock:
+            for shard, request in requests.items():
+                self.connections[shard].send(request)
+            replies = {shard: self.connections[shard].recv() for shard in requests}
+        for shard, (status, result) in replies.items():
+            if status != "ok":
+                raise ShardError(f"Shard {shard}: {result}")
+        return {shard: result for shard, (_, result) in replies.items()}
+
+    def encode_documents(self, jobs):
+        if self._encode_documents is None:
+            from processor import generate_embeddings
+            self._encode_documents = generate_embeddings
+        return self._encode_documents(jobs)
+
+    def encode_query(self, query):
+        if self._encode_query is None:
+            from processor import embedding_model
+            self._encode_query = embedding_model.encode
+        return self._encode_query(query)
+
+    def add_jobs(self, jobs, embeddings=None):
+        """
+        Routes jobs to their shards; shards that receive no jobs are not contacted.
+
+        Returns:
+            dict: {shard: number of jobs on the shard} for the shards that were updated.
+        """
+        if not jobs:
+            return {}
+        embeddings = np.asarray(self.encode_documents(jobs) if embeddings is None else embeddings, dtype=np.float32)
+        routed = {}
+        for row, job in enumerate(jobs):
+            routed.setdefault(shard_for(job_key(job), self.num_shards), []).append(row)
+        result = self._request({
+            shard: ("add", ([jobs[row] for row in rows], embeddings[rows])) for shard, rows in routed.items()
+        })
+        logger.info(f"Added {len(jobs)} jobs to {len(routed)} of {self.num_shards} shards.")
+        return result
+
+    def remove_jobs(self, job_ids):
+        """Removes jobs by ID from the shards that own them; returns the number removed."""
+        routed = {}
+        for job_id in job_ids:
+            routed.setdefault(shard_for(job_id, self.num_shards), []).append(job_id)
+        return sum(self._request({shard: ("remove", (ids,)) for shard, ids in routed.items()}).values())
+
+    def search(self, query, top_k=5, filters=None):
+        """
+        Hybrid search across all shards.
+
+        Returns:
+            list: Jobs in ranking order (union of the global keyword and vector top-k).
+        """
+        query_embedding = np.asarray(self.encode_query(query), dtype=np.float32)
+        replies = self._request({shard: ("search", (query, query_embedding, top_k, filters)) for shard in range(self.num_shards)})
+        keyword = sorted((hit for reply in replies.values() for hit in reply["keyword"]), key=lambda hit: -hit[0])[:top_k]
+        vector = sorted((hit for reply in replies.values() for hit in reply["vector"]), key=lambda hit: hit[0])[:top_k]
+
+        jobs_by_key = {}
+        rankings = []
+        for hits in (keyword, vector):
+            ranking = []
+            for _, job in hits:
+                key = job_key(job)
+                jobs_by_key[key] = job
+                ranking.append(key)
+            rankings.append(ranking)
+        return [jobs_by_key[key] for key in interleave(*rankings)]
+
+    def stats(self):
+        """Returns the number of jobs per shard."""
+        return self._request({shard: ("stats", ()) for shard in range(self.num_shards)})
+
+    def close(self):
+        """Stops local workers and closes all connections."""
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+                connection.recv()
+            except (EOFError, OSError):
+                pass
+            connection.close()
+        for process in self.processes:
+            process.join(timeout=5)
+        self.connections, self.processes = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def create_sharded_search(config, **kwargs):
+    """
+    Starts or connects to the shards described by the sharding section of the configuration.
+
+    Returns:
+        ShardedSearch: Connected to sharding.addresses when given, otherwise num_shards local
+        workers; None when sharding is disabled.
+    """
+    sharding_config = config.get("sharding", {}) or {}
+    if not sharding_config.get("enabled", False):
+        return None
+    addresses = sharding_config.get("addresses") or []
+    if addresses:
+        authkey = os.environ.get("JOB_SEARCH_SHARD_AUTHKEY") or sharding_config.get("authkey")
+        if not authkey:
+            raise ValueError("sharding.authkey (or JOB_SEARCH_SHARD_AUTHKEY) is required for remote shards.")
+        parsed = []
+        for address in addresses:
+            host, _, port = address.rpartition(":")
+            parsed.append((host, int(port)))
+        return ShardedSearch.connect(parsed, authkey.encode("utf-8"), **kwargs)
+    return ShardedSearch.start_local(sharding_config.get("num_shards", 2), **kwargs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve one search shard for a remote coordinator.")
+    parser.add_argument("--serve", action="store_true", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--authkey", required=True, help="Shared secret; coordinators must use the same key.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.authkey.encode("utf-8"))
@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+from collections import Counter
+from metadata_index import normalize_value
+from scraper import make_job_id
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+SKILLS_INDEX_FILE = os.path.join(PROJECT_ROOT, "output", "skills_index.json")
+
+class SkillsIndex:
+    """
+    Inverted index mapping normalized skill -> posting IDs.
+
+    The index is built incrementally (add_jobs can be called with every newly
+    scraped batch) and answers skill queries and faceted counts without a pass
+    over the stored job dicts.
+    """
+
+    def __init__(self):
+        self.postings = {}     # skill -> set of posting IDs
+        self.labels = {}       # skill -> display label (first spelling seen)
+        self.by_location = {}  # location -> set of posting IDs
+        self.by_company = {}   # company -> set of posting IDs
+        self.job_facets = {}   # posting ID -> {"location", "company", "skills"}
+
+    def __len__(self):
+        return len(self.job_facets)
+
+    def add_job(self, job):
+        """Adds (or re-indexes) a single job and returns its posting ID."""
+        job_id = job.get("id") or make_job_id(job)
+        if job_id in self.job_facets:
+            self.remove_job(job_id)
+
+        skills = []
+        for skill in job.get("skills") or []:
+            key = normalize_value(skill)
+            if key and key not in skills:
+                skills.append(key)
+                self.postings.setdefault(key, set()).add(job_id)
+                self.labels.setdefault(key, skill.strip())
+
+        location = normalize_value(job.get("location"))
+        company = normalize_value(job.get("company"))
+        if location:
+            self.by_location.setdefault(location, set()).add(job_id)
+        if company:
+            self.by_company.setdefault(company, set()).add(job_id)
+
+        self.job_facets[job_id] = {"location": location, "company": company, "skills": skills}
+        return job_id
+
+    def add_jobs(self, jobs):
+        """Adds a batch of jobs to the index."""
+        for job in jobs:
+            if not isinstance(job, dict):
+                logger.warning(f"Skipping non-dictionary job item: {job}")
+                continue
+            self.add_job(job)
+        logger.info(f"Skills index now covers {len(self.job_facets)} postings and {len(self.postings)} skills.")
+
+    def remove_job(self, job_id):
+        """Removes a posting from every postings list it belongs to."""
+        facets = self.job_facets.pop(job_id, None)
+        if facets is None:
+            return False
+        for skill in facets["skills"]:
+            self._discard(self.postings, skill, job_id)
+        self._discard(self.by_location, facets["location"], job_id)
+        self._discard(self.by_company, facets["company"], job_id)
+        return True
+
+    @staticmethod
+    def _discard(mapping, key, job_id):
+        ids = mapping.get(key)
+        if ids is None:
+            return
+        ids.discard(job_id)
+        if not ids:
+            del mapping[key]
+
+    def query(self, all_of=None, any_of=None):
+        """
+        Returns the posting IDs matching a skill query.
+
+        Args:
+            all_of (list, optional): Skills that must all be present (AND).
+            any_of (list, optional): Skills of which at least one must be present (OR).
+
+        Returns:
+            set: Matching posting IDs.
+        """
+        result = None
+        for skill in all_of or []:
+            ids = self.postings.get(normalize_value(skill), set())
+            result = set(ids) if result is None else result & ids
+            if not result:
+                return set()
+
+        if any_of:
+            union = set()
+            for skill in any_of:
+                union |= self.postings.get(normalize_value(skill), set())
+            result = union if result is None else result & union
+
+        return result if result is not None else set(self.job_facets)
+
+    def _facet_ids(self, location=None, company=None):
+        ids = None
+        if location is not None:
+            ids = self.by_location.get(normalize_value(location), set())
+        if company is not None:
+            company_ids = self.by_company.get(normalize_value(company), set())
+            ids = company_ids if ids is None else ids & company_ids
+        return ids
+
+    def top_skills(self, n=10, location=None, company=None):
+        """
+        Returns the most frequent skills, optionally restricted to a location and/or company.
+
+        Returns:
+            list: (skill label, count) tuples, most frequent first.
+        """
+        scope = self._facet_ids(location, company)
+        counts = Counter()
+        for skill, ids in self.postings.items():
+            count = len(ids) if scope is None else len(ids & scope)
+            if count:
+                counts[skill] = count
+        return [(self.labels[skill], count) for skill, count in counts.most_common(n)]
+
+    def co_occurrence(self, skill, n=10):
+        """Returns the skills that most often appear together with `skill`."""
+        key = normalize_value(skill)
+        counts = Counter()
+        for job_id in self.postings.get(key, set()):
+            counts.update(other for other in self.job_facets[job_id]["skills"] if other != key)
+        return [(self.labels[other], count) for other, count in counts.most_common(n)]
+
+    def save(self, path=SKILLS_INDEX_FILE):
+        """Persists the index to a JSON file."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"labels": self.labels, "jobs": self.job_facets}, file)
+        logger.info(f"Saved skills index with {len(self.job_facets)} postings to {path}")
+
+    @classmethod
+    def load(cls, path=SKILLS_INDEX_FILE):
+        """Loads an index saved with save(); returns an empty index if the file does not exist."""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, "r") as file:
+            data = json.load(file)
+        for job_id, facets in data.get("jobs", {}).items():
+            index.job_facets[job_id] = facets
+            for skill in facets["skills"]:
+                index.postings.setdefault(skill, set()).add(job_id)
+            if facets["location"]:
+                index.by_location.setdefault(facets["location"], set()).add(job_id)
+            if facets["company"]:
+                index.by_company.setdefault(facets["company"], set()).add(job_id)
+        index.labels = data.get("labels", {})
+        return index
+
+if __name__ == "__main__":
+    # Print a small skills report from the persisted index
+    skills_index = SkillsIndex.load()
+    print(f"Postings indexed: {len(skills_index)}")
+    print("Top skills:")
+    for skill, count in skills_index.top_skills(n=20):
+        print(f"  {skill}: {count}")
+    for location in sorted(skills_index.by_location):
+        print(f"Top skills in {location}: {skills_index.top_skills(n=5, location=location)}")
@@ -1,6 +1,8 @@
 import unittest
 import logging
+from unittest.mock import patch
 from Job_Search.src.analyzer import analyze_jobs, hybrid_search  # Updated imports
+from Job_Search.src.ranking import build_bm25
 from Job_Search.src.processor import clean_data, index_jobs_in_faiss  # For indexing jobs
 
 # Configure logging to be quiet during tests, unless specifically needed for a test
@@ -128,5 +130,31 @@ class TestAnalyzer(unittest.TestCase):
         # Validate results
         self.assertEqual(len(relevant_jobs), 0)
 
+    def test_hybrid_search_applies_filters_before_scoring(self):
+        """Test hybrid search only returns jobs allowed by the filter expression."""
+        jobs = [
+            {"title": "Python Developer", "company": "Company A", "location": "Remote", "skills": ["Python"], "description": "We are looking for a Python developer...", "link": "https://example.com/job/123 "},
+            {"title": "Data Scientist", "company": "Company B", "location": "New York", "skills": ["Python", "ML"], "description": "Seeking a data scientist with expertise in ML...", "link": "https://example.com/job/456 "},
+            {"title": "Backend Developer", "company": "Company C", "location": "Remote", "skills": ["Go"], "description": "Backend Python and Go developer wanted...", "link": "https://example.com/job/789 "}
+        ]
+
+        cleaned_jobs = clean_data(jobs)
+        index, job_metadata = index_jobs_in_faiss(cleaned_jobs)
+
+        query = "Find me remote Python developer jobs."
+        relevant_jobs = hybrid_search(query, cleaned_jobs, index, top_k=3, filters={"remote": True, "skills": ["Python"]})
+        self.assertEqual([job["title"] for job in relevant_jobs], ["Python Developer"])
+
+        # No job satisfies the constraints
+        relevant_jobs = hybrid_search(query, cleaned_jobs, index, top_k=3, filters={"company": "Unknown Co"})
+        self.assertEqual(relevant_jobs, [])
+
+        # Without a prebuilt BM25 index, only the jobs that pass the filters are indexed
+        built = []
+        with patch('Job_Search.src.analyzer.build_bm25', side_effect=lambda jobs: built.append(build_bm25(jobs)) or built[-1]):
+            relevant_jobs = hybrid_search(query, cleaned_jobs, index, top_k=3, filters={"remote": True})
+        self.assertEqual(built[0].corpus_size, 2)
+        self.assertEqual({job["title"] for job in relevant_jobs}, {"Python Developer", "Backend Developer"})
+
 if __name__ == '__main__':
     unittest.main()
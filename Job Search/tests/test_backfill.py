@@ -0,0 +1,136 @@
+import unittest
+import logging
+import json
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from Job_Search.src.backfill import Backfill, JobStore, _write_atomic, iter_jsonl
+from Job_Search.src.ranking import build_bm25
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+VOCABULARY = ["python", "sql", "react", "spark", "java", "rust"]
+
+def encode(jobs):
+    """Bag-of-words vectors over a small vocabulary, so tests need no embedding model."""
+    return np.array([[job["description"].lower().split().count(word) for word in VOCABULARY] for job in jobs], dtype=np.float32)
+
+def make_jobs(count):
+    return [{"id": f"job{i}", "title": f"Job {i}", "description": f"{VOCABULARY[i % len(VOCABULARY)]} developer {i}"}
+            for i in range(count)]
+
+class TestBackfill(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.directory.name, "backfill")
+        self.jobs = make_jobs(25)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_streamed_indexes_match_single_pass(self):
+        index, bm25, store = Backfill(self.output_dir, batch_size=4, checkpoint_every=2, encode=encode).run(iter(self.jobs))
+        self.assertEqual((index.ntotal, bm25.corpus_size, len(store)), (25, 25, 25))
+        np.testing.assert_allclose(bm25.get_scores(["python", "developer"]), build_bm25(self.jobs).get_scores(["python", "developer"]))
+        self.assertEqual(store[7], self.jobs[7])
+        self.assertEqual([job["id"] for job in store.get([24, 0])], ["job24", "job0"])
+        _, positions = index.search(encode([{"description": "rust"}]), 1)
+        self.assertEqual(store[int(positions[0][0])]["description"].split()[0], "rust")
+        store.close()
+
+    def test_only_one_batch_is_encoded_at_a_time(self):
+        sizes = []
+        Backfill(self.output_dir, batch_size=10, encode=lambda batch: sizes.append(len(batch)) or encode(batch)).run(iter(self.jobs))[2].close()
+        self.assertEqual(sizes, [10, 10, 5])
+
+    def test_resume_after_interruption(self):
+        calls = []
+
+        def failing_encode(batch):
+            calls.append(len(batch))
+            if len(calls) == 4:
+                raise RuntimeError("worker killed")
+            return encode(batch)
+
+        backfill = Backfill(self.output_dir, batch_size=4, checkpoint_every=2, encode=failing_encode)
+        with self.assertRaises(RuntimeError):
+            backfill.run(iter(self.jobs))
+        backfill.store.close()
+        with open(os.path.join(self.output_dir, "checkpoint.json")) as file:
+            self.assertEqual(json.load(file)["rows"], 8)  # Two batches were checkpointed, the third was lost
+
+        encoded = []
+        resumed = Backfill(self.output_dir, batch_size=4, checkpoint_every=2, encode=lambda batch: encoded.extend(batch) or encode(batch))
+        index, bm25, store = resumed.run(iter(self.jobs))
+        self.assertEqual(encoded[0]["id"], "job8")
+        self.assertEqual((index.ntotal, bm25.corpus_size, len(store)), (25, 25, 25))
+        self.assertEqual([store[row]["id"] for row in range(25)], [job["id"] for job in self.jobs])
+        np.testing.assert_allclose(bm25.get_scores(["sql"]), build_bm25(self.jobs).get_scores(["sql"]))
+        store.close()
+
+    def test_resume_after_crash_between_segment_and_progress_writes(self):
+        jobs = make_jobs(40)
+        writes = []
+
+        def crashing_write(path, write):
+            writes.append(os.path.basename(path))
+            if os.path.basename(path) == "checkpoint.json" and writes.count("checkpoint.json") == 2:
+                raise RuntimeError("worker killed")  # The second segment is on disk, its progress is not
+            return _write_atomic(path, write)
+
+        with patch('Job_Search.src.backfill._write_atomic', side_effect=crashing_write):
+            backfill = Backfill(self.output_dir, batch_size=10, checkpoint_every=1, encode=encode)
+            with self.assertRaises(RuntimeError):
+                backfill.run(iter(jobs))
+        backfill.store.close()
+        self.assertEqual(len(os.listdir(os.path.join(self.output_dir, "segments"))), 2)
+
+        index, bm25, store = Backfill(self.output_dir, batch_size=10, checkpoint_every=1, encode=encode).run(iter(jobs))
+        self.assertEqual((index.ntotal, bm25.corpus_size, len(store)), (40, 40, 40))
+        _, positions = index.search(encode([{"description": "rust"}]), 1)
+        self.assertEqual(store[int(positions[0][0])]["description"].split()[0], "rust")
+        np.testing.assert_allclose(bm25.get_scores(["sql"]), build_bm25(jobs).get_scores(["sql"]))
+        store.close()
+
+    def test_checkpoints_only_write_new_vectors(self):
+        Backfill(self.output_dir, batch_size=4, checkpoint_every=2, encode=encode).run(iter(self.jobs))[2].close()
+        segments = sorted(os.listdir(os.path.join(self.output_dir, "segments")))
+        sizes = [np.load(os.path.join(self.output_dir, "segments", name)).shape[0] for name in segments]
+        self.assertEqual(sizes, [8, 8, 8, 1])
+
+    def test_inconsistent_checkpoint_is_rejected(self):
+        Backfill(self.output_dir, batch_size=4, checkpoint_every=2, encode=encode).run(iter(self.jobs))[2].close()
+        path = os.path.join(self.output_dir, "checkpoint.json")
+        with open(path) as file:
+            checkpoint = json.load(file)
+        with open(path, "w") as file:
+            json.dump({**checkpoint, "segments": checkpoint["segments"][:-1]}, file)
+        with self.assertRaises(ValueError):
+            Backfill(self.output_dir, batch_size=4, encode=encode).run(iter(self.jobs))
+
+    def test_iter_jsonl_and_job_store(self):
+        path = os.path.join(self.directory.name, "jobs.jsonl")
+        with open(path, "w") as file:
+            file.write("\n".join(json.dumps(job) for job in self.jobs[:3]) + "\n\n")
+        self.assertEqual(list(iter_jsonl(path)), self.jobs[:3])
+
+        store = JobStore(os.path.join(self.directory.name, "store.jsonl"))
+        store.append(self.jobs[:3])
+        store.flush()
+        store.close()
+        reopened = JobStore(os.path.join(self.directory.name, "store.jsonl"), rows=2)  # Drops the third job
+        self.assertEqual(len(reopened), 2)
+        reopened.append(self.jobs[5:6])
+        self.assertEqual(reopened[2]["id"], "job5")
+        reopened.close()
+
+    def test_default_encoder_is_generate_embeddings(self):
+        with patch('Job_Search.src.backfill.generate_embeddings', side_effect=encode) as mock_embed:
+            Backfill(self.output_dir, batch_size=50, encode=None)
+        mock_embed.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import logging
+from Job_Search.src import context_builder
+from Job_Search.src.context_builder import (
+    build_context,
+    count_tokens,
+    select_snippets,
+    split_sentences,
+    truncate_to_tokens
+)
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestContextBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.query = "Find me remote Python developer jobs."
+        self.jobs = [
+            {
+                "title": "Python Developer",
+                "description": "Our office has free snacks. We need a Python developer for our backend. "
+                               "The role is fully remote. We also value teamwork and communication. " * 20,
+                "link": "https://example.com/job/123"
+            },
+            {"title": "Data Scientist", "description": "Seeking a data scientist with expertise in ML.", "link": "https://example.com/job/456"},
+            {"title": "QA Engineer", "description": "Manual testing of web applications.", "link": "https://example.com/job/789"}
+        ]
+
+    def test_count_tokens(self):
+        self.assertEqual(count_tokens(""), 0)
+        self.assertGreater(count_tokens("We need a Python developer."), 0)
+        self.assertEqual(count_tokens("a\nb"), 3)  # Newlines are counted
+
+    @unittest.skipIf(context_builder.tiktoken is not None, "estimate is only used without tiktoken")
+    def test_count_tokens_estimate_is_conservative(self):
+        # Long words and numbers take several BPE tokens (cl100k_base: 3 and 2 here)
+        self.assertGreaterEqual(count_tokens("Kubernetes"), 3)
+        self.assertGreaterEqual(count_tokens("2024"), 2)
+
+    def test_split_sentences(self):
+        self.assertEqual(split_sentences("First one. Second one!\nThird"), ["First one.", "Second one!", "Third"])
+
+    def test_truncate_to_tokens(self):
+        text = "one two three four five six"
+        truncated = truncate_to_tokens(text, 3)
+        self.assertLessEqual(count_tokens(truncated), 3)
+        self.assertTrue(text.startswith(truncated))
+
+    def test_select_snippets_prefers_relevant_sentences(self):
+        description = "Our office has free snacks. We need a Python developer. The role is remote."
+        snippet = select_snippets(description, self.query, max_tokens=count_tokens("We need a Python developer.") + 1)
+        self.assertEqual(snippet, "We need a Python developer.")
+
+    def test_select_snippets_truncated_sentence_uses_up_budget(self):
+        description = " ".join(["python developer"] * 30) + ". Remote role. Python team."
+        snippet = select_snippets(description, self.query, max_tokens=10)
+        self.assertLessEqual(count_tokens(snippet), 10)
+        self.assertNotIn("Remote role.", snippet)
+
+    def test_select_snippets_marks_only_skipped_sentences(self):
+        description = "We need a Python developer. The role is remote. Free snacks. Python and remote again."
+        kept = ("We need a Python developer.", "The role is remote.", "Python and remote again.")
+        budget = sum(count_tokens(sentence) for sentence in kept) + 2 * count_tokens(" ... ")
+        snippet = select_snippets(description, self.query, max_tokens=budget)
+        self.assertEqual(snippet, "We need a Python developer. The role is remote. ... Python and remote again.")
+
+    def test_build_context_multi_sentence_descriptions(self):
+        jobs = [
+            {"title": "Short", "description": "Short one. Another short one.", "link": "https://example.com/1"},
+            {"title": "Long", "description": "Python developer wanted. " + "Free snacks every day. " * 40 + "Remote role.",
+             "link": "https://example.com/2"},
+        ]
+        context, stats = build_context(jobs, self.query, max_tokens=200, per_job_tokens=40)
+        lines = context.split("\n")
+        self.assertEqual(lines[0], "Short: Short one. Another short one. (https://example.com/1)")
+        self.assertEqual(stats["jobs_truncated"], 1)
+        self.assertTrue(lines[1].startswith("Long: Python developer wanted. Free snacks every day."))
+        self.assertTrue(lines[1].endswith(" ... Remote role. (https://example.com/2)"))
+
+    def test_build_context_respects_budgets(self):
+        context, stats = build_context(self.jobs, self.query, max_tokens=120, per_job_tokens=60)
+        self.assertLessEqual(stats["context_tokens"], 120)
+        self.assertEqual(stats["jobs_truncated"], 1)
+        lines = context.split("\n")
+        # Jobs are packed in ranking order
+        self.assertTrue(lines[0].startswith("Python Developer: "))
+        self.assertTrue(lines[0].endswith("(https://example.com/job/123)"))
+        for line in lines:
+            self.assertLessEqual(count_tokens(line), 60)
+
+    def test_build_context_drops_jobs_when_budget_is_exhausted(self):
+        context, stats = build_context(self.jobs, self.query, max_tokens=70, per_job_tokens=60)
+        self.assertLess(stats["jobs_packed"], len(self.jobs))
+        self.assertEqual(len(context.split("\n")), stats["jobs_packed"])
+
+    def test_build_context_counts_line_separators(self):
+        jobs = [{"title": f"Job {i}", "description": "Python developer.", "link": f"https://example.com/{i}"} for i in range(10)]
+        line_tokens = count_tokens("Job 0: Python developer. (https://example.com/0)")
+        max_tokens = 3 * line_tokens + count_tokens("\n")  # Three whole lines, but only one of the two separators
+        context, stats = build_context(jobs, self.query, max_tokens=max_tokens, per_job_tokens=line_tokens)
+        self.assertLessEqual(count_tokens(context), max_tokens)
+        self.assertEqual(stats["context_tokens"], count_tokens(context))
+        self.assertEqual(stats["jobs_packed"], 3)
+        self.assertEqual(stats["jobs_truncated"], 1)  # The third line was shortened to make room for the separator
+
+    def test_build_context_skips_jobs_whose_title_does_not_fit(self):
+        jobs = [
+            {"title": "Senior " * 40 + "Engineer", "description": "Too long.", "link": "https://example.com/1"},
+            {"title": "QA Engineer", "description": "Manual testing.", "link": "https://example.com/2"},
+        ]
+        context, stats = build_context(jobs, self.query, max_tokens=100, per_job_tokens=30)
+        self.assertEqual(context, "QA Engineer: Manual testing. (https://example.com/2)")
+        self.assertEqual(stats["jobs_packed"], 1)
+
+    def test_build_context_short_jobs_are_kept_whole(self):
+        context, stats = build_context(self.jobs[1:], self.query)
+        self.assertEqual(stats["jobs_truncated"], 0)
+        self.assertIn("Seeking a data scientist with expertise in ML.", context)
+
+if __name__ == '__main__':
+    unittest.main()
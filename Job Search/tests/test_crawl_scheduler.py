@@ -0,0 +1,115 @@
+import unittest
+import logging
+import os
+import tempfile
+from Job_Search.src.crawl_scheduler import CrawlScheduler, board_key, remove_cached_jobs
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+HOUR = 3600
+
+def make_jobs(prefix, count):
+    return [{"id": f"{prefix}{i}", "title": f"Job {i}"} for i in range(count)]
+
+class TestCrawlScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.hot = {"url": "https://hot.example.com/jobs", "query_params": {"q": "python"}}
+        self.static = {"url": "https://static.example.com/jobs"}
+        self.scheduler = self.make_scheduler()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_scheduler(self, **kwargs):
+        options = dict(min_interval=HOUR, max_interval=48 * HOUR, target_new=5, smoothing=1.0,
+                       state_path=os.path.join(self.directory.name, "schedule.json"),
+                       cache_dir=os.path.join(self.directory.name, "cache"))
+        options.update(kwargs)
+        return CrawlScheduler(**options)
+
+    def test_board_key_includes_query(self):
+        self.assertNotEqual(board_key(self.hot), board_key({**self.hot, "query_params": {"q": "java"}}))
+        self.assertEqual(board_key({"url": "u", "query_params": {"a": 1, "b": 2}}), board_key({"url": "u", "query_params": {"b": 2, "a": 1}}))
+
+    def test_new_boards_are_due(self):
+        crawl, skip = self.scheduler.select([self.hot, self.static], now=0)
+        self.assertEqual((crawl, skip), ([self.hot, self.static], []))
+
+    def test_intervals_follow_new_posting_rate(self):
+        self.scheduler.record(self.hot, make_jobs("a", 10), 0.5, now=0)
+        self.scheduler.record(self.static, make_jobs("s", 10), 0.5, now=0)
+        self.assertEqual(self.scheduler.select([self.hot, self.static], now=HOUR / 2), ([], [self.hot, self.static]))
+
+        # 20 new postings in 2 hours -> 10 per hour -> 5 expected after half an hour (clamped to min_interval)
+        self.assertEqual(self.scheduler.record(self.hot, make_jobs("b", 20), 0.5, now=2 * HOUR), 20)
+        self.assertEqual(self.scheduler.boards[board_key(self.hot)]["interval"], HOUR)
+        # Nothing new -> back off
+        self.assertEqual(self.scheduler.record(self.static, make_jobs("s", 10), 0.5, now=2 * HOUR), 0)
+        self.assertEqual(self.scheduler.boards[board_key(self.static)]["interval"], 2 * HOUR)
+
+        crawl, skip = self.scheduler.select([self.hot, self.static], now=3 * HOUR)
+        self.assertEqual((crawl, skip), ([self.hot], [self.static]))
+
+    def test_slow_rate_sets_long_interval(self):
+        self.scheduler.record(self.hot, make_jobs("a", 10), 0.5, now=0)
+        self.scheduler.record(self.hot, make_jobs("a", 10) + make_jobs("b", 1), 0.5, now=2 * HOUR)
+        self.assertEqual(self.scheduler.boards[board_key(self.hot)]["interval"], 10 * HOUR)  # 0.5 new per hour
+
+    def test_budget_prefers_most_new_postings_per_fetch_second(self):
+        scheduler = self.make_scheduler(max_requests_per_day=3)
+        for board, rate, seconds in ((self.hot, 10.0, 1.0), (self.static, 1.0, 1.0)):
+            scheduler.boards[board_key(board)] = {"interval": HOUR, "last_crawled": 0, "new_per_hour": rate,
+                                                  "seconds_per_fetch": seconds, "crawls": 2, "seen_ids": []}
+        scheduler.requests = [0, 0]  # One request left in the last 24 hours
+        self.assertEqual(scheduler.select([self.hot, self.static], now=2 * HOUR), ([self.hot], [self.static]))
+
+        scheduler.boards[board_key(self.hot)]["seconds_per_fetch"] = 100.0  # Slow board: 0.2 new postings per fetch second
+        self.assertEqual(scheduler.select([self.hot, self.static], now=2 * HOUR), ([self.static], [self.hot]))
+
+        # Requests older than a day no longer count against the budget
+        self.assertEqual(scheduler.select([self.hot, self.static], now=30 * HOUR), ([self.hot, self.static], []))
+
+    def test_intervals_are_stretched_to_fit_budget(self):
+        scheduler = self.make_scheduler(max_requests_per_day=12)
+        scheduler.record(self.hot, make_jobs("a", 10), 0.5, now=0)
+        scheduler.record(self.hot, make_jobs("b", 50), 0.5, now=HOUR)  # Would be crawled hourly: 24 requests a day
+        self.assertEqual(scheduler.boards[board_key(self.hot)]["interval"], 2 * HOUR)
+
+    def test_empty_crawl_keeps_cached_jobs(self):
+        jobs = make_jobs("a", 3)
+        self.scheduler.record(self.hot, jobs, 0.5, now=0)
+        self.assertEqual(self.scheduler.record(self.hot, [], 10.0, now=2 * HOUR), 0)
+        self.assertEqual(self.scheduler.cached_jobs(self.hot), jobs)
+        self.assertEqual(self.scheduler.boards[board_key(self.hot)]["interval"], 2 * HOUR)
+
+    def test_removed_boards_are_forgotten(self):
+        scheduler = self.make_scheduler(max_requests_per_day=24)
+        scheduler.record(self.hot, make_jobs("a", 3), 0.5, now=0)
+        scheduler.record(self.static, make_jobs("s", 3), 0.5, now=0)
+        self.assertEqual(scheduler.select([self.hot], now=2 * HOUR), ([self.hot], []))
+        self.assertEqual(list(scheduler.boards), [board_key(self.hot)])  # No longer counted by _fit_budget
+        self.assertEqual(scheduler.cached_jobs(self.static), [])
+
+    def test_expired_jobs_are_removed_from_cached_crawls(self):
+        self.scheduler.record(self.hot, make_jobs("a", 3), 0.5, now=0)
+        self.scheduler.record(self.static, make_jobs("s", 2), 0.5, now=0)
+        self.assertEqual(remove_cached_jobs(["a1", "s0"], self.scheduler.cache_dir), 2)
+        self.assertEqual([job["id"] for job in self.scheduler.cached_jobs(self.hot)], ["a0", "a2"])
+        self.assertEqual([job["id"] for job in self.scheduler.cached_jobs(self.static)], ["s1"])
+
+    def test_state_is_persisted_and_reported(self):
+        self.scheduler.record(self.hot, make_jobs("a", 3), 0.5, now=0)
+        self.scheduler.save()
+        reloaded = self.make_scheduler()
+        self.assertEqual(reloaded.boards[board_key(self.hot)]["crawls"], 1)
+        report = reloaded.report(now=HOUR / 4)
+        entry = report["boards"][board_key(self.hot)]
+        self.assertNotIn("seen_ids", entry)
+        self.assertEqual(entry["next_crawl_in"], 0.75 * HOUR)
+        self.assertEqual(report["requests_last_24h"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import logging
+import json
+import os
+import tempfile
+import numpy as np
+from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+from transformers import BertConfig, BertModel, BertTokenizerFast
+from sentence_transformers import SentenceTransformer, models as st_models
+from Job_Search.src.encoders import (
+    METADATA_FILE, ONNXEncoder, SentenceTransformerEncoder, create_encoder, export_onnx, record_validation, validate_encoder,
+)
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+WORDS = "python developer data engineer remote senior machine learning kubernetes sql react aws job team the a and with of to in".split()
+
+def build_model(directory):
+    """Small randomly initialized BERT sentence-transformers model (mean pooling + normalization), built offline."""
+    vocab = {token: i for i, token in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + WORDS)}
+    tokenizer = Tokenizer(models.WordPiece(vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 2), ("[SEP]", 3)])
+    hf_path = os.path.join(directory, "hf")
+    BertTokenizerFast(tokenizer_object=tokenizer, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]",
+                      sep_token="[SEP]", mask_token="[MASK]").save_pretrained(hf_path)
+    BertModel(BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                         intermediate_size=64, max_position_embeddings=64)).save_pretrained(hf_path)
+    model = SentenceTransformer(modules=[st_models.Transformer(hf_path, max_seq_length=48), st_models.Pooling(32, "mean"), st_models.Normalize()])
+    model_path = os.path.join(directory, "model")
+    model.save(model_path)
+    return model_path
+
+class TestONNXEncoder(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.onnx_dir = os.path.join(cls.directory.name, "onnx")
+        cls.reference = export_onnx(build_model(cls.directory.name), cls.onnx_dir, quantize=True)
+        cls.texts = ["python developer", "senior data engineer with sql and aws, remote", "", "the team " * 40, "kubernetes"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_export_writes_metadata(self):
+        with open(os.path.join(self.onnx_dir, METADATA_FILE)) as file:
+            metadata = json.load(file)
+        self.assertEqual((metadata["dimension"], metadata["max_length"], metadata["pooling"], metadata["normalize"]), (32, 48, "mean", True))
+
+    def test_matches_pytorch_embeddings(self):
+        encoder = ONNXEncoder(self.onnx_dir, batch_size=2)  # Several batches of different lengths, in input order
+        expected = self.reference.encode(self.texts)
+        actual = encoder.encode(self.texts)
+        self.assertEqual(actual.shape, (len(self.texts), 32))
+        np.testing.assert_allclose(actual, expected, atol=1e-4)
+        np.testing.assert_allclose(encoder.encode("python developer"), expected[0], atol=1e-4)  # Single text -> 1-D
+
+    def test_quantized_model_within_tolerance(self):
+        result = validate_encoder(self.reference, ONNXEncoder(self.onnx_dir, quantized=True), self.texts, min_cosine=0.98)
+        self.assertTrue(result["passed"], result)
+        failed = validate_encoder(self.reference, ONNXEncoder(self.onnx_dir, quantized=True), self.texts, min_cosine=1.01)
+        self.assertFalse(failed["passed"])
+
+    def test_create_encoder_selects_backend(self):
+        result = validate_encoder(self.reference, ONNXEncoder(self.onnx_dir), self.texts)
+        record_validation(self.onnx_dir, False, result)
+        encoder = create_encoder({"embeddings": {"backend": "onnx", "batch_size": 4, "onnx": {"model_dir": self.onnx_dir, "quantized": False}}})
+        self.assertIsInstance(encoder, ONNXEncoder)
+        self.assertEqual((encoder.model_file, encoder.batch_size, encoder.validation["passed"]), ("model.onnx", 4, True))
+        default = create_encoder({"embeddings": {"backend": "onnx", "onnx": {"model_dir": self.onnx_dir}}})
+        self.assertEqual(default.model_file, "model.int8.onnx")  # Same default as config.yaml
+        self.assertIsInstance(self.reference, SentenceTransformerEncoder)
+        with self.assertRaises(ValueError):
+            create_encoder({"embeddings": {"backend": "tensorrt"}})
+
+if __name__ == '__main__':
+    unittest.main()
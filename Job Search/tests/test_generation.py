@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+from Job_Search.src.generation import RateLimiter, generate_all, generate_concurrently
+from Job_Search.src.llm_client import HTTPBackend, LLMClient
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Local stand-in for an LLM server; the prompt's first line is the injected latency in seconds."""
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(float(payload["prompt"].split("\n", 1)[0]))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        body = json.dumps({"text": f"response to {payload['prompt']}"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class TestGeneration(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), MockLLMHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.in_flight = 0
+        cls.server.max_in_flight = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/generate"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.max_in_flight = 0
+        self.client = LLMClient(HTTPBackend(self.url, model="mock"))
+
+    def collect(self, prompts, **kwargs):
+        async def run():
+            return [result async for result in generate_concurrently(self.client, prompts, **kwargs)]
+        return asyncio.run(run())
+
+    def test_requests_run_concurrently_within_limit(self):
+        prompts = {f"user{i}@example.com": f"0.2\nprompt {i}" for i in range(6)}
+        start = time.perf_counter()
+        results = self.collect(prompts, concurrency=3)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual({key for key, response, error in results}, set(prompts))
+        self.assertTrue(all(error is None for key, response, error in results))
+        self.assertLessEqual(self.server.max_in_flight, 3)
+        self.assertLess(elapsed, 6 * 0.2)  # Faster than sequential generation
+
+    def test_results_are_yielded_as_they_complete(self):
+        prompts = {"slow@example.com": "0.5\nslow", "fast@example.com": "0.05\nfast"}
+        results = self.collect(prompts, concurrency=2)
+        self.assertEqual([key for key, response, error in results], ["fast@example.com", "slow@example.com"])
+
+    def test_timeout_is_reported_as_error(self):
+        results = self.collect({"user@example.com": "1.0\nprompt"}, timeout=0.1, retries=0)
+        key, response, error = results[0]
+        self.assertIsNone(response)
+        self.assertIsInstance(error, asyncio.TimeoutError)
+
+    def test_timed_out_requests_hold_their_slot_until_they_return(self):
+        results = self.collect({"user@example.com": "0.3\nprompt"}, concurrency=1, timeout=0.1, retries=2, backoff=0)
+        self.assertIsInstance(results[0][2], asyncio.TimeoutError)
+        self.assertEqual(self.server.max_in_flight, 1)  # Retries wait for the abandoned request
+
+    def test_list_prompts_are_keyed_by_position(self):
+        results = self.collect(["0.05\nsame", "0.05\nsame", "0.05\nother"], concurrency=3)
+        self.assertEqual(sorted(key for key, response, error in results), [0, 1, 2])
+        self.assertEqual(dict((key, response) for key, response, error in results)[2], "response to 0.05\nother")
+
+    def test_failed_requests_are_retried(self):
+        client = MagicMock()
+        client.generate.side_effect = [RuntimeError("server error"), "response"]
+        results = generate_all(client, {"user@example.com": "prompt"}, retries=1, backoff=0)
+        self.assertEqual(results, {"user@example.com": "response"})
+        self.assertEqual(client.generate.call_count, 2)
+
+    def test_rate_limiter_spaces_requests(self):
+        async def run():
+            limiter = RateLimiter(requests_per_minute=600)  # One request every 0.1s
+            start = time.monotonic()
+            for _ in range(3):
+                await limiter.acquire()
+            return time.monotonic() - start
+        self.assertGreaterEqual(asyncio.run(run()), 0.19)
+
+if __name__ == '__main__':
+    unittest.main()
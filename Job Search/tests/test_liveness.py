@@ -0,0 +1,191 @@
+import unittest
+import logging
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from Job_Search.src.liveness import ALIVE, BLOCKED, DEAD, UNKNOWN, HostLimiter, LivenessChecker, expire_jobs
+from Job_Search.src.skills_index import SkillsIndex
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class StandInBoard:
+    """Local job board whose postings are alive, gone, refuse HEAD, are behind a login or rate limit, or fail."""
+
+    def __init__(self):
+        self.requests = []  # (method, path, If-None-Match, time)
+        board = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                board.requests.append((self.command, self.path, self.headers.get("If-None-Match"), time.monotonic()))
+                if self.path.startswith("/alive"):
+                    if self.headers.get("If-None-Match") == '"v1"':
+                        self.send_response(304)
+                    else:
+                        self.send_response(200)
+                    self.send_header("ETag", '"v1"')
+                elif self.path.startswith("/gone"):
+                    self.send_response(410)
+                elif self.path.startswith("/missing"):
+                    self.send_response(404)
+                elif self.path.startswith("/nohead") and self.command == "HEAD":
+                    self.send_response(405)
+                elif self.path.startswith("/nohead"):
+                    self.send_response(200)
+                elif self.path.startswith("/login"):
+                    self.send_response(401)
+                elif self.path.startswith("/ratelimited"):
+                    self.send_response(429)
+                    self.send_header("Retry-After", "120")
+                else:
+                    self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_HEAD(self):
+                self._respond()
+
+            def do_GET(self):
+                self._respond()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def make_job(i, path):
+    return {"id": f"job{i}", "title": f"Job {i}", "company": "Company", "location": "Remote",
+            "description": "Python developer", "skills": ["Python"], "link": path}
+
+class TestLivenessChecker(unittest.TestCase):
+
+    def setUp(self):
+        self.board = StandInBoard()
+        self.directory = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.directory.name, "liveness.json")
+        self.checker = LivenessChecker(concurrency=4, per_host_delay=0, timeout=5, max_failures=2, state_path=self.state_path)
+
+    def tearDown(self):
+        self.board.close()
+        self.directory.cleanup()
+
+    def test_classifies_links(self):
+        jobs = [make_job(i, f"{self.board.url}/{path}/{i}") for i, path in enumerate(["alive", "gone", "missing", "nohead", "error"])]
+        results = self.checker.check(jobs)
+        self.assertEqual(results, {ALIVE: ["job0", "job3"], DEAD: ["job1", "job2"], UNKNOWN: ["job4"], BLOCKED: []})
+        methods = [(method, path) for method, path, _, _ in self.board.requests if path == "/nohead/3"]
+        self.assertEqual(methods, [("HEAD", "/nohead/3"), ("GET", "/nohead/3")])  # GET only after HEAD is refused
+        self.assertTrue(self.checker.is_expired("job1"))
+        self.assertEqual([job["id"] for job in self.checker.drop_expired(jobs)], ["job0", "job3", "job4"])
+
+    def test_recheck_is_conditional_and_failures_expire(self):
+        jobs = [make_job(0, f"{self.board.url}/alive/0"), make_job(1, f"{self.board.url}/error/1")]
+        self.checker.check(jobs)
+        self.assertEqual(self.checker.check(jobs)[ALIVE], [])  # Nothing is due before recheck_after
+
+        self.checker.recheck_after = 0
+        results = self.checker.check(jobs)
+        self.assertEqual(results[ALIVE], ["job0"])
+        self.assertEqual(results[DEAD], ["job1"])  # Second consecutive failure
+        last_alive = [etag for _, path, etag, _ in self.board.requests if path == "/alive/0"][-1]
+        self.assertEqual(last_alive, '"v1"')  # Sent with If-None-Match from the first check
+
+    def test_blocked_hosts_do_not_count_as_failures(self):
+        job = make_job(0, f"{self.board.url}/alive/0")
+        self.checker.check([job])
+        self.checker.recheck_after = 0
+        for path in ("login", "ratelimited"):
+            job["link"] = f"{self.board.url}/{path}/0"
+            self.checker.limiter = HostLimiter(delay=0)
+            for _ in range(self.checker.max_failures + 1):
+                self.assertEqual(self.checker.check([job])[BLOCKED], ["job0"])
+            entry = self.checker.state["job0"]
+            self.assertEqual((entry["status"], entry["failures"]), (ALIVE, 0))  # Previous status kept
+            requests_made = [path_ for _, path_, _, _ in self.board.requests if path_ == f"/{path}/0"]
+            self.assertEqual(len(requests_made), 1)  # The host is backed off after the first refusal
+        self.assertFalse(self.checker.is_expired("job0"))
+
+    def test_blocked_backoff_uses_retry_after(self):
+        host = self.board.url.split("://")[1]
+        self.checker.check([make_job(0, f"{self.board.url}/ratelimited/0")])
+        self.assertTrue(self.checker.limiter.is_blocked(host))
+        self.assertGreater(self.checker.limiter._blocked_until[host] - time.monotonic(), 100)  # Retry-After: 120, not 3600
+        self.assertLess(self.checker.limiter._blocked_until[host] - time.monotonic(), 121)
+
+    def test_state_is_persisted(self):
+        self.checker.check([make_job(1, f"{self.board.url}/gone/1")])
+        reloaded = LivenessChecker(state_path=self.state_path)
+        self.assertTrue(reloaded.is_expired("job1"))
+
+    def test_due_jobs_oldest_first_round_robin_across_hosts(self):
+        other_host = self.board.url.replace("127.0.0.1", "localhost")
+        self.checker.due_jobs([make_job(0, f"{self.board.url}/alive/0")], now=100)
+        jobs = [make_job(1, f"{self.board.url}/alive/1"), make_job(2, f"{other_host}/alive/2"), make_job(0, f"{self.board.url}/alive/0")]
+        due = self.checker.due_jobs(jobs, now=200)
+        self.assertEqual([job_id for job_id, _ in due], ["job0", "job2", "job1"])
+        self.checker.max_checks = 1
+        self.assertEqual([job_id for job_id, _ in self.checker.due_jobs(jobs, now=200)], ["job0"])
+
+    def test_per_host_delay(self):
+        limiter = HostLimiter(concurrency=1, delay=0.2)
+        starts = []
+
+        def request(host):
+            limiter.acquire(host)
+            starts.append((host, time.monotonic()))
+            limiter.release(host)
+
+        threads = [threading.Thread(target=request, args=(host,)) for host in ("a", "a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        a_starts = sorted(start for host, start in starts if host == "a")
+        self.assertGreaterEqual(a_starts[1] - a_starts[0], 0.19)
+        b_start = next(start for host, start in starts if host == "b")
+        self.assertLess(b_start - min(a_starts), 0.1)  # Other hosts are not held back
+
+class TestExpireJobs(unittest.TestCase):
+
+    def test_expire_removes_from_corpus_skills_crawl_cache_and_service(self):
+        jobs = [make_job(i, f"https://example.com/{i}") for i in range(3)]
+        with tempfile.TemporaryDirectory() as directory:
+            corpus_path = os.path.join(directory, "scraped_jobs.json")
+            skills_path = os.path.join(directory, "skills_index.json")
+            with open(corpus_path, "w") as file:
+                json.dump(jobs, file)
+            skills_index = SkillsIndex()
+            skills_index.add_jobs(jobs)
+            skills_index.save(skills_path)
+            expired = []
+
+            class Service:
+                def expire(self, job_ids):
+                    expired.extend(job_ids)
+
+            cache_dir = os.path.join(directory, "crawl_cache")
+            os.makedirs(cache_dir)
+            with open(os.path.join(cache_dir, "board.json"), "w") as file:
+                json.dump(jobs, file)
+
+            expire_jobs(["job1"], service=Service(), skills_index_path=skills_path, corpus_path=corpus_path, crawl_cache_dir=cache_dir)
+            with open(corpus_path) as file:
+                self.assertEqual([job["id"] for job in json.load(file)], ["job0", "job2"])
+            self.assertEqual(SkillsIndex.load(skills_path).query(all_of=["Python"]), {"job0", "job2"})
+            self.assertEqual(expired, ["job1"])
+            with open(os.path.join(cache_dir, "board.json")) as file:
+                self.assertEqual([job["id"] for job in json.load(file)], ["job0", "job2"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import logging
+import threading
+from unittest.mock import patch, MagicMock
+from Job_Search.src.llm_client import (
+    ResponseCache,
+    StubBackend,
+    HTTPBackend,
+    LLMClient,
+    create_llm_client
+)
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_key_depends_on_model_prompt_and_params(self):
+        key = ResponseCache.make_key("model", "prompt", {"temperature": 0})
+        self.assertEqual(key, ResponseCache.make_key("model", "prompt", {"temperature": 0}))
+        self.assertNotEqual(key, ResponseCache.make_key("other", "prompt", {"temperature": 0}))
+        self.assertNotEqual(key, ResponseCache.make_key("model", "prompt", {"temperature": 1}))
+
+    def test_key_depends_on_backend_and_endpoint(self):
+        key = ResponseCache.make_key("model", "prompt", {}, backend="http", endpoint="http://localhost:8080/generate")
+        self.assertNotEqual(key, ResponseCache.make_key("model", "prompt", {}, backend="http", endpoint="http://localhost:9090/generate"))
+        self.assertNotEqual(key, ResponseCache.make_key("model", "prompt", {}, backend="openai", endpoint="http://localhost:8080/generate"))
+
+    def test_put_and_get(self):
+        cache = ResponseCache(path=":memory:")
+        self.assertIsNone(cache.get("key"))
+        cache.put("key", "response", 1.5)
+        self.assertEqual(cache.get("key"), ("response", 1.5))
+
+    def test_expired_entries_are_not_returned(self):
+        cache = ResponseCache(path=":memory:", ttl_seconds=10)
+        with patch('Job_Search.src.llm_client.time.time', return_value=1000.0):
+            cache.put("key", "response", 1.0)
+        with patch('Job_Search.src.llm_client.time.time', return_value=1011.0):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ResponseCache(path=":memory:", ttl_seconds=None, max_entries=2)
+        with patch('Job_Search.src.llm_client.time.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.put("a", "A", 1.0)
+            cache.put("b", "B", 1.0)
+            cache.get("a")  # "b" is now the least recently used entry
+            cache.put("c", "C", 1.0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+class TestLLMClient(unittest.TestCase):
+
+    def test_stub_backend_is_deterministic(self):
+        backend = StubBackend()
+        self.assertEqual(backend.generate("context\n\nQ: question"), backend.generate("context\n\nQ: question"))
+        self.assertIn("Answer to: question", backend.generate("context\n\nQ: question"))
+
+    def test_repeated_prompts_are_served_from_cache(self):
+        backend = MagicMock()
+        backend.generate.return_value = "response"
+        client = LLMClient(backend, cache=ResponseCache(path=":memory:"))
+
+        self.assertEqual(client.generate("prompt"), "response")
+        self.assertEqual(client.generate("prompt"), "response")
+        backend.generate.assert_called_once_with("prompt")
+
+        stats = client.stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_servers_sharing_a_cache_do_not_share_responses(self):
+        cache = ResponseCache(path=":memory:")
+        responses = []
+        for url in ("http://localhost:8080/generate", "http://localhost:9090/generate"):
+            backend = HTTPBackend(url, model="local")
+            mock_response = MagicMock()
+            mock_response.json.return_value = {"text": f"from {url}"}
+            with patch.object(backend._session(), 'post', return_value=mock_response):
+                responses.append(LLMClient(backend, model="local", cache=cache).generate("prompt"))
+        self.assertEqual(responses, ["from http://localhost:8080/generate", "from http://localhost:9090/generate"])
+
+    def test_client_without_cache_always_calls_backend(self):
+        backend = MagicMock()
+        backend.generate.return_value = "response"
+        client = LLMClient(backend)
+        client.generate("prompt")
+        client.generate("prompt")
+        self.assertEqual(backend.generate.call_count, 2)
+        self.assertEqual(client.stats()["hit_rate"], 0.0)
+
+    def test_http_backend(self):
+        backend = HTTPBackend("http://localhost:8080/generate", model="local", params={"temperature": 0})
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"choices": [{"text": "local response"}]}
+        with patch.object(backend._session(), 'post', return_value=mock_response) as mock_post:
+            self.assertEqual(backend.generate("prompt"), "local response")
+        mock_post.assert_called_once_with(
+            "http://localhost:8080/generate",
+            json={"model": "local", "prompt": "prompt", "temperature": 0},
+            timeout=60
+        )
+
+    def test_http_backend_uses_a_session_per_thread(self):
+        backend = HTTPBackend("http://localhost:8080/generate")
+        sessions = [backend._session()]
+        thread = threading.Thread(target=lambda: sessions.append(backend._session()))
+        thread.start()
+        thread.join()
+        self.assertIs(backend._session(), sessions[0])
+        self.assertIsNot(sessions[1], sessions[0])
+
+    def test_create_llm_client_stub_backend(self):
+        client = create_llm_client({"llm": {"backend": "stub", "cache": {"enabled": False}}})
+        self.assertIsInstance(client.backend, StubBackend)
+        self.assertIsNone(client.cache)
+
+    def test_create_llm_client_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            create_llm_client({"llm": {"backend": "unknown"}})
+
+if __name__ == '__main__':
+    unittest.main()
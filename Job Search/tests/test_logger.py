@@ -0,0 +1,126 @@
+import unittest
+import logging
+import json
+import os
+import sys
+import tempfile
+import threading
+from Job_Search.src import logger as logger_module
+from Job_Search.src.logger import setup_logger, shutdown_logger, JSONFormatter, RateLimitFilter
+
+class TestLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp_dir.name, "pipeline.log")
+        self.config = {"logging": {"file": self.log_file, "console_level": "CRITICAL"}}
+        self.root_handlers = list(logging.getLogger().handlers)
+        self.root_level = logging.getLogger().level
+        logging.getLogger().handlers = []  # Keep other test modules' handlers out of the way
+
+    def tearDown(self):
+        shutdown_logger()
+        logging.getLogger().handlers = self.root_handlers
+        logging.getLogger().setLevel(self.root_level)
+        for name in logger_module.APP_LOGGERS:
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        self.tmp_dir.cleanup()
+
+    def read_lines(self):
+        shutdown_logger()  # Flushes the queue
+        with open(self.log_file, encoding="utf-8") as file:
+            return file.read().splitlines()
+
+    def test_setup_is_idempotent(self):
+        setup_logger(self.config)
+        setup_logger(self.config)
+        self.assertEqual(len(logging.getLogger().handlers), 1)
+        logging.getLogger("pipeline").info("Only once")
+        self.assertEqual(sum("Only once" in line for line in self.read_lines()), 1)
+
+    def test_records_are_written_by_listener_thread(self):
+        setup_logger(self.config)
+        written_by = []
+        handler = logging.Handler()
+        handler.emit = lambda record: written_by.append(threading.current_thread())
+        logger_module._state["listener"].handlers += (handler,)
+        logging.getLogger("pipeline").warning("Background write")
+        shutdown_logger()
+        self.assertTrue(written_by)
+        self.assertNotIn(threading.current_thread(), written_by)
+
+    def test_debug_is_enabled_only_for_app_loggers(self):
+        setup_logger(self.config)
+        self.assertEqual(logging.getLogger().level, logging.INFO)
+        logging.getLogger("scraper").debug("App debug")
+        logging.getLogger("urllib3.connectionpool").debug("Library debug")
+        logging.getLogger("urllib3.connectionpool").info("Library info")
+        lines = self.read_lines()
+        self.assertTrue(any("App debug" in line for line in lines))
+        self.assertFalse(any("Library debug" in line for line in lines))
+        self.assertTrue(any("Library info" in line for line in lines))
+
+    def test_library_level_is_configurable(self):
+        self.config["logging"].update(level="INFO", library_level="WARNING")
+        setup_logger(self.config)
+        self.assertEqual(logging.getLogger().level, logging.WARNING)
+        self.assertFalse(logging.getLogger("processor").isEnabledFor(logging.DEBUG))
+        self.assertTrue(logging.getLogger("processor").isEnabledFor(logging.INFO))
+        self.assertTrue(logging.getLogger(logger_module.__name__).isEnabledFor(logging.INFO))
+
+    def test_json_output(self):
+        self.config["logging"]["format"] = "json"
+        setup_logger(self.config)
+        logging.getLogger("scraper").info("Scraped %d jobs", 3, extra={"board": "example"})
+        entry = json.loads(self.read_lines()[-1])
+        self.assertEqual(entry["message"], "Scraped 3 jobs")
+        self.assertEqual(entry["logger"], "scraper")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["board"], "example")
+
+    def test_json_formatter_includes_exception(self):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.getLogger("x").makeRecord("x", logging.ERROR, __file__, 1, "Failed", (), sys.exc_info())
+        entry = json.loads(JSONFormatter().format(record))
+        self.assertIn("ValueError: boom", entry["exception"])
+
+    def test_size_rotation(self):
+        self.config["logging"].update(max_bytes=500, backup_count=2, rate_limit={"enabled": False})
+        setup_logger(self.config)
+        for i in range(50):
+            logging.getLogger("pipeline").info(f"Rotating line {i}")
+        shutdown_logger()
+        self.assertTrue(os.path.exists(self.log_file + ".1"))
+
+    def test_unknown_rotation_raises(self):
+        self.config["logging"]["rotation"] = "weekly"
+        with self.assertRaises(ValueError):
+            setup_logger(self.config)
+
+    def test_rate_limit_aggregates_repetitive_messages(self):
+        self.config["logging"]["rate_limit"] = {"burst": 3, "interval": 60}
+        setup_logger(self.config)
+        log = logging.getLogger("processor")
+        for i in range(100):
+            log.info(f"Duplicate job {i} removed")
+        log.warning("Warnings are never dropped")
+        lines = self.read_lines()
+        self.assertEqual(sum("Duplicate job" in line for line in lines), 3)
+        self.assertTrue(any("97 similar messages suppressed" in line for line in lines))
+        self.assertTrue(any("Warnings are never dropped" in line for line in lines))
+
+    def test_rate_limit_reports_suppressed_count_in_next_window(self):
+        rate_filter = RateLimitFilter(burst=1, interval=0)
+        record = logging.LogRecord("x", logging.INFO, "file.py", 10, "Repeated", (), None)
+        self.assertTrue(rate_filter.filter(record))
+        rate_filter.interval = 60
+        self.assertFalse(rate_filter.filter(logging.LogRecord("x", logging.INFO, "file.py", 10, "Repeated", (), None)))
+        rate_filter.interval = 0
+        next_record = logging.LogRecord("x", logging.INFO, "file.py", 10, "Repeated", (), None)
+        self.assertTrue(rate_filter.filter(next_record))
+        self.assertEqual(next_record.getMessage(), "Repeated (1 similar messages suppressed)")
+
+if __name__ == '__main__':
+    unittest.main()
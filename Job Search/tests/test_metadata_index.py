@@ -0,0 +1,64 @@
+import unittest
+import logging
+from Job_Search.src.metadata_index import MetadataIndex, is_remote, normalize_value
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestMetadataIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [
+            {"title": "Python Developer", "company": "Company A", "location": "Remote", "skills": ["Python", "Django"]},
+            {"title": "Data Scientist", "company": "Company B", "location": "New York", "skills": ["Python", "SQL"]},
+            {"title": "Remote Java Engineer", "company": "company a", "location": "N/A", "skills": ["Java"]},
+            {"title": "Analyst", "company": "Company C", "location": "San Francisco"}  # No skills
+        ]
+        self.index = MetadataIndex(self.jobs)
+
+    def test_normalize_value(self):
+        self.assertEqual(normalize_value("  New   York "), "new york")
+        self.assertEqual(normalize_value(None), "")
+
+    def test_is_remote(self):
+        self.assertTrue(is_remote(self.jobs[0]))
+        self.assertTrue(is_remote(self.jobs[2]))  # Remote mentioned in the title
+        self.assertFalse(is_remote(self.jobs[1]))
+
+    def test_values_store_sorted_positions(self):
+        self.assertEqual(self.index.postings["skills"]["python"].tolist(), [0, 1])
+        self.assertEqual(self.index.postings["company"]["company a"].tolist(), [0, 2])
+        self.assertEqual(self.index.remote.tolist(), [0, 2])
+
+    def test_no_filters_allows_everything(self):
+        self.assertEqual(self.index.allowed_ids(None).tolist(), [0, 1, 2, 3])
+        self.assertEqual(self.index.allowed_ids({}).tolist(), [0, 1, 2, 3])
+
+    def test_company_filter_is_normalized(self):
+        self.assertEqual(self.index.allowed_ids({"company": "COMPANY A"}).tolist(), [0, 2])
+
+    def test_location_filter_any_of(self):
+        ids = self.index.allowed_ids({"location": ["New York", "San Francisco"]})
+        self.assertEqual(ids.tolist(), [1, 3])
+
+    def test_remote_filter(self):
+        self.assertEqual(self.index.allowed_ids({"remote": True}).tolist(), [0, 2])
+        self.assertEqual(self.index.allowed_ids({"remote": False}).tolist(), [1, 3])
+
+    def test_skills_filter_requires_all(self):
+        self.assertEqual(self.index.allowed_ids({"skills": "python"}).tolist(), [0, 1])
+        self.assertEqual(self.index.allowed_ids({"skills": ["Python", "SQL"]}).tolist(), [1])
+
+    def test_combined_filters(self):
+        ids = self.index.allowed_ids({"remote": True, "skills": ["Python"]})
+        self.assertEqual(ids.tolist(), [0])
+
+    def test_unknown_value_matches_nothing(self):
+        self.assertEqual(self.index.allowed_ids({"company": "Unknown Co"}).tolist(), [])
+
+    def test_unsupported_field_raises(self):
+        with self.assertRaises(ValueError):
+            self.index.evaluate({"salary": 100000})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import logging
+import json
+import os
+import tempfile
+from Job_Search.src.metrics import MetricsRegistry, Histogram, count_items, instrument_stage, metrics
+from Job_Search.src.pipeline import Pipeline, Stage
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.registry = MetricsRegistry()
+        metrics.reset()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_stage_records_timings_and_items(self):
+        with self.registry.stage("clean") as stage:
+            sum(range(100000))
+            stage.items = 3
+        entry = self.registry.report()["stages"]["clean"]
+        self.assertEqual(entry["status"], "ok")
+        self.assertEqual(entry["items"], 3)
+        self.assertGreater(entry["wall_seconds"], 0)
+        self.assertGreaterEqual(entry["cpu_seconds"], 0)
+        self.assertGreater(entry["process_peak_rss_bytes"], 0)
+        self.assertGreaterEqual(entry["peak_rss_growth_bytes"], 0)
+
+    def test_stage_reports_its_peak_rss_growth(self):
+        with self.registry.stage("load"):
+            pass
+        with self.registry.stage("embed"):
+            block = bytearray(64 * 1024 * 1024)  # Raises the process high-water mark
+            block[::4096] = b"x" * len(block[::4096])
+        stages = self.registry.report()["stages"]
+        self.assertGreater(stages["embed"]["peak_rss_growth_bytes"], 32 * 1024 * 1024)
+        self.assertLess(stages["load"]["peak_rss_growth_bytes"], 32 * 1024 * 1024)
+        del block
+
+    def test_failed_stage_is_recorded(self):
+        with self.assertRaises(ValueError):
+            with self.registry.stage("embed"):
+                raise ValueError("boom")
+        self.assertEqual(self.registry.report()["stages"]["embed"]["status"], "failed")
+
+    def test_counters_are_labelled(self):
+        self.registry.inc("scrape_jobs_total", 5, board="a")
+        self.registry.inc("scrape_jobs_total", 2, board="a")
+        self.registry.inc("scrape_jobs_total", 1, board="b")
+        series = {tuple(entry["labels"].items()): entry["value"] for entry in self.registry.report()["counters"]["scrape_jobs_total"]}
+        self.assertEqual(series, {(("board", "a"),): 7, (("board", "b"),): 1})
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2])
+        self.assertEqual(histogram.count, 3)
+
+    def test_prometheus_text(self):
+        self.registry.observe("hybrid_search_seconds", 0.02, buckets=(0.01, 0.1))
+        self.registry.inc("scrape_bytes_total", 10, board='https://example.com/"jobs"')
+        with self.registry.stage("scrape"):
+            pass
+        text = self.registry.prometheus_text()
+        self.assertIn('job_search_hybrid_search_seconds_bucket{le="0.01"} 0', text)
+        self.assertIn('job_search_hybrid_search_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('job_search_hybrid_search_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn('job_search_scrape_bytes_total{board="https://example.com/\\"jobs\\""} 10', text)
+        self.assertIn('job_search_stage_wall_seconds{stage="scrape"}', text)
+        self.assertIn("# TYPE job_search_scrape_bytes_total counter", text)
+
+    def test_write_report_and_textfile(self):
+        self.registry.inc("embedding_texts_total", 4)
+        prometheus_file = os.path.join(self.tmp_dir.name, "prom", "job_search.prom")
+        report_path = self.registry.write(report_dir=self.tmp_dir.name, prometheus_file=prometheus_file)
+        with open(report_path) as file:
+            report = json.load(file)
+        self.assertEqual(report["counters"]["embedding_texts_total"][0]["value"], 4)
+        self.assertTrue(os.path.exists(prometheus_file))
+        self.assertFalse(os.path.exists(prometheus_file + ".tmp"))
+
+    def test_reports_of_runs_started_in_the_same_second_do_not_collide(self):
+        other = MetricsRegistry()
+        other.started_at = self.registry.started_at
+        prometheus_file = os.path.join(self.tmp_dir.name, "job_search.prom")
+        paths = {registry.write(report_dir=self.tmp_dir.name, prometheus_file=prometheus_file) for registry in (self.registry, other)}
+        self.assertEqual(len(paths), 2)
+
+    def test_count_items(self):
+        class FakeIndex:
+            ntotal = 7
+        self.assertEqual(count_items([1, 2]), 2)
+        self.assertIsNone(count_items({"prompts": [1, 2]}))
+        self.assertEqual(count_items(FakeIndex()), 7)
+        self.assertIsNone(count_items(42))
+
+    def test_stages_can_report_their_item_count(self):
+        def search_stage(config):
+            metrics.set_items(2)
+            return {"emails": ["a", "b"], "prompts": ["p", "q"], "report_jobs": [[], []]}
+
+        stages = [Stage("search", search_stage), Stage("summary", lambda config: {"a": 1, "b": 2, "c": 3})]
+        Pipeline(stages, {}, artifacts_dir=self.tmp_dir.name, stage_wrapper=instrument_stage).run()
+        stages_report = metrics.report()["stages"]
+        self.assertEqual(stages_report["search"]["items"], 2)
+        self.assertIsNone(stages_report["summary"]["items"])  # A dict is not a collection of items
+        metrics.set_items(5)  # Outside a stage: ignored
+
+    def test_pipeline_stage_wrapper(self):
+        stages = [
+            Stage("scrape", lambda config: [1, 2, 3]),
+            Stage("clean", lambda config, jobs: jobs[:2], deps=("scrape",)),
+        ]
+        Pipeline(stages, {}, artifacts_dir=self.tmp_dir.name, stage_wrapper=instrument_stage).run()
+        stages_report = metrics.report()["stages"]
+        self.assertEqual(stages_report["scrape"]["items"], 3)
+        self.assertEqual(stages_report["clean"]["items"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
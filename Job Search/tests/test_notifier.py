@@ -1,6 +1,9 @@
+import socketserver
+import threading
+import time
 import unittest
 from unittest.mock import patch, MagicMock
-from Job_Search.src.notifier import send_email, create_pdf, notify  # Updated imports
+from Job_Search.src.notifier import send_email, create_pdf, notify, SMTPDeliveryEngine, logger as notifier_logger  # Updated imports
 
 # Mock FPDF before it's used by notifier module when notifier is imported
 class MockFPDF:
@@ -124,5 +127,124 @@ class TestNotifier(unittest.TestCase):
         mock_send_email.assert_called_once_with(self.sample_response, self.sample_config)
         mock_create_pdf.assert_called_once_with(self.sample_response, self.sample_config)
 
+class LocalSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal local SMTP stand-in that records delivered messages."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost ready")
+        recipients = []
+        while True:
+            line = self.rfile.readline().decode("utf-8").strip()
+            if not line:
+                return
+            command = line.split(" ", 1)[0].upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif command == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(line.split(":", 1)[1].strip("<> "))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    data_line = self.rfile.readline().decode("utf-8")
+                    if data_line.rstrip("\r\n") == ".":
+                        break
+                    data.append(data_line)
+                self.server.messages.append((recipients, "".join(data)))
+                if self.server.drop_after_message:
+                    self.server.drop_after_message = False
+                    return  # Simulate the connection dropping after the message was accepted
+                self.reply("250 OK")
+                if self.server.close_after_reply:
+                    self.server.close_after_reply = False
+                    return  # Simulate the server closing an idle connection
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+class TestSMTPDeliveryEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), LocalSMTPHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.messages = []
+        self.server.connections = 0
+        self.server.drop_after_message = False
+        self.server.close_after_reply = False
+        self.config = {
+            'email': {
+                'sender': 'test@example.com',
+                'recipients': ['recipient1@example.com'],
+                'smtp_server': '127.0.0.1',
+                'smtp_port': self.server.server_address[1],
+                'use_tls': False  # The local stand-in does not support STARTTLS
+            }
+        }
+
+    def test_many_messages_share_one_connection(self):
+        with SMTPDeliveryEngine(self.config) as engine:
+            for i in range(20):
+                self.assertTrue(engine.send([f'user{i}@example.com'], f'Digest {i}'))
+        self.assertEqual(len(self.server.messages), 20)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.messages[3][0], ['user3@example.com'])
+        self.assertIn('Digest 3', self.server.messages[3][1])
+        self.assertEqual(engine.stats()['sent'], 20)
+        self.assertIsNotNone(engine.stats()['messages_per_second'])
+
+    def test_reconnects_after_dropped_connection(self):
+        with SMTPDeliveryEngine(self.config) as engine:
+            self.server.close_after_reply = True
+            self.assertTrue(engine.send(['first@example.com'], 'First'))
+            self.assertTrue(engine.send(['second@example.com'], 'Second'))  # Idle connection was closed: reconnect
+        self.assertEqual(self.server.connections, 2)
+        self.assertEqual([recipients for recipients, data in self.server.messages], [['first@example.com'], ['second@example.com']])
+
+    def test_message_is_not_resent_after_data_was_accepted(self):
+        with self.assertLogs(notifier_logger, level='ERROR'):
+            with SMTPDeliveryEngine(self.config) as engine:
+                self.server.drop_after_message = True
+                self.assertFalse(engine.send(['first@example.com'], 'First'))  # Left to the outbox to retry
+                self.assertTrue(engine.send(['second@example.com'], 'Second'))
+        self.assertEqual([recipients for recipients, data in self.server.messages], [['first@example.com'], ['second@example.com']])
+        self.assertEqual(engine.stats()['failed'], 1)
+
+    def test_send_digests_over_threaded_pool(self):
+        digests = {f'user{i}@example.com': f'Digest for user {i}' for i in range(10)}
+        with SMTPDeliveryEngine(self.config, pool_size=3) as engine:
+            self.assertEqual(engine.send_digests(digests), 10)
+        self.assertEqual(len(self.server.messages), 10)
+        self.assertLessEqual(self.server.connections, 3)
+        delivered = {recipients[0]: data for recipients, data in self.server.messages}
+        self.assertIn('Digest for user 7', delivered['user7@example.com'])
+
+    def test_failed_delivery_is_counted(self):
+        self.config['email']['smtp_port'] = 1  # Nothing listens here
+        with self.assertLogs(notifier_logger, level='ERROR') as logs:
+            with SMTPDeliveryEngine(self.config) as engine:
+                self.assertFalse(engine.send(['user@example.com'], 'Body'))
+        self.assertIn("Failed to send email to user@example.com", logs.output[0])
+        self.assertEqual(engine.stats()['failed'], 1)
+
 if __name__ == '__main__':
     unittest.main()
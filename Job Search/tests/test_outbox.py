@@ -0,0 +1,190 @@
+import unittest
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from unittest.mock import patch, MagicMock
+from Job_Search.src.notifier import SMTPDeliveryEngine
+from Job_Search.src.outbox import Outbox, Dispatcher, make_idempotency_key, PENDING, SENDING, SENT, DEAD
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+def mock_engine():
+    """A mock delivery engine whose submit() runs engine.send right away and returns its Future."""
+    engine = MagicMock()
+    def submit(*args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(engine.send(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    engine.submit.side_effect = submit
+    return engine
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.outbox = Outbox(path=":memory:", max_attempts=3, retry_base_seconds=0)
+        self.config = {'email': {'sender': 'test@example.com', 'recipients': [], 'smtp_server': 'localhost', 'smtp_port': 25}}
+
+    def tearDown(self):
+        self.outbox.close()
+
+    def test_idempotency_key_ignores_recipient_order(self):
+        self.assertEqual(
+            make_idempotency_key(['a@example.com', 'b@example.com'], 'Subject', 'Body'),
+            make_idempotency_key(['b@example.com', 'a@example.com'], 'Subject', 'Body')
+        )
+
+    def test_enqueue_is_idempotent(self):
+        self.assertTrue(self.outbox.enqueue(['user@example.com'], 'Body'))
+        self.assertFalse(self.outbox.enqueue(['user@example.com'], 'Body'))
+        self.assertTrue(self.outbox.enqueue(['user@example.com'], 'Other body'))
+        self.assertEqual(self.outbox.counts(), {PENDING: 2})
+
+    def test_reports_are_keyed_by_jobs_not_body(self):
+        jobs = [{'id': 'job1', 'title': 'Python Developer'}, {'id': 'job2', 'title': 'Data Engineer'}]
+        self.assertTrue(self.outbox.enqueue(['user@example.com'], 'Response', pdf_destination='output/user.pdf', report_jobs=jobs))
+        # The LLM phrases the response differently once its cache expires: still the same notification
+        self.assertFalse(self.outbox.enqueue(['user@example.com'], 'Reworded response', pdf_destination='output/user.pdf',
+                                             report_jobs=jobs[::-1]))
+        self.assertTrue(self.outbox.enqueue(['user@example.com'], 'Response', pdf_destination='output/user.pdf',
+                                            report_jobs=jobs[:1]))
+
+    def test_stale_claims_are_retried_only_before_sending(self):
+        self.outbox.enqueue(['a@example.com'], 'Body a')
+        self.outbox.enqueue(['b@example.com'], 'Body b')
+        claimed = self.outbox.claim()
+        self.assertTrue(self.outbox.begin_send(claimed[0]))  # Crashed while sending 'a', before sending 'b'
+        with patch('Job_Search.src.outbox.time.time', return_value=claimed[0]['claimed_at'] + 601):
+            reclaimed = self.outbox.claim()
+        self.assertEqual([n['body'] for n in reclaimed], ['Body b'])
+        self.assertEqual(reclaimed[0]['attempts'], 1)  # The abandoned claim counts as an attempt
+        self.assertEqual(self.outbox.counts(), {DEAD: 1, SENDING: 1})
+        self.assertFalse(self.outbox.begin_send(claimed[1]))  # The original dispatcher lost its claim
+
+    def test_repeatedly_abandoned_claims_are_dead_lettered(self):
+        self.outbox.enqueue(['user@example.com'], 'Body')
+        now = time.time()
+        for _ in range(3):
+            with patch('Job_Search.src.outbox.time.time', return_value=now):
+                self.outbox.claim()
+            now += 601
+        with patch('Job_Search.src.outbox.time.time', return_value=now):
+            self.assertEqual(self.outbox.claim(), [])
+        self.assertEqual(self.outbox.counts(), {DEAD: 1})
+
+    def test_failing_reports_are_dead_lettered(self):
+        self.outbox.enqueue(['user@example.com'], 'Body', pdf_destination='output/user.pdf', report_jobs=[])
+        engine = mock_engine()
+        dispatcher = Dispatcher(self.outbox, self.config)
+        with patch('Job_Search.src.outbox.generate_reports', side_effect=OSError("No space left on device")):
+            for _ in range(3):
+                dispatcher.dispatch_once(engine)
+        self.assertEqual(self.outbox.counts(), {DEAD: 1})
+        engine.send.assert_not_called()
+
+    def test_claimed_notifications_are_not_claimed_twice(self):
+        self.outbox.enqueue(['user@example.com'], 'Body')
+        self.assertEqual(len(self.outbox.claim()), 1)
+        self.assertEqual(self.outbox.claim(), [])
+
+    def test_dispatcher_sends_and_creates_pdf(self):
+        self.outbox.enqueue(['user@example.com'], 'Body', pdf_destination='output/user.pdf')
+        engine = mock_engine()
+        with patch('Job_Search.src.outbox.create_pdf') as mock_create_pdf:
+            processed = Dispatcher(self.outbox, self.config).dispatch_once(engine)
+
+        self.assertEqual(processed, 1)
+        mock_create_pdf.assert_called_once_with('Body', {'cloud': {'pdf_destination': 'output/user.pdf'}})
+        engine.send.assert_called_once_with(['user@example.com'], 'Body', 'Job Search Results', raise_errors=True)
+        self.assertEqual(self.outbox.counts(), {SENT: 1})
+
+        # A rerun producing the same notification does not send it again
+        self.assertFalse(self.outbox.enqueue(['user@example.com'], 'Body', pdf_destination='output/user.pdf'))
+
+    def test_failed_deliveries_are_retried_then_dead_lettered(self):
+        self.outbox.enqueue(['user@example.com'], 'Body')
+        engine = mock_engine()
+        engine.send.side_effect = OSError("Connection refused")
+        dispatcher = Dispatcher(self.outbox, self.config)
+
+        dispatcher.dispatch_once(engine)
+        self.assertEqual(self.outbox.counts(), {PENDING: 1})
+        dispatcher.dispatch_once(engine)
+        dispatcher.dispatch_once(engine)
+        self.assertEqual(self.outbox.counts(), {DEAD: 1})
+        self.assertEqual(engine.send.call_count, 3)
+        self.assertEqual(dispatcher.dispatch_once(engine), 0)
+
+    def test_failed_delivery_backs_off(self):
+        outbox = Outbox(path=":memory:", retry_base_seconds=60)
+        outbox.enqueue(['user@example.com'], 'Body')
+        outbox.mark_failed(outbox.claim()[0]['id'], "error")
+        self.assertEqual(outbox.claim(), [])  # Not due before the backoff delay
+        outbox.close()
+
+    @patch('Job_Search.src.outbox.generate_reports')
+    @patch('Job_Search.src.outbox.create_report_pool')
+    def test_report_pool_is_started_once(self, mock_create_pool, mock_generate_reports):
+        mock_generate_reports.side_effect = lambda reports, **kwargs: {report["path"]: 1 for report in reports}
+        for i in range(2):
+            self.outbox.enqueue([f'user{i}@example.com'], f'Body {i}', pdf_destination=f'output/user{i}.pdf', report_jobs=[])
+        config = dict(self.config, reports={'processes': 2})
+        dispatcher = Dispatcher(self.outbox, config, batch_size=1)
+        dispatcher.dispatch_once(mock_engine())
+        dispatcher.dispatch_once(mock_engine())
+        mock_create_pool.assert_called_once_with(2, None)
+        self.assertIs(mock_generate_reports.call_args.kwargs['pool'], mock_create_pool.return_value)
+        dispatcher.close()
+        mock_create_pool.return_value.shutdown.assert_called_once_with(wait=True)
+        self.assertEqual(self.outbox.counts(), {SENT: 2})
+
+    @patch.object(SMTPDeliveryEngine, 'send')
+    def test_batch_is_sent_concurrently_over_the_pool(self, mock_send):
+        both_sending = threading.Barrier(2)
+        mock_send.side_effect = lambda *args: both_sending.wait(timeout=5) is not None  # Raises unless sent in parallel
+        for i in range(2):
+            self.outbox.enqueue([f'user{i}@example.com'], f'Body {i}')
+        config = dict(self.config, email=dict(self.config['email'], pool_size=2))
+
+        Dispatcher(self.outbox, config).run(until_empty=True)
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(self.outbox.counts(), {SENT: 2})
+
+    @patch('Job_Search.src.outbox.SMTPDeliveryEngine')
+    def test_background_run_until_empty(self, mock_engine_constructor):
+        engine = mock_engine()
+        mock_engine_constructor.return_value.__enter__.return_value = engine
+        for i in range(15):
+            self.outbox.enqueue([f'user{i}@example.com'], f'Body {i}')
+
+        dispatcher = Dispatcher(self.outbox, self.config, batch_size=10)
+        dispatcher.start(until_empty=True).join(timeout=5)
+
+        self.assertEqual(engine.send.call_count, 15)
+        self.assertEqual(self.outbox.counts(), {SENT: 15})
+
+    @patch('Job_Search.src.outbox.SMTPDeliveryEngine')
+    def test_notifications_queued_while_running_are_delivered_then_drained(self, mock_engine_constructor):
+        engine = mock_engine()
+        mock_engine_constructor.return_value.__enter__.return_value = engine
+        dispatcher = Dispatcher(self.outbox, self.config, poll_interval=0.05)
+        thread = dispatcher.start(until_empty=False)
+        self.outbox.enqueue(['early@example.com'], 'Early body')  # Ready before the others are generated
+        deadline = time.monotonic() + 5
+        while engine.send.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(thread.is_alive())
+        self.outbox.enqueue(['late@example.com'], 'Late body')
+        dispatcher.drain().join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([call.args[0] for call in engine.send.call_args_list], [['early@example.com'], ['late@example.com']])
+        self.assertEqual(self.outbox.counts(), {SENT: 2})
+
+if __name__ == '__main__':
+    unittest.main()
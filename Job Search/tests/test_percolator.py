@@ -0,0 +1,90 @@
+import unittest
+import logging
+import os
+import tempfile
+import numpy as np
+from Job_Search.src.percolator import Percolator, format_alert, tokenize
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+VOCABULARY = ["python", "sql", "react", "spark", "java", "rust", "developer", "analyst"]
+
+def encode(texts):
+    """Bag-of-words vectors over a small vocabulary, so tests need no embedding model."""
+    return np.array([[text.lower().split().count(word) for word in VOCABULARY] for text in texts], dtype=np.float32)
+
+def make_job(i, title, description, location="Remote"):
+    return {"id": f"job{i}", "title": title, "company": f"Company {i}", "location": location,
+            "description": description, "skills": [], "link": f"https://example.com/job/{i}"}
+
+class TestPercolator(unittest.TestCase):
+
+    def setUp(self):
+        self.percolator = Percolator(similarity_threshold=0.8, encode_queries=encode)
+        self.percolator.sync([
+            {"email": "py@example.com", "query": "python developer"},
+            {"email": "data@example.com", "query": "sql analyst", "filters": {"location": "Berlin, Germany"}},
+            {"email": "rust@example.com", "query": "rust"},
+        ])
+        self.jobs = [
+            make_job(1, "Python Developer", "python developer"),
+            make_job(2, "Data Analyst", "sql analyst", location="Berlin, Germany"),
+            make_job(3, "Data Analyst", "sql analyst", location="Paris"),
+            make_job(4, "Backend Engineer", "rust services with python tooling"),
+        ]
+
+    def match(self, jobs):
+        alerts = self.percolator.match(jobs, encode([job["description"] for job in jobs]))
+        return {query_id: [job["id"] for job in matched] for query_id, matched in alerts.items()}
+
+    def test_tokenize_drops_stopwords(self):
+        self.assertEqual(tokenize("Find me remote Python developer jobs."), ["remote", "python", "developer"])
+        self.assertEqual(tokenize("C++ and C# roles"), ["c++", "c#"])
+
+    def test_match_by_similarity_terms_and_filters(self):
+        self.assertEqual(self.match(self.jobs), {
+            "py@example.com": ["job1"],
+            "data@example.com": ["job2"],  # job3 is filtered out by location
+            "rust@example.com": ["job4"],  # Term match only: the description is not similar enough
+        })
+
+    def test_matches_are_ranked_and_capped(self):
+        self.percolator.max_alerts = 1
+        jobs = [make_job(5, "Developer", "developer developer python"), make_job(6, "Python Developer", "python developer")]
+        self.assertEqual(self.match(jobs)["py@example.com"], ["job6"])
+
+    def test_sync_encodes_only_changed_queries(self):
+        encoded = []
+        self.percolator._encode_queries = lambda texts: encoded.extend(texts) or encode(texts)
+        count = self.percolator.sync([
+            {"email": "py@example.com", "query": "python developer", "filters": {"remote": True}},
+            {"email": "java@example.com", "query": "java developer"},
+        ])
+        self.assertEqual((count, encoded), (1, ["java developer"]))
+        self.assertEqual(set(self.percolator.queries), {"py@example.com", "java@example.com"})
+        self.assertNotIn("rust", self.percolator.postings)
+        self.assertEqual(self.percolator.queries["py@example.com"]["filters"], {"remote": True})
+
+    def test_save_and_load_keep_embeddings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "saved_queries.json")
+            self.percolator.save(path)
+            loaded = Percolator.load(path, similarity_threshold=0.8, encode_queries=lambda texts: self.fail("re-encoded"))
+        self.assertEqual(len(loaded), 3)
+        jobs = self.jobs[:2]
+        self.assertEqual(loaded.match(jobs, encode([job["description"] for job in jobs])).keys(),
+                         {"py@example.com", "data@example.com"})
+
+    def test_no_queries_or_jobs(self):
+        self.assertEqual(Percolator(encode_queries=encode).match(self.jobs, encode(["python"] * 4)), {})
+        self.assertEqual(self.percolator.match([], np.zeros((0, len(VOCABULARY)))), {})
+
+    def test_format_alert(self):
+        body = format_alert("python developer", self.jobs[:1])
+        self.assertIn('"python developer"', body)
+        self.assertIn("- Python Developer at Company 1 (Remote)", body)
+        self.assertIn("https://example.com/job/1", body)
+
+if __name__ == '__main__':
+    unittest.main()
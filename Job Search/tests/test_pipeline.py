@@ -0,0 +1,109 @@
+import unittest
+import logging
+import tempfile
+import threading
+from Job_Search.src.pipeline import Pipeline, Stage
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.calls = []
+        self.scraped = [1, 2, 3]
+        self.fail_in = None
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def stage_func(self, name, func):
+        def wrapped(config, *inputs):
+            self.calls.append(name)
+            if self.fail_in == name:
+                raise RuntimeError(f"{name} failed")
+            return func(config, *inputs)
+        return wrapped
+
+    def build(self, config=None):
+        stages = [
+            Stage("scrape", self.stage_func("scrape", lambda config: list(self.scraped)), volatile=True),
+            Stage("clean", self.stage_func("clean", lambda config, jobs: sorted(set(jobs))), deps=("scrape",)),
+            Stage("embed", self.stage_func("embed", lambda config, jobs: [j * 10 for j in jobs]), deps=("clean",)),
+            Stage("search", self.stage_func("search", lambda config, jobs, emb: (config["search"], sum(emb))),
+                  deps=("clean", "embed"), config_keys=("search",)),
+        ]
+        return Pipeline(stages, config or {"search": "python"}, artifacts_dir=self.tmp_dir.name)
+
+    def test_first_run_runs_every_stage(self):
+        statuses = self.build().run()
+        self.assertEqual(statuses, {"scrape": "ran", "clean": "ran", "embed": "ran", "search": "ran"})
+        self.assertEqual(self.build().output("search"), ("python", 60))
+
+    def test_unchanged_scrape_skips_downstream_stages(self):
+        self.build().run()
+        self.calls.clear()
+        statuses = self.build().run()
+        self.assertEqual(self.calls, ["scrape"])  # Volatile stage always runs
+        self.assertEqual(statuses["search"], "skipped")
+
+    def test_changed_scrape_reruns_downstream_stages(self):
+        self.build().run()
+        self.scraped = [1, 2, 3, 4]
+        self.calls.clear()
+        self.build().run()
+        self.assertEqual(self.calls, ["scrape", "clean", "embed", "search"])
+        self.assertEqual(self.build().output("search"), ("python", 100))
+
+    def test_config_change_reruns_only_affected_stages(self):
+        self.build().run()
+        self.calls.clear()
+        self.build({"search": "data"}).run()
+        self.assertEqual(self.calls, ["scrape", "search"])
+
+    def test_resume_after_failure_reruns_only_failed_and_later_stages(self):
+        self.fail_in = "search"
+        with self.assertRaises(RuntimeError):
+            self.build().run()
+        self.fail_in = None
+        self.calls.clear()
+        statuses = self.build().run(resume=True)
+        self.assertEqual(self.calls, ["search"])  # Not even the volatile scrape stage
+        self.assertEqual(statuses["search"], "ran")
+
+    def test_force_and_only(self):
+        self.build().run()
+        self.calls.clear()
+        self.build().run(targets=["embed"], only=True)
+        self.assertEqual(self.calls, ["embed"])
+
+        self.calls.clear()
+        self.build().run(resume=True, force=["clean"])
+        self.assertEqual(self.calls, ["clean"])  # Same output, so later stages are skipped
+
+    def test_only_requires_dependency_artifacts(self):
+        with self.assertRaises(RuntimeError):
+            self.build().run(targets=["search"], only=True)
+
+    def test_independent_stages_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_sibling(config, value):
+            barrier.wait()  # Deadlocks (and times out) unless both stages run at the same time
+            return value
+
+        stages = [
+            Stage("source", lambda config: 1),
+            Stage("left", wait_for_sibling, deps=("source",)),
+            Stage("right", wait_for_sibling, deps=("source",)),
+        ]
+        statuses = Pipeline(stages, {}, artifacts_dir=self.tmp_dir.name, max_workers=2).run()
+        self.assertEqual(statuses, {"source": "ran", "left": "ran", "right": "ran"})
+
+    def test_unknown_dependency_raises(self):
+        with self.assertRaises(ValueError):
+            Pipeline([Stage("a", lambda config: 1, deps=("missing",))], {}, artifacts_dir=self.tmp_dir.name)
+
+if __name__ == '__main__':
+    unittest.main()
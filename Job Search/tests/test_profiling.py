@@ -0,0 +1,80 @@
+import unittest
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from Job_Search.src.profiling import StageProfiler, create_profiler, PROFILE_ENV_VAR
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+def busy_stage(config, jobs):
+    deadline = time.perf_counter() + 0.1
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return [job * 2 for job in jobs]
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def outputs(self):
+        return sorted(os.listdir(self.tmp_dir.name))
+
+    def read(self, extension):
+        name = next(name for name in self.outputs() if name.endswith(extension))
+        with open(os.path.join(self.tmp_dir.name, name)) as file:
+            return file.read()
+
+    def test_unselected_stage_is_not_wrapped(self):
+        profiler = StageProfiler("cprofile", stages=["embed"], output_dir=self.tmp_dir.name)
+        self.assertIs(profiler.wrap("clean", busy_stage), busy_stage)
+
+    def test_cprofile(self):
+        profiler = StageProfiler("cprofile", output_dir=self.tmp_dir.name)
+        self.assertEqual(profiler.wrap("clean", busy_stage)({}, [1, 2]), [2, 4])
+        self.assertEqual([name.split(".")[-1] for name in self.outputs()], ["prof", "txt"])
+        self.assertTrue(self.outputs()[0].startswith("clean_cprofile_"))
+        self.assertIn("busy_stage", self.read(".txt"))
+
+    def test_tracemalloc(self):
+        profiler = StageProfiler("tracemalloc", output_dir=self.tmp_dir.name)
+        profiler.wrap("embed", lambda config: [bytearray(1024) for _ in range(1000)])({})
+        self.assertIn("Stage 'embed'", self.read(".txt"))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_sampling(self):
+        profiler = StageProfiler("sampling", output_dir=self.tmp_dir.name, sample_interval=0.001)
+        profiler.wrap("scrape", busy_stage)({}, [1])
+        self.assertIn("busy_stage", self.read(".folded"))
+        self.assertIn("samples every 1 ms", self.read(".txt"))
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            StageProfiler("perf")
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(create_profiler({}, environ={}))
+        self.assertIsNone(create_profiler({"profiling": {"enabled": False}}, environ={}))
+
+    def test_create_from_config(self):
+        config = {"profiling": {"enabled": True, "mode": "sampling", "stages": ["scrape"], "output_dir": self.tmp_dir.name}}
+        profiler = create_profiler(config, environ={})
+        self.assertEqual(profiler.mode, "sampling")
+        self.assertEqual(profiler.stages, {"scrape"})
+        self.assertEqual(profiler.output_dir, self.tmp_dir.name)
+
+    def test_environment_overrides_config(self):
+        profiler = create_profiler({}, environ={PROFILE_ENV_VAR: "tracemalloc:clean, embed"})
+        self.assertEqual(profiler.mode, "tracemalloc")
+        self.assertEqual(profiler.stages, {"clean", "embed"})
+        self.assertIsNone(create_profiler({"profiling": {"enabled": True}}, environ={PROFILE_ENV_VAR: "off"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import random
+import numpy as np
+from unittest.mock import patch
+from rank_bm25 import BM25Okapi
+from Job_Search.src.ranking import IncrementalBM25, build_bm25, interleave, keyword_candidates
+
+class TestIncrementalBM25(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(0)
+        words = [f"term{i}" for i in range(40)]
+        self.documents = [[rng.choice(words) for _ in range(rng.randint(1, 25))] for _ in range(200)]
+
+    def test_scores_match_bm25okapi(self):
+        reference = BM25Okapi(self.documents)
+        bm25 = IncrementalBM25()
+        for start in range(0, len(self.documents), 64):  # Added in batches
+            bm25.add_documents(self.documents[start:start + 64])
+        for query in (["term1", "term2", "term2"], ["term39", "missing"], ["missing"]):
+            np.testing.assert_allclose(bm25.get_scores(query), reference.get_scores(query))
+            np.testing.assert_allclose(bm25.get_batch_scores(query, [5, 0, 150]), reference.get_batch_scores(query, [5, 0, 150]))
+
+    def test_batch_scores_only_score_requested_documents(self):
+        bm25 = IncrementalBM25().add_documents(self.documents)
+        doc_ids = [199, 3, 42, 0]
+        expected = bm25.get_scores(["term7", "term8", "missing"])[doc_ids]
+        with patch.object(bm25, 'get_scores', side_effect=AssertionError("scored the whole corpus")):
+            np.testing.assert_allclose(bm25.get_batch_scores(["term7", "term8", "missing"], doc_ids), expected)
+
+    def test_statistics_are_refreshed_after_adding(self):
+        bm25 = IncrementalBM25().add_documents([["python", "developer"], ["java", "developer"]])
+        before = bm25.get_scores(["python"])
+        bm25.add_documents([["python"]] * 3)
+        self.assertEqual(bm25.corpus_size, 5)
+        np.testing.assert_allclose(bm25.get_scores(["python"]), BM25Okapi([["python", "developer"], ["java", "developer"]] + [["python"]] * 3).get_scores(["python"]))
+        self.assertNotEqual(bm25.get_scores(["python"])[0], before[0])
+
+    def test_build_bm25_and_keyword_candidates(self):
+        jobs = [{"description": description} for description in
+                ("python developer", "java developer", "python python", "sql analyst", "react engineer")]
+        positions, scores = keyword_candidates(build_bm25(jobs), "python", top_k=2)
+        self.assertEqual(sorted(positions.tolist()), [0, 2])
+        positions, _ = keyword_candidates(build_bm25(jobs), "python", top_k=5, allowed_ids=np.array([1, 2]))
+        self.assertEqual(positions.tolist()[0], 2)
+
+    def test_interleave(self):
+        self.assertEqual(interleave([1, 2, 3], [3, 4]), [1, 3, 2, 4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import logging
+import os
+import tempfile
+from unittest.mock import patch
+import fpdf.fpdf
+from Job_Search.src.report import ReportGenerator, create_report_pool, generate_reports, find_unicode_font, _GlyphSubset
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.jobs = [
+            {
+                "title": f"Développeur Python {i}",
+                "company": "Société Générale",
+                "location": "Zürich",
+                "description": "Nous recherchons un développeur — 日本語 OK ✓ " * 20,
+                "link": f"https://example.com/job/{i}"
+            }
+            for i in range(120)
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_glyph_subset_deduplicates(self):
+        subset = _GlyphSubset([1, 2])
+        subset.append(2)
+        subset.append(3)
+        self.assertEqual(list(subset), [1, 2, 3])
+        self.assertIn(3, subset)
+        self.assertNotIn(4, subset)
+
+    def test_find_unicode_font_missing_path(self):
+        self.assertIsNone(find_unicode_font("/nonexistent/font.ttf"))
+
+    def test_render_multi_page_unicode_report(self):
+        generator = ReportGenerator()
+        pages = generator.render(self.jobs, self.path("report.pdf"), summary="Résumé ✓\nSecond line")
+        self.assertGreater(pages, 1)
+        with open(self.path("report.pdf"), "rb") as file:
+            self.assertTrue(file.read().startswith(b"%PDF"))
+
+    def test_font_metrics_are_not_cached_on_disk(self):
+        generator = ReportGenerator()
+        if generator.font_path is None:
+            self.skipTest("No Unicode TTF font installed")
+        font_dir = os.path.dirname(generator.font_path)
+        before = set(os.listdir(font_dir))
+        generator.render(self.jobs[:3], self.path("report.pdf"))
+        self.assertEqual(set(os.listdir(font_dir)), before)
+        self.assertEqual(fpdf.fpdf.FPDF_CACHE_MODE, 0)  # fpdf's process-wide settings are left alone
+
+    def test_render_without_unicode_font_replaces_characters(self):
+        with patch('Job_Search.src.report.DEFAULT_FONT_PATHS', ()):
+            generator = ReportGenerator()
+        self.assertIsNone(generator.font_path)
+        self.assertEqual(generator.text("Zürich 日本"), "Zürich ??")
+        self.assertGreater(generator.render(self.jobs[:5], self.path("latin1.pdf")), 0)
+
+    def test_generate_reports_in_parallel(self):
+        reports = [{"path": self.path(f"subscriber_{i}.pdf"), "jobs": self.jobs[:30], "summary": f"Report {i}"} for i in range(3)]
+        results = generate_reports(reports, processes=2)
+        self.assertEqual(set(results), {report["path"] for report in reports})
+        for report in reports:
+            self.assertTrue(os.path.exists(report["path"]))
+
+    def test_generate_reports_reuses_pool(self):
+        with create_report_pool(2) as pool:
+            for batch in range(2):
+                reports = [{"path": self.path(f"batch{batch}_{i}.pdf"), "jobs": self.jobs[:5]} for i in range(2)]
+                self.assertEqual(len(generate_reports(reports, processes=2, pool=pool)), 2)
+
+    def test_generate_reports_skips_failed_reports(self):
+        reports = [
+            {"path": self.path("ok.pdf"), "jobs": self.jobs[:2]},
+            {"path": self.path("broken.pdf"), "jobs": None}  # Not iterable
+        ]
+        results = generate_reports(reports, processes=1)
+        self.assertEqual(list(results), [self.path("ok.pdf")])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,12 @@
 import unittest
 from unittest.mock import patch, mock_open, MagicMock
 import yaml
+import json
 import os
-from Job_Search.src.scraper import load_config, scrape_job_board, scrape_jobs
+import tempfile
+import requests
+from Job_Search.src.scraper import load_config, scrape_job_board, scrape_jobs, make_job_id, logger as scraper_logger
+from Job_Search.src.liveness import LivenessChecker
 
 # Determine the project root for test purposes, assuming tests are in Job_Search/tests/
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,7 +29,7 @@ class TestScraper(unittest.TestCase):
             }
         }
         # Configure mock_open to return a file-like object that yaml.safe_load can use
-        mock_file_open.return_value.read.return_value = yaml.dump(mock_config_data)
+        mock_file_open.return_value.read.side_effect = [yaml.dump(mock_config_data), ""]
         
         config = load_config()
         
@@ -37,11 +41,11 @@ class TestScraper(unittest.TestCase):
     def test_load_config_file_not_found(self, mock_path_exists):
         """Test load_config when config file does not exist."""
         mock_path_exists.return_value = False  # Simulate config file does NOT exist
-        # Expect load_config to print an error and return None
-        with patch('builtins.print') as mock_print:
+        # Expect load_config to log an error and return None
+        with self.assertLogs(scraper_logger, level='ERROR') as logs:
             config = load_config()
             self.assertIsNone(config)
-            mock_print.assert_called_with(f"Error: Configuration file not found at {EXPECTED_CONFIG_PATH_IN_SCRAPER}")
+            self.assertIn(f"Configuration file not found at {EXPECTED_CONFIG_PATH_IN_SCRAPER}", logs.output[-1])
 
     @patch('Job_Search.src.scraper.os.path.exists')
     @patch('builtins.open', new_callable=mock_open)
@@ -50,10 +54,10 @@ class TestScraper(unittest.TestCase):
         mock_path_exists.return_value = True
         mock_file_open.return_value.read.return_value = "invalid: yaml: content: اینجا"
         
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='ERROR') as logs:
             config = load_config()
             self.assertIsNone(config)
-            self.assertTrue(mock_print.call_args[0][0].startswith("Error parsing YAML configuration:"))
+            self.assertIn("Error parsing YAML configuration:", logs.output[-1])
 
     @patch('Job_Search.src.scraper.requests.get')
     def test_scrape_job_board_success(self, mock_requests_get):
@@ -96,6 +100,9 @@ class TestScraper(unittest.TestCase):
         self.assertEqual(jobs[0]['skills'], ['Python', 'Django'])
         self.assertEqual(jobs[0]['description'], 'Looking for a Python developer...')
         self.assertEqual(jobs[1]['title'], 'Data Analyst')
+        # Stable posting IDs derived from the link
+        self.assertEqual(jobs[0]['id'], make_job_id({'link': 'http://example.com/job1'}))
+        self.assertNotEqual(jobs[0]['id'], jobs[1]['id'])
 
     @patch('Job_Search.src.scraper.requests.get')
     def test_scrape_job_board_http_error(self, mock_requests_get):
@@ -104,20 +111,20 @@ class TestScraper(unittest.TestCase):
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Client Error")
         mock_requests_get.return_value = mock_response
         
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='ERROR') as logs:
             jobs = scrape_job_board('http://example.com/failing', {})
             self.assertEqual(jobs, [])
-            self.assertTrue(mock_print.call_args[0][0].startswith("Failed to fetch data from http://example.com/failing:"))
+            self.assertIn("Failed to fetch data from http://example.com/failing:", logs.output[-1])
 
     @patch('Job_Search.src.scraper.requests.get')
     def test_scrape_job_board_request_exception(self, mock_requests_get):
         """Test scrape_job_board with a general request exception."""
         mock_requests_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
         
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='ERROR') as logs:
             jobs = scrape_job_board('http://example.com/failing', {})
             self.assertEqual(jobs, [])
-            self.assertTrue(mock_print.call_args[0][0].startswith("Failed to fetch data from http://example.com/failing: Connection failed"))
+            self.assertIn("Failed to fetch data from http://example.com/failing: Connection failed", logs.output[-1])
 
     @patch('Job_Search.src.scraper.requests.get')
     def test_scrape_job_board_no_jobs_found(self, mock_requests_get):
@@ -128,11 +135,11 @@ class TestScraper(unittest.TestCase):
         mock_response.raise_for_status = MagicMock()
         mock_requests_get.return_value = mock_response
         
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='WARNING') as logs:
             jobs = scrape_job_board('http://example.com/nojobs', {})
             self.assertEqual(jobs, [])
-            # Check for the specific print message about no job elements found
-            self.assertTrue(any("No job elements found on http://example.com/nojobs" in call[0][0] for call in mock_print.call_args_list))
+            # Check for the specific warning about no job elements found
+            self.assertTrue(any("No job elements found on http://example.com/nojobs" in line for line in logs.output))
 
     # Mock load_config for scrape_jobs tests
     @patch('Job_Search.src.scraper.load_config') 
@@ -162,14 +169,52 @@ class TestScraper(unittest.TestCase):
         self.assertIn({'title': 'Job1 from Board1', 'company': 'Company A', 'location': 'Remote'}, all_jobs)
         self.assertIn({'title': 'Job2 from Board2', 'company': 'Company B', 'location': 'San Francisco, CA'}, all_jobs)
 
+    @patch('Job_Search.src.scraper.save_jobs_to_file')
+    @patch('Job_Search.src.scraper.load_config')
+    @patch('Job_Search.src.scraper.scrape_job_board')
+    def test_scrape_jobs_with_scheduler(self, mock_scrape_board, mock_load_cfg, mock_save):
+        """Test scrape_jobs crawls only due boards and reuses cached jobs for the others."""
+        due_board = {'url': 'http://board1.com', 'query_params': {'q': 'eng'}}
+        skipped_board = {'url': 'http://board2.com'}
+        mock_load_cfg.return_value = {'scraping': {'job_boards': [due_board, skipped_board]}}
+        new_jobs = [{'id': 'a', 'title': 'Job1 from Board1'}]
+        cached_jobs = [{'id': 'b', 'title': 'Job2 from Board2'}]
+        scheduler = MagicMock()
+        scheduler.select.return_value = ([due_board], [skipped_board])
+        scheduler.cached_jobs.return_value = cached_jobs
+        mock_scrape_board.return_value = new_jobs
+
+        all_jobs = scrape_jobs(scheduler=scheduler)
+
+        mock_scrape_board.assert_called_once_with('http://board1.com', {'q': 'eng'})
+        scheduler.cached_jobs.assert_called_once_with(skipped_board)
+        self.assertEqual(scheduler.record.call_args[0][:2], (due_board, new_jobs))
+        scheduler.save.assert_called_once()
+        self.assertEqual(all_jobs, cached_jobs + new_jobs)
+
+    @patch('Job_Search.src.scraper.save_jobs_to_file')
+    @patch('Job_Search.src.scraper.load_config')
+    @patch('Job_Search.src.scraper.scrape_job_board')
+    def test_scrape_jobs_drops_expired_jobs(self, mock_scrape_board, mock_load_cfg, mock_save):
+        """Test scrape_jobs leaves out jobs that the liveness state marks dead."""
+        mock_load_cfg.return_value = {'scraping': {'job_boards': [{'url': 'http://board1.com'}]}}
+        mock_scrape_board.return_value = [{'id': 'a', 'title': 'Live job'}, {'id': 'b', 'title': 'Expired job'}]
+        with tempfile.TemporaryDirectory() as directory:
+            state_path = os.path.join(directory, 'liveness.json')
+            with open(state_path, 'w') as file:
+                json.dump({'b': {'status': 'dead'}}, file)
+            all_jobs = scrape_jobs(liveness=LivenessChecker(state_path=state_path))
+        self.assertEqual([job['id'] for job in all_jobs], ['a'])
+        self.assertEqual(mock_save.call_args[0][0], all_jobs)  # The stored corpus does not bring them back
+
     @patch('Job_Search.src.scraper.load_config')
     def test_scrape_jobs_config_load_fails(self, mock_load_cfg):
         """Test scrape_jobs when configuration loading fails."""
         mock_load_cfg.return_value = None  # Simulate config load failure
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='ERROR') as logs:
             all_jobs = scrape_jobs()
             self.assertEqual(all_jobs, [])
-            self.assertTrue(any("Error: Scraping configuration is missing" in call[0][0] for call in mock_print.call_args_list))
+            self.assertTrue(any("Scraping configuration is missing" in line for line in logs.output))
 
     @patch('Job_Search.src.scraper.load_config')
     @patch('Job_Search.src.scraper.scrape_job_board')
@@ -185,12 +230,12 @@ class TestScraper(unittest.TestCase):
         }
         mock_scrape_board.return_value = [{'title': 'Job from Board2', 'company': 'Company C', 'location': 'Austin, TX'}]
         
-        with patch('builtins.print') as mock_print:
+        with self.assertLogs(scraper_logger, level='WARNING') as logs:
             all_jobs = scrape_jobs()
             self.assertEqual(len(all_jobs), 1)
             self.assertEqual(all_jobs[0]['title'], 'Job from Board2')
             mock_scrape_board.assert_called_once_with('http://board2.com', {'k': 'sci'})  # Only called for valid board
-            self.assertTrue(any("Missing URL for a job board" in call[0][0] for call in mock_print.call_args_list))
+            self.assertTrue(any("Missing URL for a job board" in line for line in logs.output))
 
 if __name__ == '__main__':
     unittest.main()
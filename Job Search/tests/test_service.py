@@ -0,0 +1,174 @@
+import unittest
+import logging
+import threading
+import requests
+from unittest.mock import Mock, patch
+from Job_Search.src.service import JobSearchService, build_snapshot, filters_from_params, make_server
+from Job_Search.src.processor import generate_embeddings
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+def make_job(i, title, location="Remote", description=None):
+    return {
+        "id": f"job{i}",
+        "title": title,
+        "company": f"Company {i}",
+        "location": location,
+        "description": description or f"We are hiring a {title} to build great software.",
+        "skills": ["Python"] if "Python" in title else ["SQL"],
+        "link": f"https://example.com/job/{i}",
+    }
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [
+            make_job(1, "Python Developer"),
+            make_job(2, "Data Analyst", location="New York, NY"),
+            make_job(3, "Frontend Developer", location="Berlin, Germany"),
+        ]
+        self.service = JobSearchService({"service": {"max_top_k": 10}})
+
+    def test_empty_service_returns_no_results(self):
+        snapshot, results = self.service.search("python")
+        self.assertEqual(snapshot.version, 0)
+        self.assertEqual(results, [])
+
+    def test_ingest_swaps_snapshot(self):
+        self.service.ingest(self.jobs)
+        snapshot, results = self.service.search("Python Developer", top_k=1)
+        self.assertEqual(snapshot.version, 1)
+        self.assertEqual(results[0]["title"], "Python Developer")
+
+        self.service.ingest(self.jobs + [make_job(4, "Python Data Engineer")])
+        self.assertEqual(self.service.snapshot.version, 2)
+        self.assertEqual(len(self.service.snapshot.jobs), 4)
+        self.assertEqual(len(snapshot.jobs), 3)  # Earlier snapshot is unchanged
+
+    def test_search_with_filters(self):
+        self.service.ingest(self.jobs)
+        _, results = self.service.search("developer", top_k=5, filters={"location": ["Berlin, Germany"]})
+        self.assertEqual([job["title"] for job in results], ["Frontend Developer"])
+
+    def test_snapshot_reuses_unchanged_embeddings(self):
+        first = build_snapshot(self.jobs)
+        changed = dict(self.jobs[1], description="A completely different description.")
+        jobs = [self.jobs[0], changed, make_job(4, "Python Data Engineer")]
+        with patch('Job_Search.src.service.generate_embeddings', wraps=generate_embeddings) as mock_embed:
+            second = build_snapshot(jobs, previous=first, version=2)
+        encoded = [job["id"] for job in mock_embed.call_args[0][0]]
+        self.assertEqual(encoded, ["job2", "job4"])  # Changed and new jobs only
+        self.assertTrue((second.embeddings[0] == first.embeddings[0]).all())
+        self.assertEqual(second.index.ntotal, 3)
+
+    def test_refresh_keeps_snapshot_when_scrape_is_empty(self):
+        self.service.ingest(self.jobs)
+        with patch('Job_Search.src.service.scrape_jobs', return_value=[]):
+            self.assertIsNone(self.service.refresh())
+        self.assertEqual(self.service.snapshot.version, 1)
+
+    def test_ingest_percolates_new_jobs_only(self):
+        percolator = Mock()
+        percolator.match.return_value = {"py@example.com": [self.jobs[0]]}
+        received = []
+        service = JobSearchService({}, percolator=percolator, on_alerts=received.append)
+        service.ingest(self.jobs)
+        percolator.match.assert_not_called()  # The initial load is not alerted
+
+        service.ingest(self.jobs + [make_job(4, "Python Data Engineer")])
+        new_jobs, embeddings = percolator.match.call_args[0]
+        self.assertEqual([job["id"] for job in new_jobs], ["job4"])
+        self.assertEqual(embeddings.shape[0], 1)
+        self.assertEqual(received, [{"py@example.com": [self.jobs[0]]}])
+
+    def test_expire_and_skip_dead_jobs(self):
+        liveness = Mock()
+        liveness.drop_expired.side_effect = lambda jobs: [job for job in jobs if job["id"] != "job2"]
+        service = JobSearchService({}, liveness=liveness)
+        service.ingest(self.jobs)
+        self.assertEqual(service.snapshot.ids, ["job1", "job3"])
+
+        with patch('Job_Search.src.service.generate_embeddings') as mock_embed:
+            snapshot = service.expire(["job3", "unknown"])
+        mock_embed.assert_not_called()
+        self.assertEqual((snapshot.version, snapshot.ids, snapshot.index.ntotal), (2, ["job1"], 1))
+        self.assertIs(service.expire(["job3"]), snapshot)  # Nothing left to expire
+
+    def test_search_fans_out_to_shards(self):
+        from Job_Search.src.sharding import ShardedSearch
+        with ShardedSearch.start_local(2) as shards:
+            service = JobSearchService({}, shards=shards)
+            service.ingest(self.jobs)
+            self.assertIsNone(service.snapshot.index)  # The shards hold the indexes
+            _, results = service.search("Python Developer", top_k=1)
+            self.assertIn("job1", [job["id"] for job in results])  # Keyword and vector top-1, interleaved
+
+            changed = dict(self.jobs[2], location="Remote")
+            service.ingest([self.jobs[0], changed, make_job(4, "Python Data Engineer")])
+            self.assertEqual(sum(shard["jobs"] for shard in shards.stats().values()), 3)
+            _, results = service.search("developer", top_k=5, filters={"location": ["Remote"]})
+            self.assertEqual({job["id"] for job in results}, {"job1", "job3", "job4"})
+            service.expire(["job4"])
+            self.assertEqual(sum(shard["jobs"] for shard in shards.stats().values()), 2)
+
+    def test_filters_from_params(self):
+        params = {"location": ["Berlin, Germany", "Remote"], "remote": ["true"], "skills": ["python", " "]}
+        self.assertEqual(filters_from_params(params),
+                         {"location": ["Berlin, Germany", "Remote"], "skills": ["python"], "remote": True})
+        self.assertIsNone(filters_from_params({"q": ["python"]}))
+
+    def test_http_api(self):
+        self.service.ingest(self.jobs)
+        server = make_server(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            response = requests.post(f"{url}/search", json={"query": "Python Developer", "top_k": 1}, timeout=10)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertEqual(body["version"], 1)
+            self.assertEqual(body["results"][0]["title"], "Python Developer")
+            self.assertNotIn("description", body["results"][0])
+
+            response = requests.get(f"{url}/search", params={"q": "developer", "location": ["Berlin, Germany", "Paris"]}, timeout=10)
+            self.assertEqual([job["id"] for job in response.json()["results"]], ["job3"])
+
+            self.assertEqual(requests.get(f"{url}/health", timeout=10).json()["jobs"], 3)
+            self.assertEqual(requests.post(f"{url}/search", json={"query": "x", "filters": {"salary": 1}}, timeout=10).status_code, 400)
+            self.assertEqual(requests.post(f"{url}/search", data="not json", timeout=10).status_code, 400)
+            for body in ({"query": 42}, {"query": ["python"]}, {"query": "python", "filters": ["remote"]}):
+                response = requests.post(f"{url}/search", json=body, timeout=10)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+            self.assertEqual(requests.get(f"{url}/search", timeout=10).status_code, 400)
+            self.assertIn("job_search_service_request_seconds", requests.get(f"{url}/metrics", timeout=10).text)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_concurrent_queries_during_ingest(self):
+        self.service.ingest(self.jobs)
+        errors = []
+
+        def query():
+            try:
+                for _ in range(20):
+                    snapshot, results = self.service.search("developer", top_k=3)
+                    self.assertTrue(all(job in snapshot.jobs for job in results))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(3):
+            self.service.ingest(self.jobs + [make_job(10 + i, f"Python Engineer {i}")])
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.service.snapshot.version, 4)
+
+if __name__ == '__main__':
+    unittest.main()
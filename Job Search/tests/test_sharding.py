@@ -0,0 +1,128 @@
+import unittest
+import logging
+import threading
+from multiprocessing.connection import Listener
+import numpy as np
+from Job_Search.src.sharding import ShardIndex, ShardedSearch, ShardError, create_sharded_search, serve_connection, shard_for
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+VOCABULARY = ["python", "sql", "react", "spark", "kubernetes", "java", "go", "rust"]
+
+def encode(text):
+    """Bag-of-words vectors over a small vocabulary, so tests need no embedding model."""
+    words = text.lower().split()
+    return np.array([words.count(word) for word in VOCABULARY], dtype=np.float32)
+
+def encode_jobs(jobs):
+    return np.stack([encode(job["description"]) for job in jobs])
+
+def make_job(i, skill, location="Remote"):
+    return {
+        "id": f"job{i}",
+        "title": f"{skill.title()} Developer {i}",
+        "company": f"Company {i}",
+        "location": location,
+        "description": f"{skill} developer role number {i}",
+        "skills": [skill],
+        "link": f"https://example.com/job/{i}",
+    }
+
+class TestShardIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [make_job(i, skill) for i, skill in enumerate(["python", "sql", "react", "python"])]
+        self.shard = ShardIndex()
+        self.shard.add(self.jobs, encode_jobs(self.jobs))
+
+    def test_search_returns_scored_candidates(self):
+        hits = self.shard.search("python", encode("python"), top_k=2)
+        self.assertEqual({job["id"] for _, job in hits["vector"]}, {"job0", "job3"})
+        self.assertEqual(hits["vector"][0][0], 0.0)
+        self.assertIn(hits["keyword"][0][1]["id"], {"job0", "job3"})
+
+    def test_add_replaces_existing_ids(self):
+        updated = dict(self.jobs[1], description="rust developer")
+        self.shard.add([updated], encode_jobs([updated]))
+        self.assertEqual(len(self.shard.jobs), 4)
+        self.assertEqual(self.shard.index.ntotal, 4)
+        hits = self.shard.search("rust", encode("rust"), top_k=1)
+        self.assertEqual(hits["vector"][0][1]["id"], "job1")
+
+    def test_add_keeps_last_duplicate_in_batch(self):
+        first, second = make_job(7, "java"), dict(make_job(7, "go"))
+        self.shard.add([first, second], encode_jobs([first, second]))
+        self.assertEqual((len(self.shard.jobs), self.shard.index.ntotal), (5, 5))
+        self.assertEqual(self.shard.search("go", encode("go"), top_k=1)["vector"][0][1]["skills"], ["go"])
+        self.assertEqual(self.shard.remove(["job7"]), 1)
+        self.assertNotIn("job7", [job["id"] for job in self.shard.jobs])
+
+    def test_remove_keeps_index_and_jobs_aligned(self):
+        self.assertEqual(self.shard.remove(["job0", "missing"]), 1)
+        self.assertEqual(self.shard.index.ntotal, 3)
+        hits = self.shard.search("python", encode("python"), top_k=1)
+        self.assertEqual(hits["vector"][0][1]["id"], "job3")
+        self.assertEqual(hits["vector"][0][0], 0.0)
+
+    def test_search_with_filters(self):
+        jobs = [make_job(10, "python", location="Berlin, Germany")]
+        self.shard.add(jobs, encode_jobs(jobs))
+        hits = self.shard.search("python", encode("python"), top_k=5, filters={"location": ["Berlin, Germany"]})
+        self.assertEqual([job["id"] for _, job in hits["vector"]], ["job10"])
+        empty = self.shard.search("python", encode("python"), top_k=5, filters={"location": ["Paris"]})
+        self.assertEqual(empty, {"keyword": [], "vector": []})
+
+class TestShardedSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [make_job(i, skill) for i, skill in enumerate(["python", "sql", "react", "spark", "java", "go"] * 3)]
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(create_sharded_search({}))
+        self.assertIsNone(create_sharded_search({"sharding": {"enabled": False, "num_shards": 4}}))
+
+    def test_shard_for_is_stable(self):
+        self.assertEqual(shard_for("job1", 4), shard_for("job1", 4))
+        self.assertEqual({shard_for(job["id"], 3) for job in self.jobs}, {0, 1, 2})
+
+    def test_local_workers_scatter_gather(self):
+        with ShardedSearch.start_local(3, encode_documents=encode_jobs, encode_query=encode) as search:
+            updated = search.add_jobs(self.jobs)
+            self.assertEqual(sum(shard["jobs"] for shard in search.stats().values()), len(self.jobs))
+            self.assertEqual(set(updated), {0, 1, 2})
+
+            results = search.search("spark", top_k=3)
+            self.assertEqual({job["id"] for job in results[:3]}, {"job3", "job9", "job15"})  # Spread over the shards
+
+            # An incremental add only contacts the shard that owns the new job
+            new_job = make_job(100, "rust")
+            self.assertEqual(list(search.add_jobs([new_job])), [shard_for("job100", 3)])
+            self.assertEqual(search.search("rust", top_k=1)[0]["id"], "job100")
+
+            self.assertEqual(search.remove_jobs(["job100", "unknown"]), 1)
+            self.assertNotIn("job100", [job["id"] for job in search.search("rust", top_k=5)])
+
+    def test_shard_errors_are_reported(self):
+        with ShardedSearch.start_local(1, encode_documents=encode_jobs, encode_query=encode) as search:
+            search.add_jobs(self.jobs)
+            with self.assertRaises(ShardError):
+                search.search("python", filters={"salary": 1})
+            self.assertEqual(search.search("python", top_k=1)[0]["skills"], ["python"])  # The worker is still serving
+
+    def test_remote_shard_over_socket(self):
+        authkey = b"secret"
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        thread = threading.Thread(target=lambda: serve_connection(listener.accept()), daemon=True)
+        thread.start()
+        try:
+            search = ShardedSearch.connect([listener.address], authkey, encode_documents=encode_jobs, encode_query=encode)
+            search.add_jobs(self.jobs)
+            self.assertEqual(search.search("java", top_k=1)[0]["skills"], ["java"])
+            search.close()
+            thread.join(timeout=5)
+        finally:
+            listener.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import logging
+import os
+import tempfile
+from Job_Search.src.skills_index import SkillsIndex
+
+# Configure logging to be quiet during tests
+logging.basicConfig(level=logging.CRITICAL)
+
+class TestSkillsIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = [
+            {"id": "job1", "title": "Python Developer", "company": "Company A", "location": "Remote", "skills": ["Python", "Django"]},
+            {"id": "job2", "title": "Data Scientist", "company": "Company B", "location": "New York", "skills": ["python", "SQL", "ML"]},
+            {"id": "job3", "title": "Data Engineer", "company": "Company A", "location": "New York", "skills": ["SQL", "Spark"]},
+        ]
+        self.index = SkillsIndex()
+        self.index.add_jobs(self.jobs)
+
+    def test_query_and_or(self):
+        self.assertEqual(self.index.query(all_of=["PYTHON"]), {"job1", "job2"})
+        self.assertEqual(self.index.query(all_of=["Python", "SQL"]), {"job2"})
+        self.assertEqual(self.index.query(any_of=["Django", "Spark"]), {"job1", "job3"})
+        self.assertEqual(self.index.query(all_of=["SQL"], any_of=["ML", "Django"]), {"job2"})
+        self.assertEqual(self.index.query(all_of=["Rust"]), set())
+
+    def test_top_skills_with_facets(self):
+        self.assertEqual(self.index.top_skills(n=2), [("Python", 2), ("SQL", 2)])
+        new_york = dict(self.index.top_skills(location="new york"))
+        self.assertEqual(new_york["SQL"], 2)
+        self.assertEqual(new_york["Python"], 1)
+        self.assertNotIn("Django", new_york)
+        self.assertEqual(dict(self.index.top_skills(company="Company A", location="Remote")), {"Python": 1, "Django": 1})
+
+    def test_co_occurrence(self):
+        self.assertEqual(dict(self.index.co_occurrence("SQL")), {"Python": 1, "ML": 1, "Spark": 1})
+
+    def test_incremental_reindex_and_remove(self):
+        self.index.add_job({"id": "job1", "title": "Python Developer", "company": "Company A", "location": "Remote", "skills": ["Go"]})
+        self.assertEqual(self.index.query(all_of=["Django"]), set())
+        self.assertEqual(self.index.query(all_of=["Go"]), {"job1"})
+
+        self.assertTrue(self.index.remove_job("job3"))
+        self.assertFalse(self.index.remove_job("job3"))
+        self.assertEqual(self.index.query(all_of=["Spark"]), set())
+        self.assertEqual(len(self.index), 2)
+
+    def test_save_and_load_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "skills_index.json")
+            self.index.save(path)
+            loaded = SkillsIndex.load(path)
+        self.assertEqual(loaded.query(all_of=["Python", "SQL"]), {"job2"})
+        self.assertEqual(loaded.top_skills(n=2), self.index.top_skills(n=2))
+
+    def test_load_missing_file_returns_empty_index(self):
+        self.assertEqual(len(SkillsIndex.load("/nonexistent/skills_index.json")), 0)
+
+if __name__ == '__main__':
+    unittest.main()